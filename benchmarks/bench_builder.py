@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark StateMachineBuilder against building from a dictionary definition.
+
+Builds divisibility checkers of growing size both ways: as an FSADefinition
+passed to StateMachine and then compiled, and as whole target columns given
+to StateMachineBuilder. The dictionary path is skipped for the largest
+size, where it takes tens of seconds.
+"""
+
+import time
+from array import array
+
+from python_fsa import StateMachine, StateMachineBuilder
+
+BASE = 10
+
+
+def build_dict(divisor: int) -> float:
+    """Time create_divisibility_checker() followed by compile()."""
+    start = time.perf_counter()
+    StateMachine.create_divisibility_checker(BASE, divisor).compile()
+    return time.perf_counter() - start
+
+
+def build_builder(divisor: int) -> float:
+    """Time filling a builder one column per digit, and building it."""
+    start = time.perf_counter()
+    builder = StateMachineBuilder()
+    states = builder.add_states(divisor)
+    builder.set_accept(0)
+    for digit in range(BASE):
+        targets = array("i", [(s * BASE + digit) % divisor for s in states])
+        builder.add_transitions(str(digit), targets)
+    builder.build()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Run the benchmark over a few machine sizes."""
+    print("=== StateMachineBuilder vs. dictionary definition ===\n")
+    for divisor in (10_000, 100_000, 1_000_000):
+        builder_time = build_builder(divisor)
+        if divisor > 100_000:
+            print(
+                f"states={divisor:<9} dict: {'skipped':>8}     "
+                f"builder: {builder_time:7.3f} s"
+            )
+            continue
+        dict_time = build_dict(divisor)
+        print(
+            f"states={divisor:<9} dict: {dict_time:7.3f} s   "
+            f"builder: {builder_time:7.3f} s   "
+            f"speedup: {dict_time / builder_time:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Benchmark repeated queries on an unchanged StateMachine.
+
+Data derived from the definition, such as compiled tables, the arrows of
+create_graph() and the start state, is cached until the definition's
+version changes. Each operation is timed on its first call and on the calls
+that follow, then once more after a direct edit of ``machine.fsa``, which
+must rebuild the caches.
+"""
+
+import random
+import time
+from typing import Any, Callable, Dict, List
+
+from python_fsa import StateMachine
+
+
+def random_dfa(num_states: int, num_symbols: int, seed: int) -> Dict[str, Any]:
+    """Build a random complete DFA definition with about 30% accepting states."""
+    rng = random.Random(seed)
+    definition: Dict[str, Any] = {}
+    for i in range(num_states):
+        state: Dict[str, Any] = {
+            str(symbol): f"S{rng.randrange(num_states)}"
+            for symbol in range(num_symbols)
+        }
+        state.update({"start": i == 0, "accept": rng.random() < 0.3})
+        definition[f"S{i}"] = state
+    return definition
+
+
+def timed(
+    operation: Callable[[StateMachine], Any], machine: StateMachine, repeat: int = 1
+) -> float:
+    """Return the mean time of an operation on a machine in milliseconds."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        operation(machine)
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main() -> None:
+    """Run the benchmark over a few machine sizes."""
+    print("=== First call vs. repeated calls on an unchanged machine ===\n")
+    for num_states in (1_000, 10_000):
+        definition = random_dfa(num_states, 3, seed=num_states)
+        rng = random.Random(0)
+        inputs: List[str] = [str(rng.randrange(3)) for _ in range(1_000)]
+        operations: Dict[str, Callable[[StateMachine], Any]] = {
+            "create_graph": lambda m: m.create_graph(),
+            "minimize_arrows": lambda m: m.minimize_arrows(),
+            "accepts": lambda m, inputs=inputs: m.accepts(inputs),
+            "remove_unreachable_states": lambda m: m.remove_unreachable_states(),
+            "minimize": lambda m: m.minimize(),
+        }
+
+        print(f"states={num_states}")
+        for name, operation in operations.items():
+            machine = StateMachine(definition)
+            first = timed(operation, machine)
+            repeated = timed(operation, machine, repeat=20)
+
+            # A direct edit moves the version on, so caches are rebuilt
+            state = machine.fsa[next(iter(machine.fsa))]
+            state["accept"] = not state["accept"]
+            edited = timed(operation, machine)
+            print(
+                f"  {name:<26} first: {first:9.3f} ms   "
+                f"repeated: {repeated:9.3f} ms   after edit: {edited:9.3f} ms   "
+                f"speedup: {first / repeated:8.1f}x"
+            )
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Benchmark the compiled integer-table engine against the dictionary path.
+
+Runs the same long inputs through StateMachine.__call__ and through the
+CompiledAutomaton returned by StateMachine.compile(), and reports the
+per-symbol cost of each. The same input is then run as bytes, through the
+256-entry translation table, and the table size saved by merging symbols
+into equivalence classes is listed. When NumPy is installed, batch acceptance with
+accepts_many() is compared against checking each sequence in turn.
+"""
+
+import random
+import timeit
+
+from python_fsa import StateMachine
+
+
+def bench(base: int, divisor: int, length: int, repeat: int = 5) -> None:
+    """Time both engines on a random input over the machine's alphabet."""
+    rng = random.Random(0)
+    digits = [str(rng.randrange(base)) for _ in range(length)]
+
+    machine = StateMachine.create_divisibility_checker(base, divisor)
+    compiled = machine.compile()
+
+    dict_time = min(timeit.repeat(lambda: machine(digits), number=1, repeat=repeat))
+    compiled_time = min(
+        timeit.repeat(lambda: compiled.run(digits), number=1, repeat=repeat)
+    )
+
+    print(
+        f"base={base:<3} divisor={divisor:<6} "
+        f"dict: {dict_time / length * 1e9:7.1f} ns/symbol   "
+        f"compiled: {compiled_time / length * 1e9:7.1f} ns/symbol   "
+        f"speedup: {dict_time / compiled_time:5.2f}x"
+    )
+
+
+def bench_bytes(base: int, divisor: int, length: int, repeat: int = 5) -> None:
+    """Time a string against the same digits encoded as bytes."""
+    rng = random.Random(0)
+    text = "".join(str(rng.randrange(base)) for _ in range(length))
+    data = text.encode()
+
+    compiled = StateMachine.create_divisibility_checker(base, divisor).compile()
+
+    text_time = min(timeit.repeat(lambda: compiled.run(text), number=1, repeat=repeat))
+    bytes_time = min(timeit.repeat(lambda: compiled.run(data), number=1, repeat=repeat))
+
+    print(
+        f"base={base:<3} divisor={divisor:<6} "
+        f"str: {length / text_time / 1e6:6.1f} MB/s   "
+        f"bytes: {length / bytes_time / 1e6:6.1f} MB/s   "
+        f"speedup: {text_time / bytes_time:5.2f}x"
+    )
+
+
+def bench_batch(base: int, divisor: int, count: int, repeat: int = 5) -> None:
+    """Time accepts_many() against a loop over accepts() on short inputs."""
+    rng = random.Random(0)
+    sequences = [
+        "".join(str(rng.randrange(base)) for _ in range(rng.randrange(5, 20)))
+        for _ in range(count)
+    ]
+
+    compiled = StateMachine.create_divisibility_checker(base, divisor).compile()
+
+    loop_time = min(
+        timeit.repeat(
+            lambda: [compiled.accepts(s) for s in sequences], number=1, repeat=repeat
+        )
+    )
+    batch_time = min(
+        timeit.repeat(lambda: compiled.accepts_many(sequences), number=1, repeat=repeat)
+    )
+
+    print(
+        f"base={base:<3} divisor={divisor:<6} "
+        f"loop: {loop_time / count * 1e9:7.1f} ns/input   "
+        f"batch: {batch_time / count * 1e9:7.1f} ns/input   "
+        f"speedup: {loop_time / batch_time:5.2f}x"
+    )
+
+
+def report_classes(base: int, divisor: int) -> None:
+    """Print the table size with one column per symbol and per class."""
+    compiled = StateMachine.create_divisibility_checker(base, divisor).compile()
+    rows = compiled.num_states + 1
+    symbols = len(compiled.symbols)
+
+    print(
+        f"base={base:<3} divisor={divisor:<6} "
+        f"symbols: {symbols:3}   classes: {compiled.num_classes:3}   "
+        f"entries: {rows * symbols:7} -> {len(compiled.transitions):7}"
+    )
+
+
+def main() -> None:
+    """Run the benchmark over a few machine sizes."""
+    print("=== Compiled engine vs. dictionary path ===\n")
+    for base, divisor in [(2, 3), (2, 1000), (10, 7), (10, 10000)]:
+        bench(base, divisor, length=200_000)
+
+    print("\n=== Bytes input vs. str input ===\n")
+    for base, divisor in [(2, 3), (10, 7), (10, 10000)]:
+        bench_bytes(base, divisor, length=2_000_000)
+
+    print("\n=== Symbol classes ===\n")
+    for base, divisor in [(10, 2), (10, 7), (10, 10000), (16, 12)]:
+        report_classes(base, divisor)
+
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        print("\nNumPy not installed; skipping accepts_many() benchmark")
+        return
+
+    print("\n=== accepts_many() vs. accepts() per sequence ===\n")
+    for base, divisor in [(2, 3), (10, 7), (10, 10000)]:
+        bench_batch(base, divisor, count=200_000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark incremental re-minimization against minimizing from scratch.
+
+A minimal DFA for a large set of random words stands in for a rule
+automaton. Random edits (add_transition, remove_transition and set_accept) are
+applied to it one at a time, each keeping the DFA minimal. After every
+edit a copy of the result is minimized from scratch for comparison, and
+must come out the same size.
+"""
+
+import copy
+import random
+import time
+from typing import Any, Dict, List, Tuple
+
+from python_fsa import StateMachine
+
+ALPHABET = "abcdefgh"
+
+
+def word_dfa(num_words: int, seed: int) -> Dict[str, Any]:
+    """Build a trie accepting random words of 4 to 12 letters."""
+    rng = random.Random(seed)
+    definition: Dict[str, Any] = {"S0": {"start": True, "accept": False}}
+    for _ in range(num_words):
+        state = "S0"
+        for letter in rng.choices(ALPHABET, k=rng.randint(4, 12)):
+            if letter not in definition[state]:
+                target = f"S{len(definition)}"
+                definition[target] = {"start": False, "accept": False}
+                definition[state][letter] = target
+            state = definition[state][letter]
+        definition[state]["accept"] = True
+    return definition
+
+
+def random_edits(machine: StateMachine, count: int, seed: int) -> List[Tuple]:
+    """Pick edits that add words' worth of changes to a machine."""
+    rng = random.Random(seed)
+    names = list(machine.fsa)
+    edits: List[Tuple] = []
+    for _ in range(count):
+        kind = rng.choice(["add", "remove", "accept"])
+        edits.append((kind, rng.choice(names), rng.choice(ALPHABET), rng.choice(names)))
+    return edits
+
+
+def apply(machine: StateMachine, edit: Tuple) -> None:
+    """Apply one edit if it still fits the machine."""
+    kind, state, symbol, target = edit
+    if state not in machine.fsa:
+        return
+    if kind == "add" and target in machine.fsa:
+        machine.add_transition(state, symbol, target)
+    elif kind == "remove" and symbol in machine.fsa[state]:
+        machine.remove_transition(state, symbol)
+    elif kind == "accept":
+        machine.set_accept(state, not machine.fsa[state]["accept"])
+
+
+def main() -> None:
+    """Run the benchmark over a few machine sizes."""
+    print("=== Incremental vs. from-scratch minimization after edits ===\n")
+    for num_words in (1_000, 10_000, 50_000):
+        machine = StateMachine(word_dfa(num_words, seed=num_words)).minimize()
+        edits = random_edits(machine, 50, seed=num_words)
+
+        incremental_time = scratch_time = 0.0
+        for edit in edits:
+            start = time.perf_counter()
+            apply(machine, edit)
+            incremental_time += time.perf_counter() - start
+
+            # Minimize a copy of the edited machine from scratch
+            scratch = StateMachine(copy.deepcopy(machine.fsa))
+            start = time.perf_counter()
+            scratch.minimize()
+            scratch_time += time.perf_counter() - start
+            assert len(scratch.fsa) == len(machine.fsa)
+
+        print(
+            f"states={len(machine.fsa):<7} edits={len(edits)}   "
+            f"incremental: {incremental_time * 1000 / len(edits):8.2f} ms/edit   "
+            f"from scratch: {scratch_time * 1000 / len(edits):8.2f} ms/edit   "
+            f"speedup: {scratch_time / incremental_time:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
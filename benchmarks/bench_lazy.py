@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark lazy determinization against direct NFA simulation.
+
+The workload is the classic "n-th symbol from the end is 'a'" NFA, whose
+full subset construction has 2^n states. The lazy runner only builds the
+subsets the input reaches, so it approaches DFA speed once its cache is
+warm, while direct simulation pays for every active state on every symbol.
+"""
+
+import random
+import time
+from typing import Any, Dict
+
+from python_fsa import StateMachine
+
+
+def nth_from_end(n: int) -> Dict[str, Any]:
+    """Build an NFA accepting strings whose n-th symbol from the end is 'a'."""
+    fsa: Dict[str, Any] = {
+        "Q0": {"a": ["Q0", "Q1"], "b": "Q0", "start": True, "accept": False}
+    }
+    for i in range(1, n):
+        fsa[f"Q{i}"] = {"a": f"Q{i + 1}", "b": f"Q{i + 1}", "start": False}
+        fsa[f"Q{i}"]["accept"] = False
+    fsa[f"Q{n}"] = {"start": False, "accept": True}
+    return fsa
+
+
+def bench(n: int, max_states: int, policy: str, length: int = 200_000) -> None:
+    """Time both runners on one random input and print the cache counters."""
+    rng = random.Random(n)
+    word = "".join(rng.choice("ab") for _ in range(length))
+    machine = StateMachine(nth_from_end(n))
+    lazy = machine.lazy(max_states=max_states, policy=policy)
+
+    start = time.perf_counter()
+    expected = machine.accepts(word)
+    nfa_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    assert lazy.accepts(word) == expected
+    lazy_time = time.perf_counter() - start
+
+    stats = lazy.stats()
+    print(
+        f"n={n:<3} cache={max_states:<6} {policy:<6} "
+        f"nfa: {nfa_time / length * 1e9:7.1f} ns/symbol   "
+        f"lazy: {lazy_time / length * 1e9:7.1f} ns/symbol   "
+        f"speedup: {nfa_time / lazy_time:5.2f}x   "
+        f"misses={stats['misses']} evictions={stats['evictions']} "
+        f"fallbacks={stats['fallbacks']}"
+    )
+
+
+def main() -> None:
+    """Run the benchmark over NFA and cache sizes."""
+    print("=== Lazy DFA vs. direct NFA simulation ===\n")
+    for n in [4, 8, 12, 16]:
+        bench(n, max_states=100_000, policy="flush")
+
+    print("\n=== Bounded caches on n=16 (65536 reachable subsets) ===\n")
+    for max_states, policy in [(10_000, "flush"), (10_000, "lru"), (500, "flush")]:
+        bench(16, max_states, policy)
+
+
+if __name__ == "__main__":
+    main()
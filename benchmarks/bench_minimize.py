@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark Hopcroft minimization against the table-filling algorithm.
+
+Both algorithms are run on divisibility checkers and on random complete
+DFAs of increasing size. The table-filling algorithm is skipped once it
+would take too long to be useful as a comparison.
+"""
+
+import copy
+import random
+import time
+from typing import Any, Callable, Dict
+
+from python_fsa import StateMachine
+
+TABLE_LIMIT = 300
+
+
+def random_dfa(num_states: int, num_symbols: int, seed: int) -> Dict[str, Any]:
+    """Build a random complete DFA definition with about 30% accepting states."""
+    rng = random.Random(seed)
+    definition: Dict[str, Any] = {}
+    for i in range(num_states):
+        state: Dict[str, Any] = {
+            str(symbol): f"S{rng.randrange(num_states)}"
+            for symbol in range(num_symbols)
+        }
+        state.update({"start": i == 0, "accept": rng.random() < 0.3})
+        definition[f"S{i}"] = state
+    return definition
+
+
+def timed(build: Callable[[], StateMachine], method: str) -> tuple:
+    """Minimize a freshly built machine and return (seconds, states left)."""
+    machine = build()
+    start = time.perf_counter()
+    machine.minimize(method=method)
+    return time.perf_counter() - start, len(machine.fsa)
+
+
+def compare(label: str, size: int, build: Callable[[], StateMachine]) -> None:
+    """Print timings for both algorithms on one workload."""
+    hopcroft_time, states = timed(build, "hopcroft")
+    if size <= TABLE_LIMIT:
+        table_time, table_states = timed(build, "table")
+        assert table_states == states
+        table = f"{table_time * 1000:10.1f} ms"
+        speedup = f"{table_time / hopcroft_time:8.1f}x"
+    else:
+        table = f"{'skipped':>13}"
+        speedup = f"{'-':>9}"
+
+    print(
+        f"{label:<28} {size:>7} -> {states:<7} "
+        f"hopcroft: {hopcroft_time * 1000:10.1f} ms   table: {table}   {speedup}"
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    print("=== Hopcroft vs. table-filling minimization ===\n")
+
+    for base, divisor in [(2, 50), (10, 100), (2, 300), (10, 5000), (2, 50000)]:
+        compare(
+            f"divisibility({base}, {divisor})",
+            divisor,
+            lambda base=base, divisor=divisor: StateMachine.create_divisibility_checker(
+                base, divisor
+            ),
+        )
+
+    for size in [50, 150, 300, 10000, 50000]:
+        definition = random_dfa(size, 3, seed=size)
+        compare(
+            "random DFA, 3 symbols",
+            size,
+            lambda definition=definition: StateMachine(copy.deepcopy(definition)),
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark scaling of run_parallel() from one worker to all cores.
+
+A large file of random digits is checked by DFAs whose lanes converge
+after a few symbols (divisibility by a power of the base), so each worker
+only runs a handful of lanes per chunk, and by one whose symbols permute
+its states, where every lane stays alive and parallelism doesn't pay.
+"""
+
+import os
+import random
+import tempfile
+import time
+
+from python_fsa import StateMachine, run_parallel
+
+SIZE = 32_000_000
+
+
+def write_digits(path: str, base: int, size: int) -> None:
+    """Write size random digits in a base to a file."""
+    rng = random.Random(0)
+    block = "".join(str(rng.randrange(base)) for _ in range(1 << 20)).encode()
+    with open(path, "wb") as f:
+        for start in range(0, size, len(block)):
+            f.write(block[: size - start])
+
+
+def bench(label: str, machine: StateMachine, path: str) -> None:
+    """Time one machine on the file with 1, 2, 4, ... workers."""
+    compiled = machine.compile()
+    print(f"=== {label} ({len(compiled)} states) ===\n")
+
+    cpus = os.cpu_count() or 1
+    counts = sorted({1, cpus} | {n for n in (2, 4, 8, 16, 32) if n <= cpus})
+    baseline = None
+    expected = None
+    for workers in counts:
+        start = time.perf_counter()
+        state = run_parallel(compiled, path, workers=workers)
+        elapsed = time.perf_counter() - start
+
+        expected = state if expected is None else expected
+        assert state == expected
+        baseline = elapsed if baseline is None else baseline
+        print(
+            f"workers={workers:<3} {SIZE / elapsed / 1e6:7.1f} MB/s   "
+            f"speedup: {baseline / elapsed:5.2f}x"
+        )
+    print()
+
+
+def main() -> None:
+    """Run the benchmark."""
+    if (os.cpu_count() or 1) == 1:
+        print("Only one CPU available; showing the single-worker baseline\n")
+    with tempfile.TemporaryDirectory() as directory:
+        decimal = os.path.join(directory, "decimal.txt")
+        binary = os.path.join(directory, "binary.txt")
+        write_digits(decimal, 10, SIZE)
+        write_digits(binary, 2, SIZE)
+
+        bench(
+            "divisible by 1000, base 10",
+            StateMachine.create_divisibility_checker(10, 1000),
+            decimal,
+        )
+        bench(
+            "divisible by 64, base 2",
+            StateMachine.create_divisibility_checker(2, 64),
+            binary,
+        )
+        bench(
+            "divisible by 7, base 10 (permutation)",
+            StateMachine.create_divisibility_checker(10, 7),
+            decimal,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark combining many automata with the product construction.
+
+Folds a list of "policy" automata into one with &, and reports the time
+taken and the number of state pairs explored at each step, next to the
+size of the full cross product that a table over all pairs would need.
+Policies that track related quantities (residues of divisors that share
+factors) reach only a small fraction of their pairs.
+
+Language equivalence with equivalent() is then compared against the old
+approach of minimizing both machines and comparing the results.
+"""
+
+import time
+
+from python_fsa import StateMachine
+
+
+def bench(base: int, divisors: list[int], minimize: bool) -> None:
+    """Intersect divisibility checkers one at a time and report each step."""
+    policies = [StateMachine.create_divisibility_checker(base, d) for d in divisors]
+
+    start = time.perf_counter()
+    combined = policies[0]
+    explored = full = 0
+    for policy in policies[1:]:
+        full += len(combined.fsa) * len(policy.fsa)
+        combined = combined.intersection(policy, minimize=minimize)
+        explored += combined.pairs_explored or 0
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"base={base:<3} policies={len(divisors):<3} minimize={minimize!s:<5} "
+        f"states: {len(combined.fsa):6}   pairs: {explored:7} of {full:9}   "
+        f"time: {elapsed * 1e3:8.1f} ms"
+    )
+
+
+def bench_equivalence(base: int, divisor: int) -> None:
+    """Compare equivalent() on compiled machines with minimizing both sides."""
+    machine = StateMachine.create_divisibility_checker(base, divisor)
+    doubled = StateMachine.create_divisibility_checker(base, 2 * divisor)
+    other = doubled.union(StateMachine.create_divisibility_checker(base, divisor))
+    machine.compile()
+    other.compile()
+
+    start = time.perf_counter()
+    assert machine.equivalent(other)
+    equivalent_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    left = StateMachine(dict(machine.fsa)).minimize()
+    right = StateMachine(dict(other.fsa)).minimize()
+    assert left.fsa == right.fsa
+    minimize_time = time.perf_counter() - start
+
+    print(
+        f"base={base:<3} divisor={divisor:<6} states: {len(machine.fsa):6} vs "
+        f"{len(other.fsa):6}   equivalent: {equivalent_time * 1e3:8.1f} ms   "
+        f"minimize both: {minimize_time * 1e3:8.1f} ms   "
+        f"speedup: {minimize_time / equivalent_time:6.1f}x"
+    )
+
+
+def main() -> None:
+    """Run the benchmark over a few sets of policies."""
+    print("=== Folding policies with & ===\n")
+    related = [2, 4, 6, 8, 12, 24, 36, 48, 72, 144]
+    for minimize in (False, True):
+        bench(10, related, minimize)
+    for minimize in (False, True):
+        bench(2, [3, 5, 7, 11, 13], minimize)
+
+    print("\n=== equivalent() vs. minimizing both sides ===\n")
+    for base, divisor in [(2, 100), (2, 1000), (10, 1000)]:
+        bench_equivalence(base, divisor)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark search throughput of Scanner in MB/s.
+
+A synthetic log is searched for a keyword and for a small multi-pattern
+NFA, as str, as bytes and through an mmap of a temporary file. scan()
+reports end offsets in a single forward pass; finditer() makes a second
+forward pass that also tracks where each partial match began.
+
+Dense input, where a match ends at nearly every offset and matches reach
+back to the start of the input, checks that finditer() stays linear in the
+input size.
+"""
+
+import mmap
+import os
+import random
+import tempfile
+import time
+from typing import Any, Callable, Dict, List
+
+from python_fsa import StateMachine
+
+SIZE = 4_000_000
+
+
+def keyword(word: str) -> Dict[str, Any]:
+    """Build a DFA accepting exactly one word."""
+    fsa: Dict[str, Any] = {}
+    for i, char in enumerate(word):
+        fsa[f"K{i}"] = {char: f"K{i + 1}", "start": i == 0, "accept": False}
+    fsa[f"K{len(word)}"] = {"start": False, "accept": True}
+    return fsa
+
+
+def alternatives(words: List[str]) -> Dict[str, Any]:
+    """Build an NFA accepting any of several words, sharing one start state."""
+    fsa: Dict[str, Any] = {"start": {"start": True, "accept": False}}
+    for w, word in enumerate(words):
+        previous = "start"
+        for i, char in enumerate(word):
+            name = f"W{w}_{i}"
+            targets = fsa[previous].setdefault(char, [])
+            targets.append(name)
+            fsa[name] = {"start": False, "accept": i == len(word) - 1}
+            previous = name
+    return fsa
+
+
+def synthetic_log(size: int) -> str:
+    """Generate log-like text with occasional ERROR and WARN lines."""
+    rng = random.Random(0)
+    levels = ["INFO"] * 40 + ["DEBUG"] * 10 + ["WARN"] * 3 + ["ERROR"]
+    lines = []
+    total = 0
+    while total < size:
+        line = f"2024-01-01 12:00:{rng.randrange(60):02d} {rng.choice(levels)} "
+        line += f"request handled in {rng.randrange(1000)} ms\n"
+        lines.append(line)
+        total += len(line)
+    return "".join(lines)[:size]
+
+
+def throughput(label: str, size: int, run: Callable[[], List[Any]]) -> None:
+    """Print the MB/s of one scan, best of three."""
+    best = float("inf")
+    result: List[Any] = []
+    for _ in range(3):
+        start = time.perf_counter()
+        result = run()
+        best = min(best, time.perf_counter() - start)
+    print(f"{label:<34} {size / best / 1e6:7.1f} MB/s   {len(result)} matches")
+
+
+def bench(label: str, machine: StateMachine, text: str, path: str) -> None:
+    """Print the throughput of each input type for one search machine."""
+    data = text.encode()
+    scanner = machine.scanner()
+    print(f"=== {label}: {scanner} ===\n")
+    throughput("scan(str)", SIZE, lambda: scanner.scan(text))
+    throughput("scan(bytes)", SIZE, lambda: scanner.scan(data))
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        throughput("scan(mmap)", SIZE, lambda: scanner.scan(m))
+        throughput("finditer(mmap)", SIZE, lambda: list(scanner.finditer(m)))
+    print()
+
+
+def bench_dense() -> None:
+    """Print finditer() timings on inputs where every offset ends a match."""
+    machine = StateMachine.from_regex("a+b?")
+    print("=== dense matches of 'a+b?' in 'aaa...' ===\n")
+    for size in (20_000, 200_000, 2_000_000):
+        text = "a" * size
+        throughput(
+            f"finditer(str), {size} symbols",
+            size,
+            lambda text=text: list(machine.finditer(text)),
+        )
+    print()
+
+
+def main() -> None:
+    """Run the benchmark."""
+    text = synthetic_log(SIZE)
+    with tempfile.NamedTemporaryFile(delete=False) as f:
+        f.write(text.encode())
+        path = f.name
+
+    try:
+        bench("keyword 'ERROR'", StateMachine(keyword("ERROR")), text, path)
+        bench(
+            "any of ERROR/WARN/DEBUG",
+            StateMachine(alternatives(["ERROR", "WARN", "DEBUG"])),
+            text,
+            path,
+        )
+    finally:
+        os.unlink(path)
+    bench_dense()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark stride tables against the 1-stride compiled engine.
+
+Runs long binary and decimal inputs, as str and as bytes, through the
+CompiledAutomaton returned by StateMachine.compile() and through the
+StrideTable returned by StateMachine.stride(), and reports the block size
+chosen for the default memory budget, the interpreter steps per input
+symbol and the throughput of each.
+"""
+
+import random
+import timeit
+from functools import partial
+
+from python_fsa import StateMachine
+
+LENGTH = 4_000_000
+
+
+def bench(base: int, divisor: int, repeat: int = 5) -> None:
+    """Time both engines on random digits in a base, as str and as bytes."""
+    rng = random.Random(0)
+    text = "".join(str(rng.randrange(base)) for _ in range(LENGTH))
+    data = text.encode()
+
+    machine = StateMachine.create_divisibility_checker(base, divisor)
+    compiled = machine.compile()
+    stride = machine.stride()
+    assert stride.run(data) == compiled.run(data)
+
+    print(
+        f"base={base:<3} divisor={divisor:<6} k={stride.k}   "
+        f"steps/symbol: 1 -> {1 / stride.k:.3f}   "
+        f"table entries: {stride.num_entries}"
+    )
+    for label, value in [("str", text), ("bytes", data)]:
+        one = min(timeit.repeat(partial(compiled.run, value), number=1, repeat=repeat))
+        many = min(timeit.repeat(partial(stride.run, value), number=1, repeat=repeat))
+        print(
+            f"    {label:<6} 1-stride: {LENGTH / one / 1e6:6.1f} MB/s   "
+            f"k-stride: {LENGTH / many / 1e6:6.1f} MB/s   "
+            f"speedup: {one / many:5.2f}x"
+        )
+
+
+def bench_budget(base: int, divisor: int) -> None:
+    """Show the block size chosen for growing memory budgets."""
+    machine = StateMachine.create_divisibility_checker(base, divisor)
+    chosen = [
+        f"{budget >> 10}K: k={machine.stride(memory_budget=budget).k}"
+        for budget in (1 << 12, 1 << 16, 1 << 20, 1 << 24)
+    ]
+    print(f"base={base:<3} divisor={divisor:<6} " + "   ".join(chosen))
+
+
+def main() -> None:
+    """Run the benchmark over binary and decimal machines."""
+    print("=== k-stride vs. 1-stride ===\n")
+    for base, divisor in [(2, 3), (2, 1000), (10, 7), (10, 10000)]:
+        bench(base, divisor)
+
+    print("\n=== Block size by memory budget ===\n")
+    for base, divisor in [(2, 3), (2, 1000), (2, 100000), (10, 7)]:
+        bench_budget(base, divisor)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+Benchmark every StateMachine hot path on generated workloads.
+
+Each case times one operation (__call__, minimize,
+remove_unreachable_states, trim, _normalize, combine_states or create_graph)
+on one workload: random DFAs and NFAs from 10 up to 10^6 states,
+divisibility checkers with large divisors, and long random inputs.
+Machines are rebuilt before every run, outside the timed region.
+
+For every case the suite reports latency percentiles over the runs,
+throughput in the case's unit (symbols or states per second) and the peak
+memory allocated by one run, measured with tracemalloc in a separate run
+so that tracing doesn't slow the timed ones. Results can be written as
+JSON and compared with an earlier file, which flags every case whose
+median latency grew by more than the threshold.
+
+    python benchmarks/suite.py --output before.json
+    python benchmarks/suite.py --compare before.json --threshold 0.2
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+from python_fsa import StateMachine
+
+SIZES = {
+    "quick": [10, 1_000, 10_000],
+    "default": [10, 1_000, 100_000],
+    "full": [10, 1_000, 100_000, 1_000_000],
+}
+DIVISORS = {
+    "quick": [1_000],
+    "default": [10_000, 100_000],
+    "full": [10_000, 100_000, 1_000_000],
+}
+INPUT_LENGTH = {"quick": 10_000, "default": 100_000, "full": 1_000_000}
+
+# Largest machines that are still worth rendering or simulating as NFAs
+GRAPH_LIMIT = 10_000
+NFA_LIMIT = 100_000
+
+# Random NFAs keep a large share of their states active, so each symbol
+# costs time in proportion to the number of states squared
+NFA_WORK = 10**9
+
+
+class Case(NamedTuple):
+    """One operation on one workload."""
+
+    name: str
+    workload: str
+    size: int
+    unit: str
+    setup: Callable[[], Any]
+    run: Callable[[Any], int]
+
+
+def random_dfa(num_states: int, num_symbols: int, seed: int) -> Dict[str, Any]:
+    """Build a random complete DFA definition with about 30% accepting states."""
+    rng = random.Random(seed)
+    definition: Dict[str, Any] = {}
+    for i in range(num_states):
+        state: Dict[str, Any] = {
+            str(symbol): f"S{rng.randrange(num_states)}"
+            for symbol in range(num_symbols)
+        }
+        state.update({"start": i == 0, "accept": rng.random() < 0.3})
+        definition[f"S{i}"] = state
+    return definition
+
+
+def random_nfa(
+    num_states: int, num_symbols: int, seed: int, fanout: int = 3
+) -> Dict[str, Any]:
+    """Build a random NFA definition with up to fanout targets per symbol."""
+    rng = random.Random(seed)
+    definition: Dict[str, Any] = {}
+    for i in range(num_states):
+        state: Dict[str, Any] = {}
+        for symbol in range(num_symbols):
+            targets = sorted(
+                {f"S{rng.randrange(num_states)}" for _ in range(rng.randint(1, fanout))}
+            )
+            state[str(symbol)] = targets[0] if len(targets) == 1 else targets
+        state.update({"start": i == 0, "accept": rng.random() < 0.3})
+        definition[f"S{i}"] = state
+    return definition
+
+
+def random_input(num_symbols: int, length: int, seed: int) -> List[str]:
+    """Build a random input over the symbols "0", "1", ..."""
+    rng = random.Random(seed)
+    return [str(rng.randrange(num_symbols)) for _ in range(length)]
+
+
+def machine_cases(
+    workload: str, size: int, definition: Dict[str, Any], inputs: List[str]
+) -> Iterator[Case]:
+    """Yield the cases that run on a machine built from a definition."""
+
+    def build() -> StateMachine:
+        # StateMachine copies the definition, so it can be reused
+        return StateMachine(definition)
+
+    def build_warm() -> StateMachine:
+        machine = build()
+        if not machine.is_deterministic:
+            machine._bitset_nfa()
+        return machine
+
+    if workload.startswith("nfa"):
+        inputs = inputs[: max(1, NFA_WORK // size**2)]
+
+    def call(machine: StateMachine) -> int:
+        machine(inputs)
+        return len(inputs)
+
+    def normalize(machine: StateMachine) -> int:
+        machine._normalize()
+        return size
+
+    def remove_unreachable(machine: StateMachine) -> int:
+        machine.remove_unreachable_states()
+        return size
+
+    def trim(machine: StateMachine) -> int:
+        machine.trim()
+        return size
+
+    if workload.startswith("dfa") or size <= NFA_LIMIT:
+        yield Case("__call__", workload, size, "symbols", build_warm, call)
+    yield Case("_normalize", workload, size, "states", build, normalize)
+    yield Case(
+        "remove_unreachable_states", workload, size, "states", build, remove_unreachable
+    )
+    yield Case("trim", workload, size, "states", build, trim)
+
+    if workload.startswith("dfa"):
+
+        def minimize(machine: StateMachine) -> int:
+            machine.minimize()
+            return size
+
+        yield Case("minimize", workload, size, "states", build, minimize)
+    elif size <= NFA_LIMIT:
+        rng = random.Random(size)
+        groups = [[f"S{rng.randrange(size)}" for _ in range(8)] for _ in range(1_000)]
+
+        def combine(machine: StateMachine) -> int:
+            for group in groups:
+                machine.combine_states(*group)
+            return len(groups)
+
+        yield Case("combine_states", workload, size, "calls", build, combine)
+
+    # minimize_arrows() only groups single-target transitions
+    if workload.startswith("dfa") and size <= GRAPH_LIMIT:
+
+        def graph(machine: StateMachine) -> int:
+            machine.create_graph()
+            return size
+
+        yield Case("create_graph", workload, size, "states", build, graph)
+
+
+def divisibility_cases(divisor: int, inputs: List[str]) -> Iterator[Case]:
+    """Yield the cases that run on a base-10 divisibility checker."""
+    workload = "divisibility(10)"
+
+    def build() -> StateMachine:
+        return StateMachine.create_divisibility_checker(10, divisor)
+
+    def create(_: None) -> int:
+        build()
+        return divisor
+
+    def call(machine: StateMachine) -> int:
+        machine(inputs)
+        return len(inputs)
+
+    def minimize(machine: StateMachine) -> int:
+        machine.minimize()
+        return divisor
+
+    yield Case(
+        "create_divisibility_checker", workload, divisor, "states", lambda: None, create
+    )
+    yield Case("__call__", workload, divisor, "symbols", build, call)
+    yield Case("minimize", workload, divisor, "states", build, minimize)
+
+
+def all_cases(scale: str) -> Iterator[Case]:
+    """Yield every case for a scale, smallest workloads first."""
+    length = INPUT_LENGTH[scale]
+    for size in SIZES[scale]:
+        inputs = random_input(3, length, seed=size)
+        yield from machine_cases("dfa(3)", size, random_dfa(size, 3, seed=size), inputs)
+        yield from machine_cases("nfa(3)", size, random_nfa(size, 3, seed=size), inputs)
+    digits = random_input(10, length, seed=0)
+    for divisor in DIVISORS[scale]:
+        yield from divisibility_cases(divisor, digits)
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Interpolate a percentile from sorted samples."""
+    position = (len(samples) - 1) * fraction
+    low = int(position)
+    high = min(low + 1, len(samples) - 1)
+    return samples[low] + (samples[high] - samples[low]) * (position - low)
+
+
+def measure(case: Case, repeat: int, memory: bool) -> Dict[str, Any]:
+    """Time a case and return its result record."""
+    # Large workloads take seconds per run, so they get fewer runs
+    runs = max(1, min(repeat, 1_000_000 // max(case.size, 1)))
+    latencies: List[float] = []
+    items = 0
+    for _ in range(runs):
+        state = case.setup()
+        start = time.perf_counter()
+        items = case.run(state)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+
+    peak: Optional[int] = None
+    if memory:
+        state = case.setup()
+        tracemalloc.start()
+        case.run(state)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    median = percentile(latencies, 0.5)
+    return {
+        "name": case.name,
+        "workload": case.workload,
+        "size": case.size,
+        "runs": runs,
+        "unit": case.unit,
+        "latency_ms": {
+            "min": latencies[0] * 1e3,
+            "p50": median * 1e3,
+            "p90": percentile(latencies, 0.9) * 1e3,
+            "p99": percentile(latencies, 0.99) * 1e3,
+            "max": latencies[-1] * 1e3,
+            "mean": statistics.mean(latencies) * 1e3,
+        },
+        "throughput": items / median if median > 0 else float("inf"),
+        "peak_bytes": peak,
+    }
+
+
+def case_key(result: Dict[str, Any]) -> str:
+    """Identify a result across runs of the suite."""
+    return f"{result['name']} {result['workload']} n={result['size']}"
+
+
+def metadata() -> Dict[str, Any]:
+    """Describe the machine and revision the suite ran on."""
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        revision = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "revision": revision,
+    }
+
+
+def print_result(result: Dict[str, Any]) -> None:
+    """Print one result as a table row."""
+    latency = result["latency_ms"]
+    peak = result["peak_bytes"]
+    memory = f"{peak / 2**20:9.1f} MiB" if peak is not None else f"{'-':>13}"
+    print(
+        f"{case_key(result):<52} "
+        f"p50: {latency['p50']:10.2f} ms  p90: {latency['p90']:10.2f} ms  "
+        f"p99: {latency['p99']:10.2f} ms  "
+        f"{result['throughput']:12.4g} {result['unit']}/s  {memory}"
+    )
+
+
+def compare(
+    results: List[Dict[str, Any]], baseline: Dict[str, Any], threshold: float
+) -> List[str]:
+    """Print the change in median latency and return the regressed cases."""
+    previous = {case_key(result): result for result in baseline["results"]}
+    regressions = []
+    print(f"\n=== Compared with {baseline['meta'].get('revision')} ===\n")
+    for result in results:
+        key = case_key(result)
+        if key not in previous:
+            print(f"{key:<52} new")
+            continue
+        before = previous[key]["latency_ms"]["p50"]
+        after = result["latency_ms"]["p50"]
+        change = after / before - 1 if before > 0 else 0.0
+        flag = ""
+        if change > threshold:
+            regressions.append(key)
+            flag = "  REGRESSION"
+        print(f"{key:<52} {before:10.2f} ms -> {after:10.2f} ms  {change:+7.1%}{flag}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Run the suite and return the process exit status."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--scale", choices=sorted(SIZES), default="default")
+    parser.add_argument("--repeat", type=int, default=7, help="runs per case")
+    parser.add_argument("--filter", default="", help="only cases containing this")
+    parser.add_argument("--no-memory", action="store_true", help="skip tracemalloc")
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--compare", help="JSON file from an earlier run")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.2,
+        help="median slowdown counted as a regression (default: 0.2)",
+    )
+    args = parser.parse_args(argv)
+
+    print(f"=== StateMachine benchmark suite ({args.scale}) ===\n")
+    results = []
+    for case in all_cases(args.scale):
+        result = {"name": case.name, "workload": case.workload, "size": case.size}
+        if args.filter not in case_key(result):
+            continue
+        result = measure(case, args.repeat, not args.no_memory)
+        print_result(result)
+        results.append(result)
+
+    report = {"meta": {**metadata(), "scale": args.scale}, "results": results}
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as file:
+            regressions = compare(results, json.load(file), args.threshold)
+        if regressions:
+            print(
+                f"\n{len(regressions)} case(s) regressed by more than {args.threshold:.0%}"
+            )
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -41,21 +41,8 @@ def demonstrate_nfa_operations() -> None:
     test_strings = ["ab", "ba", "aab", "bba", "abc", "xyz", "abab"]
     for test_str in test_strings:
         try:
-            nfa_copy = StateMachine(
-                {
-                    "S0": {
-                        "a": ["S0", "S1"],
-                        "b": ["S0", "S2"],
-                        "start": True,
-                        "accept": False,
-                    },
-                    "S1": {"b": "S3", "start": False, "accept": False},
-                    "S2": {"a": "S3", "start": False, "accept": False},
-                    "S3": {"a": "S3", "b": "S3", "start": False, "accept": True},
-                }
-            )
-            result = nfa_copy(*list(test_str))
-            print(f"'{test_str}': {'ACCEPTED' if result.accept else 'REJECTED'}")
+            accepted = nfa.accepts(test_str)
+            print(f"'{test_str}': {'ACCEPTED' if accepted else 'REJECTED'}")
         except Exception as e:
             print(f"'{test_str}': ERROR - {e}")
     print()
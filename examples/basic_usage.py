@@ -30,9 +30,8 @@ def main() -> None:
     ]
 
     for input_seq, description in test_cases:
-        fsa_copy = StateMachine.create_divisibility_checker(2, 3)
-        result = fsa_copy(*input_seq)
-        print(f"   {description}: {'ACCEPTED' if result.accept else 'REJECTED'}")
+        accepted = fsa.accepts(input_seq)
+        print(f"   {description}: {'ACCEPTED' if accepted else 'REJECTED'}")
     print()
 
     # Example 3: Show the FSA structure
@@ -43,18 +42,19 @@ def main() -> None:
     # Example 4: Create a custom FSA
     print("4. Creating a custom FSA (accepts strings ending in 'ab'):")
 
+    ends_in_ab = StateMachine(
+        {
+            "S0": {"a": "S1", "b": "S0", "start": True, "accept": False},
+            "S1": {"a": "S1", "b": "S2", "start": False, "accept": False},
+            "S2": {"a": "S1", "b": "S0", "start": False, "accept": True},
+        }
+    )
+
     test_strings = ["ab", "aab", "baab", "abab", "ba", "a"]
     for test_str in test_strings:
-        # Create a fresh copy for each test to avoid state pollution
-        fsa_copy = StateMachine(
-            {
-                "S0": {"a": "S1", "b": "S0", "start": True, "accept": False},
-                "S1": {"a": "S1", "b": "S2", "start": False, "accept": False},
-                "S2": {"a": "S1", "b": "S0", "start": False, "accept": True},
-            }
-        )
-        result = fsa_copy(*list(test_str))
-        print(f"   '{test_str}': {'ACCEPTED' if result.accept else 'REJECTED'}")
+        # accepts() doesn't change the machine, so one instance serves every input
+        accepted = ends_in_ab.accepts(test_str)
+        print(f"   '{test_str}': {'ACCEPTED' if accepted else 'REJECTED'}")
     print()
 
     # Example 5: Minimization
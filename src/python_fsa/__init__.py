@@ -10,7 +10,29 @@ FSAs, while supporting both dictionary-based and programmatic construction.
 """
 
 from .automaton import StateMachine
+from .builder import StateMachineBuilder
+from .compiled import EPSILON, CompiledAutomaton
 from .exceptions import FSAError, InvalidStateError, InvalidTransitionError
+from .instrument import Instrumentation
+from .lazy import LazyDFA
+from .parallel import run_parallel
+from .search import Scanner
+from .stream import StreamCursor
+from .stride import StrideTable
 
 __version__ = "1.0.0"
-__all__ = ["StateMachine", "FSAError", "InvalidStateError", "InvalidTransitionError"]
+__all__ = [
+    "StateMachine",
+    "StateMachineBuilder",
+    "CompiledAutomaton",
+    "Instrumentation",
+    "LazyDFA",
+    "Scanner",
+    "StreamCursor",
+    "StrideTable",
+    "FSAError",
+    "InvalidStateError",
+    "InvalidTransitionError",
+    "run_parallel",
+    "EPSILON",
+]
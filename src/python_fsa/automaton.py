@@ -9,10 +9,33 @@ minimization, state combination, visualization, and input processing.
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Union
+import os
+from array import array
+from collections import deque
+from contextlib import nullcontext
+from functools import lru_cache
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ContextManager,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Sized,
+    Union,
+)
 
 from graphviz import Digraph
 
+from .builder import StateMachineBuilder
+from .compiled import (
+    BUFFER_TYPES,
+    EPSILON,
+    BinaryInput,
+    CompiledAutomaton,
+    _deep_sizeof,
+)
 from .exceptions import (
     FSAError,
     InvalidFSADefinitionError,
@@ -20,6 +43,20 @@ from .exceptions import (
     InvalidTransitionError,
     MinimizationError,
 )
+from .instrument import Instrumentation
+from .lazy import LazyDFA
+from .minimize import Predecessors, refine, reminimize, remove_unreachable
+from .nfa import BitsetNFA
+from .parallel import run_parallel
+from .product import distinguish, include_counterexample, product
+from .regex import regex_nfa
+from .search import Match, Scanner
+from .stream import StreamCursor
+from .stride import DEFAULT_MEMORY_BUDGET, StrideTable
+from .tracked import TrackedDefinition, Version
+
+if TYPE_CHECKING:
+    import numpy as np
 
 # Type aliases for better readability
 StateName = str
@@ -30,6 +67,10 @@ TransitionMap = Dict[
 StateDefinition = Dict[str, Any]
 FSADefinition = Dict[StateName, StateDefinition]
 
+# Compiling a DFA costs about as much as running this many symbols per state
+# by name, so longer inputs are run on the compiled tables straight away
+COMPILE_RATIO = 16
+
 
 class StateMachine:
     """
@@ -42,8 +83,34 @@ class StateMachine:
 
     The automaton can be constructed from a dictionary definition or using
     the static factory methods for common patterns like divisibility checkers.
+
+    A deterministic automaton can also be held in compiled form only, see
+    from_compiled(): its states and symbols are then integer-indexed arrays
+    with an accept bitmap and a start id, and the dictionary definition in
+    ``fsa`` is only built if something reads it.
     """
 
+    __slots__ = (
+        "_fsa",
+        "state",
+        "accept",
+        "subsets_explored",
+        "pairs_explored",
+        "_version",
+        "_cache_version",
+        "_min_version",
+        "_deterministic",
+        "_nfa",
+        "_compiled",
+        "_scanner",
+        "_active",
+        "_instruments",
+        "_predecessors",
+        "_start",
+        "_warm",
+        "_views",
+    )
+
     def __init__(self, fsa: FSADefinition) -> None:
         """
         Initialize the StateMachine with an FSA definition.
@@ -59,7 +126,11 @@ class StateMachine:
             InvalidStateError: If no start state is found or multiple start states exist.
         """
         self._validate_fsa_definition(fsa)
-        self.fsa = fsa.copy()
+        # Counts changes to the definition, see _sync()
+        self._version = Version()
+        self._cache_version = 0
+        self._min_version: int | None = None
+        self._fsa: FSADefinition | None = TrackedDefinition(self._version, fsa)
 
         # Find and validate the start state
         start_states = [key for key in fsa if fsa[key].get("start", False)]
@@ -69,11 +140,114 @@ class StateMachine:
             )
 
         self.state = start_states[0]
-        self.accept = self.fsa[self.state].get("accept", False)
-        self.is_min = False
+
+        # Number of subsets visited by determinize(), if this FSA came from it
+        self.subsets_explored: int | None = None
+        # Number of state pairs visited, if this FSA is a product of two others
+        self.pairs_explored: int | None = None
+
+        # Lazily built helpers for non-deterministic runs, see _invalidate_caches
+        self._deterministic: bool | None = None
+        self._nfa: BitsetNFA | None = None
+        self._compiled: CompiledAutomaton | None = None
+        self._scanner: Scanner | None = None
+        self._active: int | None = None
+        # Counters filled in while instrument() is on
+        self._instruments: Instrumentation | None = None
+        # Reverse transition index kept up to date by edits of a minimal DFA
+        self._predecessors: Predecessors | None = None
+        # The start state, whether a run has been made on the dictionaries,
+        # and views such as create_graph()'s arrows, all for _cache_version
+        self._start: StateName | None = None
+        self._warm = False
+        self._views: dict[tuple[Any, ...], Any] = {}
 
         # Normalize the FSA to ensure consistent state naming
         self._normalize()
+        self.accept = self._start_accepting()
+
+    @classmethod
+    def from_compiled(cls, compiled: CompiledAutomaton) -> StateMachine:
+        """
+        Wrap a compiled automaton without building its dictionary definition.
+
+        The StateMachine runs input on the compiled tables, which take a
+        small fraction of the memory of the equivalent FSADefinition. The
+        definition is built from them the first time ``fsa`` is read, e.g.
+        by minimize() or __str__, and is used from then on. State names are
+        kept as they are in the compiled automaton.
+
+        Args:
+            compiled: The automaton, e.g. from StateMachineBuilder.build() or
+                CompiledAutomaton.load().
+
+        Returns:
+            A StateMachine at the compiled automaton's start state.
+        """
+        machine = cls.__new__(cls)
+        machine._version = Version()
+        machine._cache_version = 0
+        machine._min_version = None
+        machine._fsa = None
+        machine._compiled = compiled
+        machine._deterministic = True
+        machine._nfa = None
+        machine._scanner = None
+        machine._active = None
+        machine._instruments = None
+        machine._predecessors = None
+        machine._start = None
+        machine._warm = False
+        machine._views = {}
+        machine.subsets_explored = None
+        machine.pairs_explored = None
+        machine.state = compiled.state_name(compiled.start)
+        machine.accept = compiled.is_accepting(compiled.start)
+        return machine
+
+    @property
+    def fsa(self) -> FSADefinition:
+        """
+        The dictionary definition of the FSA.
+
+        For a StateMachine made by from_compiled() the definition is built
+        from the compiled tables when first read.
+
+        The definition may be edited in place: its dictionaries count their
+        changes (see ``version``), so data derived from them is rebuilt on
+        next use, and the FSA is no longer considered minimized.
+        """
+        if self._fsa is None:
+            self._fsa = TrackedDefinition(self._version, self.compile().to_definition())
+        return self._fsa
+
+    @fsa.setter
+    def fsa(self, fsa: FSADefinition) -> None:
+        """Replace the dictionary definition of the FSA, copying its states."""
+        self._fsa = TrackedDefinition(self._version, fsa)
+        self._version.value += 1
+
+    @property
+    def version(self) -> int:
+        """
+        A counter that grows whenever the FSA definition changes.
+
+        Every change counts, whether made by a method such as minimize() or
+        add_transition(), or directly through ``fsa``. Cached data, such as
+        compile()'s tables and create_graph()'s arrows, is kept for as long
+        as the version stays the same.
+        """
+        return self._version.value
+
+    @property
+    def is_min(self) -> bool:
+        """Whether the FSA is minimized and hasn't changed since."""
+        return self._min_version == self._version.value
+
+    @is_min.setter
+    def is_min(self, is_min: bool) -> None:
+        """Mark the FSA, as it is now, as minimized or not."""
+        self._min_version = self._version.value if is_min else None
 
     def _validate_fsa_definition(self, fsa: FSADefinition) -> None:
         """
@@ -121,15 +295,23 @@ class StateMachine:
                         f"Transition from '{state_name}' references non-existent state",
                     )
 
-    def __call__(self, *args: InputSymbol | list[InputSymbol]) -> StateMachine:
+    def __call__(
+        self, *args: InputSymbol | list[InputSymbol] | BinaryInput
+    ) -> StateMachine:
         """
         Process input symbols through the FSA.
 
         This method allows the FSA to be called like a function, processing
         input symbols and updating the current state and acceptance status.
 
+        For a non-deterministic FSA the set of active states is tracked
+        instead, and ``state`` names the whole set the way combine_states
+        does (e.g. "{S0,S1}"). The FSA accepts if any active state accepts.
+
         Args:
-            *args: Input symbols to process. Can be individual symbols or a list.
+            *args: Input symbols to process. Can be individual symbols, lists,
+                or binary buffers (bytes, bytearray, memoryview, mmap), which
+                are read a byte at a time.
 
         Returns:
             Self to allow method chaining.
@@ -138,43 +320,389 @@ class StateMachine:
             InvalidTransitionError: If a transition is not defined for the current state.
         """
         # Flatten arguments - handle both individual symbols and lists
+        self._sync()
+        state, active = self.state, self._active
         inputs: list[InputSymbol] = []
         for arg in args:
             if isinstance(arg, list):
                 inputs.extend(arg)
+            elif isinstance(arg, BUFFER_TYPES):
+                # Binary buffers are run byte by byte without being unpacked
+                state, active = self._advance(state, active, inputs)
+                state, active = self._advance(state, active, arg)
+                inputs = []
             else:
                 inputs.append(arg)
 
-        # Process each input symbol
-        for symbol in inputs:
-            # Try both the original symbol and string version for key access
-            if symbol in self.fsa[self.state]:
-                symbol_key = symbol
-            elif str(symbol) in self.fsa[self.state]:
-                symbol_key = str(symbol)
-            else:
-                raise InvalidTransitionError(
-                    self.state, str(symbol), "No transition defined for this input"
+        self.state, self._active = self._advance(state, active, inputs)
+
+        # Update acceptance status
+        self.accept = self._is_accepting(self.state, self._active)
+        return self
+
+    @property
+    def is_deterministic(self) -> bool:
+        """Whether every transition has exactly one target and consumes input."""
+        self._sync()
+        if self._deterministic is None:
+            self._deterministic = all(
+                key != EPSILON and (not isinstance(target, list) or len(target) == 1)
+                for state_def in self.fsa.values()
+                for key, target in state_def.items()
+                if key not in ("start", "accept")
+            )
+        return self._deterministic
+
+    @property
+    def active_states(self) -> list[StateName]:
+        """Names of the states the FSA is currently in, in definition order."""
+        self._sync()
+        if self._active is None:
+            if self._fsa is None or EPSILON not in self._fsa[self.state]:
+                return [self.state]
+            nfa = self._bitset_nfa()
+            return nfa.names(nfa.closure(nfa.mask([self.state])))
+        return self._bitset_nfa().names(self._active)
+
+    def _bitset_nfa(self) -> BitsetNFA:
+        """Return the successor masks used for non-deterministic runs."""
+        self._sync()
+        if self._nfa is None:
+            self._nfa = BitsetNFA(self.fsa)
+        return self._nfa
+
+    def _sync(self) -> None:
+        """Drop derived data if the FSA definition changed since it was built."""
+        if self._cache_version != self._version.value:
+            self._invalidate_caches()
+
+    def _invalidate_caches(self) -> None:
+        """
+        Drop data derived from the FSA definition.
+
+        Every cached helper is built for the definition's current version, so
+        _sync() calls this once the version has moved on: the determinism
+        flag, successor masks, compiled tables and views such as the arrows
+        of create_graph() are rebuilt on next use. A run in progress on a
+        non-deterministic FSA is reset to the start state.
+        """
+        # Compiled tables that are the only copy of the FSA are kept as a dict
+        if self._fsa is None:
+            self._fsa = TrackedDefinition(self._version, self.compile().to_definition())
+        self._cache_version = self._version.value
+        self._deterministic = None
+        self._nfa = None
+        self._compiled = None
+        self._scanner = None
+        self._predecessors = None
+        self._start = None
+        self._warm = False
+        self._views.clear()
+
+        # The active set's bits refer to the old state numbering
+        if self._active is not None:
+            self.reset()
+
+    def _advance(
+        self,
+        state: StateName,
+        active: int | None,
+        inputs: Iterable[InputSymbol] | BinaryInput,
+    ) -> tuple[StateName, int | None]:
+        """
+        Process inputs from a state or set of states.
+
+        Deterministic FSAs follow single transitions by name the first time
+        they run, and through the compiled tables from the second run until
+        the FSA changes, as well as for inputs much longer than the FSA has
+        states, binary buffers and FSAs held only in compiled form. Otherwise
+        the active set is kept as a bitset and advanced with precomputed
+        per-(state, symbol) successor masks.
+
+        Args:
+            state: The state to start from.
+            active: The bitset of active states, or None for a single state.
+            inputs: Input symbols to process.
+
+        Returns:
+            The name of the state (or set of states) reached, and its bitset
+            if the run was non-deterministic.
+
+        Raises:
+            InvalidTransitionError: If a transition is not defined for a symbol.
+        """
+        # Instrumented runs take a separate path, so the loops below stay bare
+        if self._instruments is not None:
+            return self._advance_instrumented(state, active, inputs)
+
+        if active is None and self.is_deterministic:
+            if (
+                self._warm
+                or self._fsa is None
+                or isinstance(inputs, BUFFER_TYPES)
+                or (
+                    isinstance(inputs, Sized)
+                    and len(inputs) >= COMPILE_RATIO * len(self._fsa)
                 )
+            ):
+                compiled = self.compile()
+                final = compiled.run(inputs, start=compiled.state_id(state))
+                return compiled.state_name(final), None
+            self._warm = True
+            return self._run(state, inputs), None
+
+        nfa = self._bitset_nfa()
+        if active is None:
+            active = nfa.closure(nfa.mask([state]))
+        active = nfa.run(active, inputs)
+        return nfa.name(active), active
+
+    def _advance_instrumented(
+        self,
+        state: StateName,
+        active: int | None,
+        inputs: Iterable[InputSymbol] | BinaryInput,
+    ) -> tuple[StateName, int | None]:
+        """
+        Process inputs like _advance, recording every step.
+
+        Each symbol, or each byte of a binary buffer, is run on its own so
+        the transition and the state it leads to can be counted.
+        """
+        instruments = self._instruments
+        assert instruments is not None
+        self._instruments = None
+        try:
+            if isinstance(inputs, BUFFER_TYPES):
+                with memoryview(inputs) as view, view.cast("B") as flat:
+                    steps: Iterable[Any] = (flat[i : i + 1] for i in range(len(flat)))
+                    return self._record_steps(instruments, state, active, steps)
+            steps = ((symbol,) for symbol in inputs)
+            return self._record_steps(instruments, state, active, steps)
+        finally:
+            self._instruments = instruments
+
+    def _record_steps(
+        self,
+        instruments: Instrumentation,
+        state: StateName,
+        active: int | None,
+        steps: Iterable[Any],
+    ) -> tuple[StateName, int | None]:
+        """Advance through single-symbol steps, counting each one."""
+        visits = instruments.visits
+        for step in steps:
+            try:
+                state, active = self._advance(state, active, step)
+            except InvalidTransitionError:
+                instruments.missing_transitions += 1
+                raise
+            instruments.transitions += 1
+            if active is None:
+                visits[state] += 1
+            else:
+                visits.update(self._bitset_nfa().names(active))
+        return state, active
+
+    def _is_accepting(self, state: StateName, active: int | None) -> bool:
+        """Check acceptance of a state name or bitset returned by _advance."""
+        if active is None:
+            if self._fsa is None:
+                compiled = self.compile()
+                return compiled.is_accepting(compiled.state_id(state))
+            return bool(self._fsa[state].get("accept", False))
+        return self._bitset_nfa().accepts(active)
+
+    def _run(self, state: StateName, inputs: Iterable[InputSymbol]) -> StateName:
+        """
+        Follow single transitions from a state of a deterministic FSA.
+
+        Args:
+            state: The state to start from.
+            inputs: Input symbols to process.
 
-            # Use the key that was actually found in the dictionary
-            next_state = self.fsa[self.state][symbol_key]  # type: ignore[index]
+        Returns:
+            The name of the state reached after consuming every input symbol.
+
+        Raises:
+            InvalidTransitionError: If a transition is not defined for a symbol.
+            FSAError: If a transition has multiple possible target states.
+        """
+        fsa = self.fsa
+        for symbol in inputs:
+            transitions = fsa[state]
 
-            # Handle NFA case where multiple states are possible
+            # Try both the original symbol and string version for key access
+            try:
+                next_state = transitions[symbol]  # type: ignore[index]
+            except KeyError:
+                try:
+                    next_state = transitions[str(symbol)]
+                except KeyError:
+                    raise InvalidTransitionError(
+                        state, str(symbol), "No transition defined for this input"
+                    ) from None
+
+            # Single-element lists are deterministic too
             if isinstance(next_state, list):
                 if len(next_state) != 1:
                     raise FSAError(
-                        f"NFA with multiple possible states not supported in callable mode. "
-                        f"State '{self.state}' has {len(next_state)} possible transitions for input '{symbol}'"
+                        f"Unexpected non-deterministic transition. "
+                        f"State '{state}' has {len(next_state)} possible transitions for input '{symbol}'"
                     )
                 next_state = next_state[0]
 
-            self.state = next_state
+            state = next_state
 
-        # Update acceptance status
-        self.accept = self.fsa[self.state].get("accept", False)
+        return state
+
+    def final_state(self, inputs: Iterable[InputSymbol] | BinaryInput) -> StateName:
+        """
+        Find the state reached from the start state on a sequence of inputs.
+
+        Unlike __call__, this leaves the current state and acceptance status
+        untouched, so one StateMachine can be reused for any number of inputs.
+        For a non-deterministic FSA the set of reached states is named the
+        way combine_states does, e.g. "{S0,S1}".
+
+        Args:
+            inputs: Input symbols to process, e.g. a list, a string or a
+                binary buffer such as bytes or an mmap.
+
+        Returns:
+            The name of the state reached after consuming every input symbol.
+
+        Raises:
+            InvalidTransitionError: If a transition is not defined for a symbol.
+        """
+        return self._advance(self._start_state(), None, inputs)[0]
+
+    def accepts(self, inputs: Iterable[InputSymbol] | BinaryInput) -> bool:
+        """
+        Check whether the FSA accepts a sequence of inputs.
+
+        The input is run from the start state without modifying the current
+        state, so this can be called repeatedly on the same StateMachine.
+        A non-deterministic FSA accepts if any reachable state accepts.
+
+        Args:
+            inputs: Input symbols to process, e.g. a list, a string or a
+                binary buffer such as bytes or an mmap.
+
+        Returns:
+            True if the state reached after the input is accepting.
+
+        Raises:
+            InvalidTransitionError: If a transition is not defined for a symbol.
+        """
+        return self._is_accepting(*self._advance(self._start_state(), None, inputs))
+
+    def accepts_many(
+        self,
+        sequences: Iterable[Iterable[InputSymbol]],
+        return_states: bool = False,
+    ) -> np.ndarray | tuple[np.ndarray, np.ndarray]:
+        """
+        Check a batch of input sequences at once using NumPy.
+
+        The FSA is compiled and every sequence is advanced in lockstep with
+        one table gather per input position, so there is no Python-level
+        loop per sequence. Sequences with undefined transitions are rejected
+        rather than raising. See CompiledAutomaton.accepts_many for details.
+
+        Args:
+            sequences: The input sequences, e.g. a list of lists or strings.
+            return_states: Whether to also return the final state ids.
+
+        Returns:
+            A boolean array with one entry per sequence, or a tuple of that
+            array and the final state ids (indices into ``list(self.fsa)``).
+
+        Raises:
+            ImportError: If NumPy is not installed.
+            FSAError: If the FSA has states with multiple targets for a symbol.
+        """
+        return self.compile().accepts_many(sequences, return_states)
+
+    def accepts_parallel(
+        self,
+        data: BinaryInput | str | os.PathLike[str],
+        workers: int | None = None,
+        chunk_size: int | None = None,
+    ) -> bool:
+        """
+        Check one large binary input using several processes.
+
+        The input is split into chunks that workers run from every state
+        they could start in, and the resulting state mappings are composed
+        to get the exact answer. See python_fsa.parallel for when this pays
+        off; inputs smaller than one chunk are run in this process.
+
+        Args:
+            data: A binary buffer, or the path of a file to memory-map.
+            workers: Number of worker processes; defaults to the CPU count.
+            chunk_size: Bytes per chunk; chosen from the input size by default.
+
+        Returns:
+            True if the state reached after the input is accepting.
+
+        Raises:
+            InvalidTransitionError: If a transition is not defined for a byte.
+            FSAError: If the FSA has states with multiple targets for a symbol.
+        """
+        compiled = self.compile()
+        return compiled.is_accepting(run_parallel(compiled, data, workers, chunk_size))
+
+    def reset(self) -> StateMachine:
+        """
+        Return the FSA to its start state.
+
+        Returns:
+            Self to allow method chaining.
+        """
+        self.state = self._start_state()
+        self._active = None
+        self.accept = self._start_accepting()
         return self
 
+    def _start_accepting(self) -> bool:
+        """Check whether the start state, or a state its epsilon moves reach, accepts."""
+        if self._fsa is None:
+            compiled = self.compile()
+            return compiled.is_accepting(compiled.start)
+        if EPSILON not in self.fsa[self.state]:
+            return bool(self.fsa[self.state].get("accept", False))
+        nfa = self._bitset_nfa()
+        return nfa.accepts(nfa.start_mask)
+
+    def _start_state(self) -> StateName:
+        """
+        Find the start state of the FSA.
+
+        Returns:
+            The name of the state marked as the start state.
+
+        Raises:
+            InvalidFSADefinitionError: If no state is marked as the start state.
+        """
+        self._sync()
+        if self._start is None:
+            if self._fsa is None:
+                compiled = self.compile()
+                self._start = compiled.state_name(compiled.start)
+            else:
+                self._start = next(
+                    (
+                        name
+                        for name, state_def in self._fsa.items()
+                        if state_def.get("start", False)
+                    ),
+                    None,
+                )
+                if self._start is None:
+                    raise InvalidFSADefinitionError("FSA has no start state")
+        return self._start
+
     def __str__(self) -> str:
         """
         Create a human-readable string representation of the FSA.
@@ -199,6 +727,247 @@ class StateMachine:
 
         return "\n".join(lines)
 
+    def compile(self) -> CompiledAutomaton:
+        """
+        Compile the FSA into an immutable integer-table automaton.
+
+        The compiled form interns states and symbols to dense integers and
+        stores transitions in a flat array, so running input through it
+        avoids the dictionary lookups done by __call__. It is a snapshot:
+        later changes to this StateMachine are not reflected in it. The
+        result is cached until the FSA changes.
+
+        Returns:
+            A CompiledAutomaton accepting the same inputs as this FSA.
+
+        Raises:
+            FSAError: If the FSA has states with multiple targets for a symbol.
+        """
+        self._sync()
+        if self._compiled is None:
+            self._compiled = CompiledAutomaton.from_definition(self.fsa)
+        return self._compiled
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """
+        Save the compiled form of the FSA to a binary file.
+
+        Load it back with CompiledAutomaton.load(), which maps the file
+        instead of rebuilding and validating the definition, so starting
+        a worker is fast even for very large automata.
+
+        Args:
+            path: Where to write the file.
+
+        Raises:
+            FSAError: If the FSA is non-deterministic, or has symbols or
+                state names that aren't strings or integers.
+        """
+        self.compile().save(path)
+
+    def memory_footprint(self) -> dict[str, int]:
+        """
+        Report how many bytes each representation of the FSA holds.
+
+        Representations that haven't been built count as zero; a
+        StateMachine made by from_compiled() has no definition until
+        ``fsa`` is read. Data shared by two representations, such as
+        state name strings, is counted once, under the first.
+
+        Returns:
+            Bytes held by the dictionary definition ("definition"), the
+            compiled tables ("compiled"), the successor masks used for
+            non-deterministic runs ("nfa"), the search automata built by
+            scanner() ("scanner"), and their sum ("total").
+        """
+        self._sync()
+        seen: set[int] = set()
+        footprint = {
+            "definition": _deep_sizeof(seen, self._fsa),
+            "compiled": _deep_sizeof(seen, self._compiled),
+            "nfa": _deep_sizeof(seen, self._nfa),
+            "scanner": _deep_sizeof(seen, self._scanner),
+        }
+        footprint["total"] = sum(footprint.values())
+        return footprint
+
+    def instrument(
+        self, instrumentation: Instrumentation | None = None
+    ) -> Instrumentation:
+        """
+        Start recording transitions, state visits and minimize() phases.
+
+        While instrumented, __call__, accepts() and final_state() run input
+        one symbol at a time and count every step, which makes them several
+        times slower; minimize() times its phases ("remove_unreachable",
+        "normalize", "partition" or "table_fill", and "merge"). Machines
+        that aren't instrumented run exactly as before.
+
+        Args:
+            instrumentation: Counters to add to, e.g. to share them between
+                machines. A new Instrumentation is used by default.
+
+        Returns:
+            The counters being filled in; see Instrumentation.as_dict().
+        """
+        if instrumentation is None:
+            instrumentation = Instrumentation()
+        self._instruments = instrumentation
+        return instrumentation
+
+    def uninstrument(self) -> Instrumentation | None:
+        """
+        Stop recording, returning to the uninstrumented code paths.
+
+        Returns:
+            The counters that were being filled in, or None if the machine
+            wasn't instrumented.
+        """
+        instrumentation, self._instruments = self._instruments, None
+        return instrumentation
+
+    @property
+    def instrumentation(self) -> Instrumentation | None:
+        """The counters being filled in, or None if not instrumented."""
+        return self._instruments
+
+    def _phase(self, name: str) -> ContextManager[None]:
+        """Time a phase of an operation if the machine is instrumented."""
+        if self._instruments is None:
+            return nullcontext()
+        return self._instruments.phase(name)
+
+    def lazy(
+        self, max_states: int = 10000, policy: str = "flush", min_progress: int = 10
+    ) -> LazyDFA:
+        """
+        Create a lazily determinized runner for the FSA.
+
+        Unlike determinize(), which builds every reachable subset up front,
+        the runner creates subsets only as input reaches them and keeps at
+        most max_states of them cached. Like compile(), it is a snapshot:
+        later changes to this StateMachine are not reflected in it.
+
+        Args:
+            max_states: Maximum number of DFA states kept in the cache.
+            policy: Eviction policy when the cache is full, "flush" or "lru".
+            min_progress: Symbols per cached state that must be processed
+                between evictions; below that the runner falls back to
+                plain NFA simulation for the rest of the input.
+
+        Returns:
+            A LazyDFA accepting the same inputs as this FSA.
+
+        Raises:
+            FSAError: If the policy is unknown or max_states is less than 2.
+        """
+        return LazyDFA(self._bitset_nfa(), max_states, policy, min_progress)
+
+    def stride(
+        self, k: int | None = None, memory_budget: int = DEFAULT_MEMORY_BUDGET
+    ) -> StrideTable:
+        """
+        Build tables for running long inputs k symbols per step.
+
+        The tables map a state and a block of k symbols to the state reached
+        after the whole block, so a string or binary buffer takes one Python
+        step per block. Like compile(), the result is a snapshot: later
+        changes to this StateMachine are not reflected in it.
+
+        Args:
+            k: Symbols per block, 1, 2, 4 or 8; by default the largest whose
+                tables fit in memory_budget.
+            memory_budget: Approximate limit, in bytes, for the tables when k
+                is chosen automatically.
+
+        Returns:
+            A StrideTable over the compiled form of this FSA.
+
+        Raises:
+            FSAError: If the FSA has states with multiple targets for a symbol,
+                or k is not a supported block size.
+        """
+        return StrideTable(self.compile(), k, memory_budget)
+
+    def scanner(self, anchored: bool = False, max_states: int | None = None) -> Scanner:
+        """
+        Build a Scanner that finds every match of the FSA in a larger input.
+
+        Like compile(), the scanner is a snapshot: later changes to this
+        StateMachine are not reflected in it.
+
+        Args:
+            anchored: Whether matches must start at the beginning of the input.
+            max_states: Optional limit on the size of the search DFAs. The
+                one finditer() uses to track starts is built while searching,
+                and raises FSAError there once it grows past the limit.
+
+        Returns:
+            A Scanner for the language of this FSA.
+
+        Raises:
+            FSAError: If the forward search DFA has more than max_states states.
+        """
+        return Scanner(self._bitset_nfa(), anchored, max_states)
+
+    def scan(self, data: Iterable[InputSymbol] | BinaryInput) -> list[int]:
+        """
+        Find the end offset of every match of the FSA in one pass.
+
+        A match is any stretch of the input the FSA accepts, wherever it
+        starts. The search DFA is built on first use and cached until the
+        FSA changes.
+
+        Args:
+            data: A string, binary buffer (e.g. bytes or an mmap) or iterable
+                of input symbols.
+
+        Returns:
+            The offsets just past the end of each match, in increasing order.
+        """
+        self._sync()
+        if self._scanner is None:
+            self._scanner = self.scanner()
+        return self._scanner.scan(data)
+
+    def finditer(self, data: Iterable[InputSymbol] | BinaryInput) -> Iterator[Match]:
+        """
+        Find every match of the FSA with its start and end offsets.
+
+        Matches are reported once per end offset, with the leftmost start
+        that gives a match ending there. See Scanner.finditer.
+
+        Args:
+            data: A string, binary buffer (e.g. bytes or an mmap) or sequence
+                of input symbols.
+
+        Returns:
+            An iterator of (start, end) pairs such that ``data[start:end]`` is
+            accepted, in increasing order of end offset.
+        """
+        self._sync()
+        if self._scanner is None:
+            self._scanner = self.scanner()
+        return self._scanner.finditer(data)
+
+    def stream(self) -> StreamCursor:
+        """
+        Create a cursor for feeding input to the FSA in chunks.
+
+        Unlike __call__, which collects its arguments into one list first,
+        the cursor consumes each chunk lazily and keeps only its current
+        state, so unbounded streams run in constant memory. The cursor is a
+        snapshot: later changes to this StateMachine are not reflected in it.
+        It runs on the cached compiled tables, or on the cached successor
+        masks for an NFA, so creating one doesn't rebuild either.
+
+        Returns:
+            A StreamCursor at the start state.
+        """
+        if self.is_deterministic:
+            return StreamCursor(self.compile())
+        return StreamCursor(self._bitset_nfa())
+
     @staticmethod
     def create_divisibility_checker(base: int, divisor: int) -> StateMachine:
         """
@@ -206,7 +975,8 @@ class StateMachine:
 
         This factory method creates a specialized DFA for divisibility checking.
         The automaton processes digits from left to right and maintains the remainder
-        modulo the divisor, accepting if the final remainder is zero.
+        modulo the divisor, accepting if the final remainder is zero. It is built
+        directly in compiled form, see from_compiled().
 
         Args:
             base: The number base (e.g., 2 for binary, 10 for decimal).
@@ -223,23 +993,44 @@ class StateMachine:
         if divisor < 1:
             raise ValueError(f"Divisor must be at least 1, got {divisor}")
 
-        def create_transitions(state: int) -> dict[Any, Any]:
-            """Create transition function for a given state."""
-            transitions: dict[Any, Any] = {}
-            for symbol in range(base):
-                next_state = (base * state + symbol) % divisor
-                transitions[str(symbol)] = f"S{next_state}"
-            return transitions
+        # One column of targets per digit, without a dict per state
+        builder = StateMachineBuilder()
+        states = builder.add_states(divisor)
+        builder.set_accept(0)
+        for symbol in range(base):
+            builder.add_transitions(
+                str(symbol),
+                array("i", [(base * state + symbol) % divisor for state in states]),
+            )
 
-        # Create FSA definition
-        fsa: FSADefinition = {}
-        for state in range(divisor):
-            state_name = f"S{state}"
-            transitions = create_transitions(state)
-            transitions.update({"start": state == 0, "accept": state == 0})
-            fsa[state_name] = transitions
+        return StateMachine.from_compiled(builder.build())
 
-        return StateMachine(fsa)
+    @staticmethod
+    def from_regex(pattern: str, alphabet: str | None = None) -> StateMachine:
+        """
+        Create a minimal DFA that accepts the strings a regular expression matches.
+
+        The pattern is parsed into a Thompson NFA, which is determinized and
+        minimized; see the regex module for the supported syntax. The
+        pattern must match the whole input. Results are cached by pattern
+        and alphabet, so building the same pattern again only copies the
+        cached definition.
+
+        Args:
+            pattern: The regular expression, e.g. "(a|b)*ab".
+            alphabet: The characters that ``.`` and negated classes range
+                over; defaults to the printable ASCII characters.
+
+        Returns:
+            A new, minimized StateMachine over single-character symbols.
+
+        Raises:
+            RegexSyntaxError: If the pattern is malformed.
+        """
+        fsa = _regex_dfa(pattern, alphabet)
+        machine = StateMachine({name: dict(state) for name, state in fsa.items()})
+        machine.is_min = True
+        return machine
 
     def combine_states(
         self, *state_names: StateName
@@ -250,6 +1041,8 @@ class StateMachine:
         This method is used for NFA to DFA conversion and state reduction.
         It creates a new state that represents the union of the given states,
         with transitions that include all possible transitions from the original states.
+        States reachable from the given ones by epsilon moves are included,
+        so the combined state has no epsilon moves of its own.
 
         Args:
             *state_names: Names of states to combine.
@@ -265,6 +1058,11 @@ class StateMachine:
             if state_name not in self.fsa:
                 raise InvalidStateError(state_name)
 
+        # Include everything reachable by epsilon moves
+        if any(EPSILON in self.fsa[state_name] for state_name in state_names):
+            nfa = self._bitset_nfa()
+            state_names = tuple(nfa.names(nfa.closure(nfa.mask(state_names))))
+
         # Create combined state name
         sorted_names = sorted(state_names)
         combined_name = "{" + ",".join(sorted_names) + "}"
@@ -273,7 +1071,7 @@ class StateMachine:
         all_symbols: set[InputSymbol] = set()
         for state_name in state_names:
             for symbol in self.fsa[state_name]:
-                if symbol not in ("start", "accept"):
+                if symbol not in ("start", "accept", EPSILON):
                     all_symbols.add(symbol)
 
         # Create combined state definition
@@ -311,20 +1109,263 @@ class StateMachine:
 
         return {combined_name: combined_state}
 
+    def determinize(self, max_states: int | None = None) -> StateMachine:
+        """
+        Convert the FSA into an equivalent DFA using the subset construction.
+
+        This drives combine_states-style merging to a full NFA to DFA
+        conversion. Only subsets reachable from the start state are explored,
+        and each subset is keyed by its bitset rather than by a "{S0,S1}"
+        name. A symbol that leads nowhere from a subset goes to the empty
+        subset, which becomes a non-accepting sink in the result.
+
+        The number of subsets explored is stored in the result's
+        ``subsets_explored`` attribute, to watch for exponential blow-up.
+
+        Args:
+            max_states: Optional limit on the number of subsets to explore.
+
+        Returns:
+            A new, normalized StateMachine with one state per reachable subset.
+
+        Raises:
+            FSAError: If more than max_states subsets are reachable.
+        """
+        nfa = self._bitset_nfa()
+        moves = list(nfa.moves.items())
+
+        index = {nfa.start_mask: 0}
+        subsets = [nfa.start_mask]
+        dfa: FSADefinition = {}
+
+        for i, subset in enumerate(subsets):
+            state_def: StateDefinition = {}
+            for symbol, row in moves:
+                target = 0
+                remaining = subset
+                while remaining:
+                    low = remaining & -remaining
+                    target |= row[low.bit_length() - 1]
+                    remaining ^= low
+
+                if target not in index:
+                    if max_states is not None and len(subsets) >= max_states:
+                        raise FSAError(
+                            f"Subset construction exceeded {max_states} states"
+                        )
+                    index[target] = len(subsets)
+                    subsets.append(target)
+                state_def[symbol] = f"S{index[target]}"
+
+            state_def["start"] = i == 0
+            state_def["accept"] = nfa.accepts(subset)
+            dfa[f"S{i}"] = state_def
+
+        result = StateMachine(dfa)
+        result.subsets_explored = len(subsets)
+        return result
+
+    def intersection(self, other: StateMachine, minimize: bool = False) -> StateMachine:
+        """
+        Build a DFA accepting the inputs both FSAs accept.
+
+        Also available as ``self & other``.
+
+        Args:
+            other: The other FSA.
+            minimize: Whether to minimize the result.
+
+        Returns:
+            A new StateMachine for the intersection.
+        """
+        return self._product(other, "intersection", minimize)
+
+    def union(self, other: StateMachine, minimize: bool = False) -> StateMachine:
+        """
+        Build a DFA accepting the inputs either FSA accepts.
+
+        Also available as ``self | other``.
+
+        Args:
+            other: The other FSA.
+            minimize: Whether to minimize the result.
+
+        Returns:
+            A new StateMachine for the union.
+        """
+        return self._product(other, "union", minimize)
+
+    def difference(self, other: StateMachine, minimize: bool = False) -> StateMachine:
+        """
+        Build a DFA accepting the inputs this FSA accepts and the other doesn't.
+
+        Also available as ``self - other``.
+
+        Args:
+            other: The other FSA.
+            minimize: Whether to minimize the result.
+
+        Returns:
+            A new StateMachine for the difference.
+        """
+        return self._product(other, "difference", minimize)
+
+    def symmetric_difference(
+        self, other: StateMachine, minimize: bool = False
+    ) -> StateMachine:
+        """
+        Build a DFA accepting the inputs exactly one of the FSAs accepts.
+
+        Also available as ``self ^ other``.
+
+        Args:
+            other: The other FSA.
+            minimize: Whether to minimize the result.
+
+        Returns:
+            A new StateMachine for the symmetric difference.
+        """
+        return self._product(other, "symmetric_difference", minimize)
+
+    def _product(
+        self, other: StateMachine, operation: str, minimize: bool
+    ) -> StateMachine:
+        """
+        Combine two FSAs with the product construction.
+
+        Non-deterministic operands are determinized first. Both operands
+        are then compiled, and only the state pairs reachable from the
+        pair of start states are explored; their number is stored in the
+        result's ``pairs_explored`` attribute.
+
+        Args:
+            other: The other FSA.
+            operation: The boolean operation, e.g. "intersection".
+            minimize: Whether to minimize the result.
+
+        Returns:
+            A new StateMachine for the combination.
+        """
+        fsa, explored = product(*self._compiled_pair(other), operation)
+        result = StateMachine(fsa)
+        result.pairs_explored = explored
+        return result.minimize() if minimize else result
+
+    def _compiled_pair(
+        self, other: StateMachine
+    ) -> tuple[CompiledAutomaton, CompiledAutomaton]:
+        """Compile both FSAs, determinizing any that are non-deterministic."""
+        left = self if self.is_deterministic else self.determinize()
+        right = other if other.is_deterministic else other.determinize()
+        return left.compile(), right.compile()
+
+    def equivalent(self, other: StateMachine) -> bool:
+        """
+        Check whether two FSAs accept exactly the same inputs.
+
+        Neither FSA is minimized; see counterexample() for how they are
+        compared.
+
+        Args:
+            other: The other FSA.
+
+        Returns:
+            True if both FSAs accept the same inputs.
+        """
+        return self.counterexample(other) is None
+
+    def included_in(self, other: StateMachine) -> bool:
+        """
+        Check whether every input this FSA accepts is accepted by another.
+
+        Args:
+            other: The other FSA.
+
+        Returns:
+            True if the other FSA accepts everything this one does.
+        """
+        return self.counterexample(other, inclusion=True) is None
+
+    def counterexample(
+        self, other: StateMachine, inclusion: bool = False
+    ) -> list[InputSymbol] | None:
+        """
+        Find a shortest input that tells two FSAs apart.
+
+        Equivalence is checked with Hopcroft and Karp's near-linear
+        union-find algorithm, and inclusion with a breadth-first search of
+        the product; both stop at the first difference found, without
+        minimizing either FSA. A missing transition counts as rejecting.
+
+        Args:
+            other: The other FSA.
+            inclusion: Look for an input this FSA accepts and the other
+                doesn't, instead of one accepted by exactly one of them.
+
+        Returns:
+            The input symbols of a shortest counterexample, or None if there
+            is none.
+        """
+        left, right = self._compiled_pair(other)
+        if inclusion:
+            return include_counterexample(left, right)
+        return distinguish(left, right)
+
+    def __and__(self, other: object) -> StateMachine:
+        """Return the intersection of two FSAs."""
+        if not isinstance(other, StateMachine):
+            return NotImplemented
+        return self.intersection(other)
+
+    def __or__(self, other: object) -> StateMachine:
+        """Return the union of two FSAs."""
+        if not isinstance(other, StateMachine):
+            return NotImplemented
+        return self.union(other)
+
+    def __sub__(self, other: object) -> StateMachine:
+        """Return the difference of two FSAs."""
+        if not isinstance(other, StateMachine):
+            return NotImplemented
+        return self.difference(other)
+
+    def __xor__(self, other: object) -> StateMachine:
+        """Return the symmetric difference of two FSAs."""
+        if not isinstance(other, StateMachine):
+            return NotImplemented
+        return self.symmetric_difference(other)
+
     def _normalize(self) -> StateMachine:
         """
         Normalize the FSA by renaming states to follow S0, S1, S2... convention.
 
         This method ensures consistent state naming and is called automatically
         during initialization. It preserves the automaton's behavior while
-        standardizing the state names.
+        standardizing the state names. An FSA whose states are already
+        named S0, S1, ... in order is left as it is, so its cached data
+        stays valid, and renaming doesn't affect whether it is minimized.
 
         Returns:
             Self to allow method chaining.
         """
+        if not all(name == f"S{i}" for i, name in enumerate(self.fsa)):
+            self._renumber(self.fsa, self.is_min)
+        return self
+
+    def _renumber(self, fsa: FSADefinition, is_min: bool) -> None:
+        """
+        Replace the FSA by a definition with its states renamed S0, S1, ...
+
+        States are numbered in the order of their names' numeric suffixes,
+        and the current state follows its renaming.
+
+        Args:
+            fsa: The definition to rename, e.g. ``self.fsa``.
+            is_min: Whether the renamed FSA is minimized.
+        """
         # Sort states by their numeric suffix for consistent ordering
         state_list = sorted(
-            self.fsa,
+            fsa,
             key=lambda key: int(key[1:]) if key[1:].isdigit() else float("inf"),
         )
 
@@ -335,7 +1376,7 @@ class StateMachine:
 
         # Create new FSA with normalized names
         new_fsa: FSADefinition = {}
-        for old_name, state_def in self.fsa.items():
+        for old_name, state_def in fsa.items():
             new_name = name_mapping[old_name]
             new_state_def = state_def.copy()
 
@@ -352,10 +1393,11 @@ class StateMachine:
         self.fsa = new_fsa
 
         # Update current state name
-        if hasattr(self, "state"):
+        if self._active is None:
             self.state = name_mapping[self.state]
 
-        return self
+        self._invalidate_caches()
+        self.is_min = is_min
 
     def minimize_arrows(self, add_spaces: bool = False) -> FSADefinition:
         """
@@ -365,12 +1407,30 @@ class StateMachine:
         input symbols that have identical transitions. For example, symbols
         0,2,4,6,8 might be combined into "0,2,4,6,8" if they all lead to the same state.
 
+        The grouping is cached until the FSA changes; each call returns a
+        copy of it.
+
         Args:
             add_spaces: Whether to add spaces after commas in combined labels.
 
         Returns:
             Optimized FSA definition with combined transition labels.
         """
+        return {
+            name: state_def.copy()
+            for name, state_def in self._arrows(add_spaces).items()
+        }
+
+    def _arrows(self, add_spaces: bool) -> FSADefinition:
+        """Return the cached result of minimize_arrows(), building it if needed."""
+        self._sync()
+        key = ("arrows", add_spaces)
+        if key not in self._views:
+            self._views[key] = self._group_arrows(add_spaces)
+        return self._views[key]  # type: ignore[no-any-return]
+
+    def _group_arrows(self, add_spaces: bool) -> FSADefinition:
+        """Group the symbols of each state's transitions by target state."""
         optimized_fsa: FSADefinition = {}
 
         for state_name, state_def in self.fsa.items():
@@ -380,7 +1440,7 @@ class StateMachine:
             symbol_groups: dict[StateName | list[StateName], list[InputSymbol]] = {}
 
             for symbol, target in transitions.items():
-                if symbol in ("start", "accept"):
+                if symbol in ("start", "accept", EPSILON):
                     continue
 
                 if target not in symbol_groups:
@@ -402,6 +1462,10 @@ class StateMachine:
 
                 optimized_transitions[label] = target
 
+            # Epsilon moves keep their own arrow
+            if EPSILON in transitions:
+                optimized_transitions[EPSILON] = transitions[EPSILON]
+
             # Preserve start and accept flags
             optimized_transitions["start"] = transitions.get("start", False)
             optimized_transitions["accept"] = transitions.get("accept", False)
@@ -424,92 +1488,252 @@ class StateMachine:
             return symbol
         return str(symbol)
 
+    def _successors(self) -> tuple[list[StateName], list[list[int]]]:
+        """
+        Index the FSA's states and their transitions by position.
+
+        The index is cached until the FSA changes, and must not be modified.
+
+        Returns:
+            The state names in definition order, and for each state the
+            positions of every state its transitions (including epsilon
+            moves) lead to.
+        """
+        self._sync()
+        if ("successors",) not in self._views:
+            self._views[("successors",)] = self._index_successors()
+        return self._views[("successors",)]  # type: ignore[no-any-return]
+
+    def _index_successors(self) -> tuple[list[StateName], list[list[int]]]:
+        """Build the index returned by _successors()."""
+        names = list(self.fsa)
+        index = {name: i for i, name in enumerate(names)}
+        successors: list[list[int]] = []
+        for state_def in self.fsa.values():
+            targets: list[int] = []
+            for key, target in state_def.items():
+                if key in ("start", "accept"):
+                    continue
+                if isinstance(target, list):
+                    targets.extend(index[t] for t in target)
+                else:
+                    targets.append(index[target])
+            successors.append(targets)
+        return names, successors
+
+    @staticmethod
+    def _reachable(edges: list[list[int]], sources: Iterable[int]) -> bytearray:
+        """
+        Mark every state reachable from a set of states.
+
+        Args:
+            edges: For each state, the states it has an edge to.
+            sources: The states to start from.
+
+        Returns:
+            One byte per state, 1 if it is reachable from a source.
+        """
+        seen = bytearray(len(edges))
+        queue: deque[int] = deque()
+        for source in sources:
+            if not seen[source]:
+                seen[source] = 1
+                queue.append(source)
+
+        while queue:
+            for target in edges[queue.popleft()]:
+                if not seen[target]:
+                    seen[target] = 1
+                    queue.append(target)
+        return seen
+
     def remove_unreachable_states(self) -> StateMachine:
         """
         Remove states that are not reachable from the start state.
 
         This method performs a reachability analysis and removes any states
         that cannot be reached from the start state, which is useful for
-        cleaning up FSAs before minimization.
+        cleaning up FSAs before minimization. The search visits each state
+        and transition once.
 
         Returns:
             Self to allow method chaining.
         """
-        # Find all reachable states using BFS
-        reachable_states: set[StateName] = set()
-        queue = [self.state]
+        names, successors = self._successors()
+        reachable = self._reachable(successors, [names.index(self._start_state())])
 
-        while queue:
-            current_state = queue.pop(0)
-            if current_state in reachable_states:
-                continue
+        # Remove unreachable states
+        for name, keep in zip(names, reachable):
+            if not keep:
+                del self.fsa[name]
 
-            reachable_states.add(current_state)
+        return self
 
-            # Add all states reachable from current state
-            for symbol, target in self.fsa[current_state].items():
-                if symbol in ("start", "accept"):
-                    continue
+    def trim(self, keep_sink: bool = False) -> StateMachine:
+        """
+        Remove unreachable states and dead states.
 
-                if isinstance(target, list):
-                    for target_state in target:
-                        if target_state not in reachable_states:
-                            queue.append(target_state)
-                elif target not in reachable_states:
-                    queue.append(target)
+        A dead state is one from which no accepting state can be reached, so
+        no input that enters it is accepted. Dead states are found by a
+        search backwards from the accepting states over a reverse adjacency
+        index built once, so trimming takes time linear in the number of
+        transitions. The start state is always kept.
 
-        # Remove unreachable states
-        states_to_remove = set(self.fsa.keys()) - reachable_states
-        for state in states_to_remove:
-            del self.fsa[state]
+        Transitions into removed states are dropped by default, which turns
+        them into missing transitions: input that took them now raises
+        InvalidTransitionError instead of being rejected. With keep_sink,
+        they lead to a single non-accepting sink state instead, which loops
+        on every symbol, so every input is accepted or rejected as before.
+
+        States are renamed S0, S1, ... afterwards, and the FSA returns to its
+        start state.
+
+        Args:
+            keep_sink: Whether to redirect transitions into removed states
+                to one sink state rather than dropping them.
+
+        Returns:
+            Self to allow method chaining.
+        """
+        names, successors = self._successors()
+        start = names.index(self._start_state())
+
+        predecessors: list[list[int]] = [[] for _ in names]
+        for source, edges in enumerate(successors):
+            for dest in edges:
+                predecessors[dest].append(source)
+
+        accepting = [
+            i
+            for i, state_def in enumerate(self.fsa.values())
+            if state_def.get("accept", False)
+        ]
+        reachable = self._reachable(successors, [start])
+        live = self._reachable(predecessors, accepting)
+        keep = {names[i] for i in range(len(names)) if reachable[i] and live[i]}
+        keep.add(names[start])
+
+        # Only used if a transition into a removed state is redirected
+        sink = f"S{len(names)}"
+        while sink in self.fsa:
+            sink += "_"
+
+        fsa: FSADefinition = {}
+        symbols: dict[str, None] = {}
+        redirected = False
+        for name in names:
+            if name not in keep:
+                continue
+            state_def = {}
+            for key, target in self.fsa[name].items():
+                if key in ("start", "accept"):
+                    state_def[key] = target
+                    continue
+                if key != EPSILON:
+                    symbols[key] = None
+
+                targets = target if isinstance(target, list) else [target]
+                kept = [t for t in targets if t in keep]
+                if len(kept) < len(targets) and keep_sink:
+                    kept.append(sink)
+                    redirected = True
+                if not kept:
+                    continue
+                state_def[key] = kept if isinstance(target, list) else kept[0]
+            fsa[name] = state_def
+
+        if redirected:
+            fsa[sink] = dict.fromkeys(symbols, sink)
+            fsa[sink].update({"start": False, "accept": False})
+
+        self.state = names[start]
+        self._active = None
+        # Nothing is dropped unless a state is, so an unchanged FSA stays as is
+        if len(fsa) < len(names) or redirected:
+            self._renumber(fsa, False)
+        else:
+            self._normalize()
+        self.accept = self._start_accepting()
 
         return self
 
-    def minimize(self) -> StateMachine:
+    def minimize(self, method: str = "hopcroft") -> StateMachine:
         """
-        Minimize the DFA using the table-filling algorithm.
+        Minimize the DFA by merging equivalent states.
+
+        Unreachable states are removed first, then equivalent states are found
+        with one of two algorithms:
 
-        This method implements the standard DFA minimization algorithm that
-        identifies and merges equivalent states. The algorithm works by
-        iteratively refining partitions of states until no further refinement
-        is possible.
+        - ``"hopcroft"`` (default): Hopcroft's partition refinement, which runs
+          in O(n·k·log n) time and O(n·k) memory for n states and k symbols.
+        - ``"table"``: the classic table-filling algorithm, which needs an n×n
+          table and up to O(n⁴) time. Kept for comparison.
+
+        Both produce the same normalized result, with each group of equivalent
+        states collapsed into its lowest-numbered member, or into the start
+        state if the group contains it.
+
+        Args:
+            method: The minimization algorithm, "hopcroft" or "table".
 
         Returns:
             Self to allow method chaining.
 
         Raises:
-            MinimizationError: If minimization fails due to an unexpected condition.
+            MinimizationError: If the FSA has epsilon transitions, which
+                determinize() removes, or if minimization fails due to an
+                unexpected condition.
         """
         if self.is_min:
             return self
 
+        if method not in ("hopcroft", "table"):
+            raise MinimizationError(f"Unknown minimization method '{method}'")
+        for state_name, state_def in self.fsa.items():
+            if EPSILON in state_def:
+                raise MinimizationError(
+                    f"Cannot minimize epsilon transitions. State "
+                    f"'{state_name}' has one; determinize() first"
+                )
+
         try:
             # Remove unreachable states first
-            self.remove_unreachable_states()
-            self._normalize()
-
-            # Get accepting states
-            accepting_states = {
-                int(state_name[1:])
-                for state_name, state_def in self.fsa.items()
-                if state_def.get("accept", False)
-            }
-
-            # Initialize table with accepting/non-accepting distinction
+            with self._phase("remove_unreachable"):
+                self.remove_unreachable_states()
+            with self._phase("normalize"):
+                self._normalize()
             num_states = len(self.fsa)
-            table = self._initialize_minimization_table(num_states, accepting_states)
 
-            # Fill the table using the table-filling algorithm
-            table = self._fill_minimization_table(table, num_states)
+            if method == "hopcroft":
+                with self._phase("partition"):
+                    equivalent_groups = self._hopcroft_partition()
+            else:
+                # Get accepting states
+                accepting_states = {
+                    int(state_name[1:])
+                    for state_name, state_def in self.fsa.items()
+                    if state_def.get("accept", False)
+                }
+
+                with self._phase("table_fill"):
+                    # Initialize table with accepting/non-accepting distinction
+                    table = self._initialize_minimization_table(
+                        num_states, accepting_states
+                    )
+
+                    # Fill the table using the table-filling algorithm
+                    table = self._fill_minimization_table(table, num_states)
 
-            # Find equivalent state groups
-            equivalent_groups = self._find_equivalent_states(table, num_states)
+                    # Find equivalent state groups
+                    equivalent_groups = self._find_equivalent_states(table, num_states)
 
             # Merge equivalent states
-            self._merge_equivalent_states(equivalent_groups)
+            with self._phase("merge"):
+                self._merge_equivalent_states(equivalent_groups)
 
             # Normalize and mark as minimized
-            self._normalize()
+            with self._phase("normalize"):
+                self._normalize()
             self.is_min = True
 
         except Exception as e:
@@ -517,6 +1741,237 @@ class StateMachine:
 
         return self
 
+    def add_transition(
+        self, state: StateName, symbol: InputSymbol, target: StateName
+    ) -> StateMachine:
+        """
+        Add a transition, or point an existing one at a new target.
+
+        On a minimized FSA the result is kept minimal without minimizing
+        from scratch, see _reminimize(). The symbol is stored as given,
+        unless the state already has a transition on it or on its string
+        form. Adding an epsilon move makes the FSA non-deterministic, so it
+        is no longer considered minimized.
+
+        Args:
+            state: The state the transition leaves.
+            symbol: The input symbol.
+            target: The state the transition leads to.
+
+        Returns:
+            Self to allow method chaining.
+
+        Raises:
+            InvalidStateError: If either state doesn't exist.
+            FSAError: If the symbol is "start" or "accept".
+        """
+        self._require_state(state)
+        self._require_state(target)
+        if symbol in ("start", "accept"):
+            raise FSAError(f"'{symbol}' is reserved and can't be used as a symbol")
+        if symbol == EPSILON:
+            self.is_min = False
+
+        state_def = self.fsa[state]
+        key = self._transition_key(state_def, symbol)
+        if not self.is_min:
+            state_def[key] = target
+            return self._edited()
+
+        predecessors = self._reverse_index()
+        lost = state_def.get(key)
+        state_def[key] = target
+        if isinstance(lost, list):
+            lost = lost[0]
+        if lost is not None:
+            predecessors.remove(state, key, lost)
+        predecessors.add(state, key, target)
+        return self._reminimize(predecessors, state, lost if lost != target else None)
+
+    def remove_transition(self, state: StateName, symbol: InputSymbol) -> StateMachine:
+        """
+        Remove the transition a state has on a symbol.
+
+        On a minimized FSA the result is kept minimal without minimizing
+        from scratch, see _reminimize(); states that can no longer be
+        reached are removed.
+
+        Args:
+            state: The state the transition leaves.
+            symbol: The input symbol.
+
+        Returns:
+            Self to allow method chaining.
+
+        Raises:
+            InvalidStateError: If the state doesn't exist.
+            InvalidTransitionError: If the state has no transition on the symbol.
+        """
+        self._require_state(state)
+        state_def = self.fsa[state]
+        key = self._transition_key(state_def, symbol)
+        if key in ("start", "accept") or key not in state_def:
+            raise InvalidTransitionError(
+                state, str(symbol), "No transition defined for this input"
+            )
+        if not self.is_min:
+            del state_def[key]
+            return self._edited()
+
+        predecessors = self._reverse_index()
+        lost = state_def.pop(key)
+        if isinstance(lost, list):
+            lost = lost[0]
+        predecessors.remove(state, key, lost)
+        return self._reminimize(predecessors, state, lost)
+
+    def set_accept(self, state: StateName, accept: bool = True) -> StateMachine:
+        """
+        Make a state accepting or rejecting.
+
+        On a minimized FSA the result is kept minimal without minimizing
+        from scratch, see _reminimize().
+
+        Args:
+            state: The state to change.
+            accept: Whether the state accepts.
+
+        Returns:
+            Self to allow method chaining.
+
+        Raises:
+            InvalidStateError: If the state doesn't exist.
+        """
+        self._require_state(state)
+        if not self.is_min:
+            self.fsa[state]["accept"] = accept
+            return self._edited()
+
+        predecessors = self._reverse_index()
+        self.fsa[state]["accept"] = accept
+        return self._reminimize(predecessors, state, None)
+
+    def _require_state(self, state: StateName) -> None:
+        """Raise InvalidStateError if the FSA has no such state."""
+        if state not in self.fsa:
+            raise InvalidStateError(state)
+
+    @staticmethod
+    def _transition_key(state_def: StateDefinition, symbol: InputSymbol) -> Any:
+        """The key a state uses, or would use, for a symbol's transition."""
+        if symbol not in state_def and str(symbol) in state_def:
+            return str(symbol)
+        return symbol
+
+    def _reverse_index(self) -> Predecessors:
+        """Return the reverse transition index, building it on first use."""
+        self._sync()
+        if self._predecessors is None:
+            self._predecessors = Predecessors(self.fsa)
+        return self._predecessors
+
+    def _edited(self) -> StateMachine:
+        """Refresh derived data after an edit that doesn't keep minimality."""
+        self._invalidate_caches()
+        self.accept = self._is_accepting(self.state, self._active)
+        return self
+
+    def _reminimize(
+        self, predecessors: Predecessors, edited: StateName, lost: StateName | None
+    ) -> StateMachine:
+        """
+        Restore minimality after an edit to one state of a minimized FSA.
+
+        If the edit took a transition away from ``lost``, the reverse index
+        is searched backwards from it for the start state; only if it isn't
+        found is the FSA searched for every state that became unreachable.
+        Then only the states that can reach the edited one, and the states
+        they may now be equivalent to, are refined again (see
+        python_fsa.minimize.reminimize), so the cost follows the size of
+        the edit's neighbourhood rather than of the FSA. Surviving states
+        keep their names; the current state follows a merge, or returns to
+        the start state if it was removed.
+        """
+        fsa = self.fsa
+        start = self._start_state()
+
+        removed: set[StateName] = set()
+        if lost is not None and not predecessors.reaches(start, lost):
+            removed = remove_unreachable(fsa, start, predecessors)
+
+        merged: dict[StateName, StateName] = {}
+        if edited not in removed:
+            with self._phase("reminimize"):
+                merged = reminimize(fsa, start, predecessors, edited)
+
+        if self.state in merged:
+            self.state = merged[self.state]
+        elif self.state in removed:
+            self.state = start
+
+        self._invalidate_caches()
+        self._predecessors = predecessors
+        self.is_min = True
+        self.accept = self._is_accepting(self.state, None)
+        return self
+
+    def _hopcroft_partition(self) -> list[set[int]]:
+        """
+        Find groups of equivalent states with Hopcroft's algorithm.
+
+        States must be normalized to S0..S(n-1). A missing transition is
+        treated as a move to an extra dead state that is kept in a block of
+        its own, so a state with a missing transition is never merged with
+        one that has an explicit transition.
+
+        Returns:
+            List of sets containing equivalent state indices.
+
+        Raises:
+            FSAError: If a state has multiple targets for a symbol.
+        """
+        num_states = len(self.fsa)
+        dead = num_states
+
+        symbols: dict[InputSymbol, int] = {}
+        for state_def in self.fsa.values():
+            for key in state_def:
+                if key not in ("start", "accept") and key not in symbols:
+                    symbols[key] = len(symbols)
+
+        # inverse[c][t] lists the states that move to t on symbol c
+        inverse: list[list[list[int]]] = [
+            [[] for _ in range(num_states + 1)] for _ in symbols
+        ]
+        for c in range(len(symbols)):
+            inverse[c][dead].append(dead)
+
+        accepting: set[int] = set()
+        rejecting: set[int] = set()
+        for i in range(num_states):
+            state_def = self.fsa[f"S{i}"]
+            (accepting if state_def.get("accept", False) else rejecting).add(i)
+
+            for symbol, c in symbols.items():
+                target = state_def.get(symbol)  # type: ignore[arg-type]
+                if target is None:
+                    inverse[c][dead].append(i)
+                    continue
+                if isinstance(target, list):
+                    if len(target) != 1:
+                        raise FSAError(
+                            f"Cannot minimize a non-deterministic automaton. "
+                            f"State 'S{i}' has {len(target)} possible transitions "
+                            f"for input '{symbol}'"
+                        )
+                    target = target[0]
+                inverse[c][int(target[1:])].append(i)
+
+        blocks = [block for block in (accepting, rejecting, {dead}) if block]
+        blocks = refine(blocks, inverse)
+
+        return [block for block in blocks if dead not in block]
+
     def _initialize_minimization_table(
         self, num_states: int, accepting_states: set[int]
     ) -> list[list[int]]:
@@ -620,21 +2075,28 @@ class StateMachine:
         """
         Merge equivalent states in the FSA.
 
+        Each group is collapsed into its start state if it has one, otherwise
+        into its lowest-numbered member, and the current state follows its
+        merge.
+
         Args:
             equivalent_groups: Groups of equivalent state indices to merge.
         """
+        start = self._start_state()
+
         # Create mapping from old states to new merged states
         state_mapping: dict[StateName, StateName] = {}
 
         for group in equivalent_groups:
             if len(group) > 1:  # Only merge groups with multiple states
-                sorted_group = sorted(group)
-                keep_state = f"S{sorted_group[0]}"
+                members = [f"S{state_idx}" for state_idx in sorted(group)]
+                keep_state = start if start in members else members[0]
 
                 # Map all states in the group to the kept state
-                for state_idx in sorted_group[1:]:
-                    state_mapping[f"S{state_idx}"] = keep_state
-                    del self.fsa[f"S{state_idx}"]
+                for state_name in members:
+                    if state_name != keep_state:
+                        state_mapping[state_name] = keep_state
+                        del self.fsa[state_name]
 
         # Update all transitions to use the new state names
         for _state_name, state_def in self.fsa.items():
@@ -647,6 +2109,10 @@ class StateMachine:
                 else:
                     state_def[symbol] = state_mapping.get(target, target)
 
+        if self._active is None:
+            self.state = state_mapping.get(self.state, self.state)
+        self._invalidate_caches()
+
     def create_graph(
         self,
         optimize_arrows: bool = True,
@@ -661,6 +2127,9 @@ class StateMachine:
         shows states as circles (double circles for accepting states) and
         transitions as labeled arrows.
 
+        The graph is cached until the FSA changes, so drawing an unchanged
+        FSA again only copies it.
+
         Args:
             optimize_arrows: Whether to combine transition labels for clarity.
             add_spaces: Whether to add spaces in combined transition labels.
@@ -669,8 +2138,18 @@ class StateMachine:
         Returns:
             A Graphviz Digraph object representing the FSA.
         """
+        self._sync()
+        key = ("graph", optimize_arrows, add_spaces, circular_layout)
+        if key not in self._views:
+            self._views[key] = self._draw(optimize_arrows, add_spaces, circular_layout)
+        return self._views[key].copy()
+
+    def _draw(
+        self, optimize_arrows: bool, add_spaces: bool, circular_layout: bool
+    ) -> Digraph:
+        """Build the graph returned by create_graph()."""
         # Get FSA definition (optimized if requested)
-        fsa_def = self.minimize_arrows(add_spaces) if optimize_arrows else self.fsa
+        fsa_def = self._arrows(add_spaces) if optimize_arrows else self.fsa
 
         # Create the graph
         graph = Digraph()
@@ -697,8 +2176,11 @@ class StateMachine:
 
             # Add transitions
             for symbol, target in state_def.items():
-                if symbol not in ("start", "accept"):
-                    graph.edge(state_name, target, label=str(symbol), arrowsize="0.75")
+                if symbol in ("start", "accept"):
+                    continue
+                label = "ε" if symbol == EPSILON else str(symbol)
+                for head in target if isinstance(target, list) else [target]:
+                    graph.edge(state_name, head, label=label, arrowsize="0.75")
 
         return graph
 
@@ -733,3 +2215,9 @@ class StateMachine:
         return self.create_graph(
             optimize_arrows=True, add_spaces=space, circular_layout=circle
         )
+
+
+@lru_cache(maxsize=1024)
+def _regex_dfa(pattern: str, alphabet: str | None) -> FSADefinition:
+    """Build the minimal DFA definition for a pattern, once per pattern."""
+    return StateMachine(regex_nfa(pattern, alphabet)).determinize().minimize().fsa
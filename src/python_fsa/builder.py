@@ -0,0 +1,368 @@
+"""
+Low-overhead construction of large deterministic automata.
+
+This module provides StateMachineBuilder, which collects states and
+transitions by integer id in flat arrays and produces a CompiledAutomaton
+directly. Building through an FSADefinition allocates one dict per state,
+and StateMachine then revalidates every edge and renames states one by
+one. The builder instead checks and places whole arrays of transitions at
+once, and a column of targets given for every state is written into the
+table with a single slice assignment.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from itertools import repeat
+from operator import add, mul
+from typing import TYPE_CHECKING, Any, Iterable
+
+from .compiled import EPSILON, CompiledAutomaton, _fill_fallbacks, _merge_columns
+from .exceptions import FSAError, InvalidFSADefinitionError, InvalidStateError
+
+if TYPE_CHECKING:
+    from .automaton import InputSymbol, StateName
+
+
+class StateMachineBuilder:
+    """
+    Incremental builder for deterministic automata with integer state ids.
+
+    States are numbered 0, 1, 2, ... in the order they are added, and are
+    named ``S<id>`` unless given a name. Transitions may refer to states
+    that haven't been added yet; ids are only checked when build() runs.
+
+    Transitions are kept in two forms. A whole column, given to
+    add_transitions() as the targets of states 0, 1, 2, ..., is stored as
+    one array and later written into the table with a single slice
+    assignment. Other transitions go to three parallel arrays of source
+    ids, symbol columns and target ids, which are placed with C-level map()
+    calls.
+
+    Example:
+        >>> builder = StateMachineBuilder()
+        >>> states = builder.add_states(3)
+        >>> for digit in range(2):
+        ...     builder.add_transitions(
+        ...         str(digit), [(s * 2 + digit) % 3 for s in states]
+        ...     )
+        >>> builder.set_accept(0)
+        >>> builder.build().accepts("110")
+        True
+    """
+
+    __slots__ = (
+        "_symbols",
+        "_symbol_index",
+        "_dense",
+        "_sources",
+        "_columns",
+        "_targets",
+        "_accepting",
+        "_start",
+        "_num_states",
+        "_names",
+    )
+
+    def __init__(self) -> None:
+        """Initialize a builder with no states or transitions."""
+        self._symbols: list[InputSymbol] = []
+        self._symbol_index: dict[Any, int] = {}
+        self._dense: list[tuple[int, array[int]]] = []
+        self._sources = array("i")
+        self._columns = array("i")
+        self._targets = array("i")
+        self._accepting = bytearray()
+        self._start = 0
+        self._num_states = 0
+        self._names: dict[int, StateName] = {}
+
+    @property
+    def num_states(self) -> int:
+        """Number of states added so far."""
+        return self._num_states
+
+    @property
+    def num_transitions(self) -> int:
+        """Number of transitions added so far, counting repeats."""
+        return len(self._targets) + sum(len(targets) for _, targets in self._dense)
+
+    def add_state(
+        self, accept: bool = False, start: bool = False, name: StateName | None = None
+    ) -> int:
+        """
+        Add one state.
+
+        Args:
+            accept: Whether the state is accepting.
+            start: Whether the state is the start state. The first state is
+                the start state unless another one is marked.
+            name: Name of the state in the compiled automaton; defaults to
+                ``S<id>``.
+
+        Returns:
+            The id of the new state.
+        """
+        state = self._num_states
+        self._grow(state + 1)
+        if accept:
+            self.set_accept(state)
+        if start:
+            self._start = state
+        if name is not None:
+            self._names[state] = name
+        return state
+
+    def add_states(self, count: int, accept: bool = False) -> range:
+        """
+        Add several unnamed states at once.
+
+        Args:
+            count: Number of states to add.
+            accept: Whether the new states are accepting.
+
+        Returns:
+            The ids of the new states.
+        """
+        first = self._num_states
+        self._grow(first + count)
+        if accept:
+            for state in range(first, first + count):
+                self.set_accept(state)
+        return range(first, first + count)
+
+    def set_accept(self, state: int, accept: bool = True) -> None:
+        """
+        Mark a state as accepting or not.
+
+        Args:
+            state: The state id.
+            accept: Whether the state is accepting.
+
+        Raises:
+            InvalidStateError: If the state hasn't been added.
+        """
+        self._check_state(state)
+        if accept:
+            self._accepting[state >> 3] |= 1 << (state & 7)
+        else:
+            self._accepting[state >> 3] &= ~(1 << (state & 7)) & 0xFF
+
+    def set_start(self, state: int) -> None:
+        """
+        Make a state the start state.
+
+        Args:
+            state: The state id.
+
+        Raises:
+            InvalidStateError: If the state hasn't been added.
+        """
+        self._check_state(state)
+        self._start = state
+
+    def add_symbol(self, symbol: InputSymbol) -> int:
+        """
+        Register an input symbol, even if no transition uses it.
+
+        Args:
+            symbol: The input symbol.
+
+        Returns:
+            The symbol's column in the builder, in order of registration.
+
+        Raises:
+            FSAError: If the symbol is EPSILON.
+        """
+        column = self._symbol_index.get(symbol)
+        if column is None:
+            if symbol == EPSILON:
+                raise FSAError("Cannot build epsilon transitions")
+            column = self._symbol_index[symbol] = len(self._symbols)
+            self._symbols.append(symbol)
+        return column
+
+    def add_transition(self, source: int, symbol: InputSymbol, target: int) -> None:
+        """
+        Add one transition.
+
+        Args:
+            source: Id of the state the transition leaves.
+            symbol: The input symbol.
+            target: Id of the state the transition enters.
+
+        Raises:
+            FSAError: If the symbol is EPSILON.
+        """
+        self._sources.append(source)
+        self._columns.append(self.add_symbol(symbol))
+        self._targets.append(target)
+
+    def add_transitions(
+        self,
+        symbol: InputSymbol,
+        targets: Iterable[int],
+        sources: Iterable[int] | None = None,
+    ) -> None:
+        """
+        Add many transitions on one symbol at once.
+
+        Args:
+            symbol: The input symbol.
+            targets: Target ids, e.g. an array("i") or a list.
+            sources: Source ids, one per target; defaults to 0, 1, 2, ...,
+                so that ``targets[s]`` is the target of state s.
+
+        Raises:
+            FSAError: If the symbol is EPSILON, or sources and targets differ
+                in length.
+        """
+        column = self.add_symbol(symbol)
+        added = array("i", targets)
+        if sources is None:
+            self._dense.append((column, added))
+            return
+
+        origins = array("i", sources)
+        if len(origins) != len(added):
+            raise FSAError(
+                f"Got {len(origins)} sources for {len(added)} transition targets"
+            )
+        self._sources.extend(origins)
+        self._columns.extend(array("i", [column]) * len(added))
+        self._targets.extend(added)
+
+    def build(self) -> CompiledAutomaton:
+        """
+        Build the compiled automaton.
+
+        Every array of transitions is checked as a whole: its state ids
+        against the number of states, and the table cells it fills against
+        targets placed earlier. Symbols that behave the same in every state
+        share a column, as in CompiledAutomaton.from_definition(). The
+        builder is left unchanged and can be extended and built again.
+
+        Returns:
+            The compiled automaton.
+
+        Raises:
+            InvalidFSADefinitionError: If there are no states, or two states
+                have the same name.
+            InvalidStateError: If a transition refers to a state that hasn't
+                been added.
+            FSAError: If a state has more than one target for a symbol.
+        """
+        dead = self._num_states
+        if dead == 0:
+            raise InvalidFSADefinitionError("FSA definition cannot be empty")
+        width = len(self._symbols)
+        table = array("i", [dead]) * ((dead + 1) * width)
+
+        for column, targets in self._dense:
+            if len(targets) > dead:
+                raise InvalidStateError(str(dead), f"Invalid state id {dead}")
+            self._check_ids(targets)
+            column_cells = slice(column, len(targets) * width, width)
+            self._check_conflicts(
+                table[column_cells], targets, range(len(targets)), repeat(column)
+            )
+            table[column_cells] = targets
+
+        if self._targets:
+            self._check_ids(self._sources)
+            self._check_ids(self._targets)
+            cells = array(
+                "i", map(add, map(mul, self._sources, repeat(width)), self._columns)
+            )
+            get_cell = table.__getitem__
+            self._check_conflicts(
+                array("i", map(get_cell, cells)),
+                self._targets,
+                self._sources,
+                self._columns,
+            )
+            deque(map(table.__setitem__, cells, self._targets), maxlen=0)
+            # A cell given two targets keeps the last one, so the other differs
+            self._check_conflicts(
+                array("i", map(get_cell, cells)),
+                self._targets,
+                self._sources,
+                self._columns,
+                placed=True,
+            )
+
+        names: list[StateName] = list(map("S{}".format, range(dead)))
+        for state, name in self._names.items():
+            names[state] = name
+        if self._names and len(set(names)) != dead:
+            raise InvalidFSADefinitionError("State names must be unique")
+
+        _fill_fallbacks(table, self._symbol_index, dead)
+        table, symbol_index = _merge_columns(table, self._symbol_index, dead + 1)
+        accepting = self._accepting + bytes((dead + 8) // 8 - len(self._accepting))
+        return CompiledAutomaton(
+            names, self._symbols, symbol_index, table, bytes(accepting), self._start
+        )
+
+    def _check_ids(self, ids: array[int]) -> None:
+        """Raise InvalidStateError if an array holds an id that wasn't added."""
+        if ids and not (min(ids) >= 0 and max(ids) < self._num_states):
+            bad = next(i for i in ids if not 0 <= i < self._num_states)
+            raise InvalidStateError(str(bad), f"Invalid state id {bad}")
+
+    def _check_conflicts(
+        self,
+        existing: array[int],
+        targets: array[int],
+        sources: Iterable[int],
+        columns: Iterable[int],
+        placed: bool = False,
+    ) -> None:
+        """
+        Raise FSAError if table cells hold targets other than the given ones.
+
+        Args:
+            existing: Current contents of the cells.
+            targets: Targets placed, or about to be placed, in the cells.
+            sources: Source state of each cell.
+            columns: Symbol column of each cell.
+            placed: Whether the targets were already written, so that every
+                cell must hold its own target; otherwise empty cells pass.
+        """
+        dead = self._num_states
+        if existing == targets if placed else existing.count(dead) == len(existing):
+            return
+
+        for old, new, state, column in zip(existing, targets, sources, columns):
+            if old != new and (placed or old != dead):
+                raise FSAError(
+                    f"Cannot compile a non-deterministic automaton. State "
+                    f"'{self._name(state)}' has more than one transition for "
+                    f"input '{self._symbols[column]}'"
+                )
+
+    def _grow(self, count: int) -> None:
+        """Extend the state count and the accept bitmap to cover it."""
+        self._num_states = count
+        self._accepting.extend(bytes((count + 7) // 8 - len(self._accepting)))
+
+    def _check_state(self, state: int) -> None:
+        """Raise InvalidStateError if a state id hasn't been added."""
+        if not 0 <= state < self._num_states:
+            raise InvalidStateError(str(state), f"Invalid state id {state}")
+
+    def _name(self, state: int) -> StateName:
+        """Return the name a state will have in the compiled automaton."""
+        return self._names.get(state, f"S{state}")
+
+    def __len__(self) -> int:
+        """Return the number of states added so far."""
+        return self._num_states
+
+    def __repr__(self) -> str:
+        """Return a short summary of the builder's contents."""
+        return (
+            f"StateMachineBuilder(states={self._num_states}, "
+            f"symbols={len(self._symbols)}, transitions={self.num_transitions})"
+        )
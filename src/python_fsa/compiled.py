@@ -0,0 +1,1024 @@
+"""
+Compiled integer-table representation of deterministic automata.
+
+This module provides CompiledAutomaton, an immutable form of a DFA in which
+states and input symbols are interned to dense integers and the transition
+function is stored as a single flat array. Running input through the
+compiled form avoids the per-symbol dictionary probing, type checks and
+string rebinding done by StateMachine.__call__.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+import sys
+import tempfile
+import zlib
+from array import array
+from collections.abc import Sized
+from itertools import chain
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Container,
+    Iterable,
+    List,
+    Sequence,
+    Tuple,
+    Union,
+    overload,
+)
+
+from .exceptions import FSAError, InvalidStateError, InvalidTransitionError
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from .automaton import FSADefinition, InputSymbol, StateName
+
+# Transition key for moves that consume no input
+EPSILON = ""
+
+# Binary buffers that are run byte by byte instead of symbol by symbol
+BUFFER_TYPES = (bytes, bytearray, memoryview, mmap.mmap)
+BinaryInput = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+# Bytes translated and scanned per step of a buffer run
+_CHUNK_SIZE = 1 << 16
+
+# Byte-to-class table, per-state rows indexed by class, symbol of each byte
+_ByteTables = Tuple[bytes, List[List[int]], List[Any]]
+
+# A flat transition table, built in memory or viewed in a loaded file
+_Table = Union["array[int]", memoryview]
+
+# magic, format version, flags, number of states, number of classes, start
+# state, size of the symbol table, size of the state names
+_FILE_HEADER = struct.Struct("<4sHHIIIIQ")
+_FILE_MAGIC = b"FSAT"
+_FILE_VERSION = 1
+
+
+def byte_symbols(keys: Container[Any]) -> list[Any]:
+    """
+    Work out which transition key each byte value stands for.
+
+    A byte b is read as the one-character string ``chr(b)``, so text
+    alphabets like "0"/"1" or "a"/"b" work on encoded input. If only the
+    integer b is a key, the byte is read as that integer instead.
+
+    Args:
+        keys: The transition keys of an automaton.
+
+    Returns:
+        A list of 256 symbols, indexed by byte value.
+    """
+    return [b if chr(b) not in keys and b in keys else chr(b) for b in range(256)]
+
+
+def _require_numpy(feature: str) -> Any:
+    """
+    Import NumPy for a feature that depends on it.
+
+    Args:
+        feature: Name of the feature, used in the error message.
+
+    Returns:
+        The numpy module.
+
+    Raises:
+        ImportError: If NumPy is not installed.
+    """
+    try:
+        import numpy
+    except ImportError as e:
+        raise ImportError(
+            f"{feature} requires NumPy; install it with "
+            "'pip install python-fsa[numpy]'"
+        ) from e
+    return numpy
+
+
+def _fill_fallbacks(table: array[int], symbol_index: dict[Any, int], dead: int) -> None:
+    """
+    Fill missing transitions on non-string symbols from their string form.
+
+    StateMachine.__call__ retries a symbol that isn't a key of the current
+    state as ``str(symbol)``, so wherever the column of such a symbol leads
+    to the dead state, the table takes the target of its string form.
+
+    Args:
+        table: Flat row-major table with one column per symbol, modified in
+            place.
+        symbol_index: Mapping from input symbol to its column in table.
+        dead: Id of the dead state, i.e. the number of states.
+    """
+    width = len(symbol_index)
+    for key, column in symbol_index.items():
+        fallback = symbol_index.get(str(key))
+        if isinstance(key, str) or fallback is None:
+            continue
+        for row in range(0, dead * width, width):
+            if table[row + column] == dead:
+                table[row + column] = table[row + fallback]
+
+
+def _merge_columns(
+    table: array[int], symbol_index: dict[Any, int], rows: int
+) -> tuple[array[int], dict[Any, int]]:
+    """
+    Merge table columns that are identical in every row.
+
+    Symbols with the same target from every state are interchangeable, so
+    they can share a column. The result has one column per equivalence
+    class, numbered in order of first appearance.
+
+    Args:
+        table: Flat row-major table with one column per symbol.
+        symbol_index: Mapping from input symbol to its column in table.
+        rows: Number of rows in table.
+
+    Returns:
+        The table with one column per class, and the mapping from input
+        symbol to class.
+    """
+    width = len(table) // rows
+    class_of: dict[bytes, int] = {}
+    representatives: list[int] = []
+    column_class = []
+    for column in range(width):
+        signature = table[column::width].tobytes()
+        if signature not in class_of:
+            class_of[signature] = len(representatives)
+            representatives.append(column)
+        column_class.append(class_of[signature])
+
+    if len(representatives) == width:
+        return table, symbol_index
+    merged = array(
+        "i",
+        (
+            table[row + c]
+            for row in range(0, len(table), width)
+            for c in representatives
+        ),
+    )
+    return merged, {symbol: column_class[c] for symbol, c in symbol_index.items()}
+
+
+def _deep_sizeof(seen: set[int], *objects: Any) -> int:
+    """
+    Add up the memory held by objects and everything they contain.
+
+    Containers are followed into their items, and instances of this
+    package's classes into their slots and attributes. Memoryviews count
+    the bytes they expose, since the object behind them may be a file
+    mapping that sys.getsizeof() doesn't see. Objects already in seen are
+    skipped, so shared data is counted once across calls.
+
+    Args:
+        seen: Ids of objects counted so far, updated in place.
+        *objects: The objects to measure; None is ignored.
+
+    Returns:
+        The total size in bytes.
+    """
+    package = __name__.partition(".")[0]
+    size = 0
+    stack = list(objects)
+    while stack:
+        obj = stack.pop()
+        if obj is None or id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif isinstance(obj, memoryview):
+            size += obj.nbytes
+        elif type(obj).__module__.partition(".")[0] == package:
+            for cls in type(obj).__mro__:
+                for slot in cls.__dict__.get("__slots__", ()):
+                    stack.append(getattr(obj, slot, None))
+            stack.append(getattr(obj, "__dict__", None))
+    return size
+
+
+class CompiledAutomaton:
+    """
+    An immutable, array-backed deterministic finite automaton.
+
+    States are numbered 0..n-1 in definition order. Input symbols that have
+    the same target from every state are grouped into one class, and each
+    class is assigned a column; an automaton over the ten digits that only
+    looks at their parity needs two columns, not ten. Transitions live in a
+    flat row-major table where ``table[state * width + column]`` is the
+    target state. Missing transitions point at an extra dead state with
+    index n, which loops to itself on every symbol and is never accepting.
+    Accepting states are kept as a little-endian bitmap.
+
+    Instances are normally obtained through StateMachine.compile() and give
+    the same answers as StateMachine.__call__ for the same input.
+    """
+
+    __slots__ = (
+        "_states",
+        "_state_index",
+        "_symbols",
+        "_symbol_index",
+        "_table",
+        "_accepting",
+        "_start",
+        "_width",
+        "_bytes",
+    )
+
+    def __init__(
+        self,
+        states: Sequence[StateName],
+        symbols: Sequence[InputSymbol],
+        symbol_index: dict[Any, int],
+        table: _Table,
+        accepting: bytes,
+        start: int,
+    ) -> None:
+        """
+        Initialize the compiled automaton from prebuilt tables.
+
+        Args:
+            states: State names, indexed by state id.
+            symbols: Input symbols of the automaton.
+            symbol_index: Mapping from input symbol to table column. Symbols
+                in the same class share a column.
+            table: Flat transition table with ``len(states) + 1`` rows and
+                one column per class.
+            accepting: Accept bitmap covering every row of the table.
+            start: Id of the start state.
+
+        Raises:
+            FSAError: If the table dimensions don't match the given states.
+        """
+        width = max(symbol_index.values(), default=-1) + 1
+        if len(table) != (len(states) + 1) * width:
+            raise FSAError(
+                f"Transition table has {len(table)} entries, expected "
+                f"{(len(states) + 1) * width}"
+            )
+        if not 0 <= start < len(states):
+            raise FSAError(f"Start state id {start} is out of range")
+        accepting = bytes(accepting)
+
+        self._assign(
+            tuple(states), tuple(symbols), dict(symbol_index), table, accepting, start
+        )
+
+    def _assign(
+        self,
+        states: Sequence[StateName],
+        symbols: tuple[InputSymbol, ...],
+        symbol_index: dict[Any, int],
+        table: _Table,
+        accepting: bytes | memoryview,
+        start: int,
+    ) -> None:
+        """Set every slot from already validated tables, without copying."""
+        self._states = states
+        self._state_index: dict[StateName, int] | None = None
+        self._symbols = symbols
+        self._symbol_index = symbol_index
+        self._table = table
+        self._accepting = accepting
+        self._start = start
+        self._width = max(symbol_index.values(), default=-1) + 1
+        self._bytes: _ByteTables | None = None
+
+    @classmethod
+    def from_definition(cls, fsa: FSADefinition) -> CompiledAutomaton:
+        """
+        Compile a dictionary FSA definition into integer tables.
+
+        Symbol lookup mirrors StateMachine.__call__: an input symbol that is
+        not a key of the current state is retried as ``str(symbol)``.
+
+        Args:
+            fsa: A validated FSA definition with exactly one start state.
+
+        Returns:
+            The compiled automaton.
+
+        Raises:
+            FSAError: If a state has more than one target for a symbol.
+        """
+        states = list(fsa)
+        state_index = {name: i for i, name in enumerate(states)}
+        dead = len(states)
+
+        symbols: list[InputSymbol] = []
+        symbol_index: dict[Any, int] = {}
+        for state_def in fsa.values():
+            for key in state_def:
+                if key not in ("start", "accept") and key not in symbol_index:
+                    symbol_index[key] = len(symbols)
+                    symbols.append(key)
+
+        width = len(symbols)
+        table = array("i", [dead]) * ((dead + 1) * width)
+        accepting = bytearray((dead + 8) // 8)
+        start = 0
+
+        for i, (state_name, state_def) in enumerate(fsa.items()):
+            if state_def.get("start", False):
+                start = i
+            if state_def.get("accept", False):
+                accepting[i >> 3] |= 1 << (i & 7)
+
+            for key, target in state_def.items():
+                if key in ("start", "accept"):
+                    continue
+
+                if key == EPSILON:
+                    raise FSAError(
+                        f"Cannot compile epsilon transitions. State "
+                        f"'{state_name}' has one; determinize() first"
+                    )
+                if isinstance(target, list):
+                    if len(target) != 1:
+                        raise FSAError(
+                            f"Cannot compile a non-deterministic automaton. "
+                            f"State '{state_name}' has {len(target)} possible "
+                            f"transitions for input '{key}'"
+                        )
+                    target = target[0]
+
+                table[i * width + symbol_index[key]] = state_index[target]
+
+        _fill_fallbacks(table, symbol_index, dead)
+        table, symbol_index = _merge_columns(table, symbol_index, dead + 1)
+        return cls(states, symbols, symbol_index, table, bytes(accepting), start)
+
+    def to_definition(self) -> FSADefinition:
+        """
+        Build the dictionary definition of the automaton.
+
+        Every state gets an entry for each symbol that doesn't lead to the
+        dead state, in the order of symbols, followed by its start and
+        accept flags. A StateMachine made from the result runs the same
+        way as this automaton.
+
+        Returns:
+            A new FSA definition with the automaton's state names.
+        """
+        states = self.states
+        dead = len(states)
+        table = self._table
+        columns = [(symbol, self._symbol_index[symbol]) for symbol in self._symbols]
+
+        fsa: FSADefinition = {}
+        for state, name in enumerate(states):
+            row = state * self._width
+            state_def: dict[Any, Any] = {}
+            for symbol, column in columns:
+                target = table[row + column]
+                if target != dead:
+                    state_def[symbol] = states[target]
+            state_def["start"] = state == self._start
+            state_def["accept"] = self.is_accepting(state)
+            fsa[name] = state_def
+        return fsa
+
+    @property
+    def states(self) -> tuple[StateName, ...]:
+        """State names, indexed by state id."""
+        if not isinstance(self._states, tuple):
+            self._states = tuple(self._states)
+        return self._states
+
+    @property
+    def symbols(self) -> tuple[InputSymbol, ...]:
+        """Input symbols, in order of first appearance in the definition."""
+        return self._symbols
+
+    @property
+    def symbol_classes(self) -> tuple[int, ...]:
+        """Table column of each input symbol, in the order of symbols."""
+        return tuple(self._symbol_index[symbol] for symbol in self._symbols)
+
+    @property
+    def num_classes(self) -> int:
+        """Number of symbol classes, i.e. the width of the transition table."""
+        return self._width
+
+    @property
+    def start(self) -> int:
+        """Id of the start state."""
+        return self._start
+
+    @property
+    def dead(self) -> int:
+        """Id of the implicit dead state that missing transitions lead to."""
+        return len(self._states)
+
+    @property
+    def num_states(self) -> int:
+        """Number of states, not counting the implicit dead state."""
+        return len(self._states)
+
+    @property
+    def transitions(self) -> memoryview:
+        """Read-only view of the flat transition table."""
+        return memoryview(self._table).toreadonly()
+
+    def state_name(self, state: int) -> StateName:
+        """
+        Look up the name of a state id.
+
+        Args:
+            state: The state id.
+
+        Returns:
+            The state's name from the original definition.
+
+        Raises:
+            InvalidStateError: If the id doesn't belong to a real state.
+        """
+        if not 0 <= state < len(self._states):
+            raise InvalidStateError(str(state), f"Invalid state id {state}")
+        return self._states[state]
+
+    def state_id(self, name: StateName) -> int:
+        """
+        Look up the id of a state name.
+
+        Args:
+            name: The state name.
+
+        Returns:
+            The dense integer id of the state.
+
+        Raises:
+            InvalidStateError: If no state has that name.
+        """
+        if self._state_index is None:
+            self._state_index = {name: i for i, name in enumerate(self._states)}
+        try:
+            return self._state_index[name]
+        except KeyError:
+            raise InvalidStateError(name) from None
+
+    def column(self, symbol: InputSymbol) -> int | None:
+        """
+        Look up the table column of an input symbol.
+
+        The symbol is resolved like run() does, retrying it as
+        ``str(symbol)`` if it isn't a key itself.
+
+        Args:
+            symbol: The input symbol.
+
+        Returns:
+            The column of the symbol's class, or None if it has no column.
+        """
+        column = self._symbol_index.get(symbol)
+        if column is None:
+            column = self._symbol_index.get(str(symbol))
+        return column
+
+    def is_accepting(self, state: int) -> bool:
+        """
+        Check whether a state id is accepting.
+
+        Args:
+            state: The state id.
+
+        Returns:
+            True if the state is accepting.
+        """
+        return bool(self._accepting[state >> 3] >> (state & 7) & 1)
+
+    def run(
+        self, inputs: Iterable[InputSymbol] | BinaryInput, start: int | None = None
+    ) -> int:
+        """
+        Run input symbols through the automaton.
+
+        Binary buffers (bytes, bytearray, memoryview, mmap) are run a byte
+        at a time through a 256-entry translation table; see byte_symbols()
+        for how bytes map to transition keys.
+
+        Args:
+            inputs: The input symbols to process, or a binary buffer.
+            start: State id to start from; defaults to the start state.
+
+        Returns:
+            The id of the state reached after consuming every input symbol.
+
+        Raises:
+            InvalidTransitionError: If a transition is not defined for a symbol.
+        """
+        if isinstance(inputs, BUFFER_TYPES):
+            return self._run_buffer(inputs, self._start if start is None else start)
+
+        table = self._table
+        width = self._width
+        index = self._symbol_index
+        dead = len(self._states)
+        state = self._start if start is None else start
+
+        for symbol in inputs:
+            try:
+                column = index[symbol]
+            except KeyError:
+                column = self._fallback_column(state, symbol)
+
+            target = table[state * width + column]
+            if target == dead:
+                raise self._transition_error(state, symbol)
+            state = target
+
+        return state
+
+    def accepts(self, inputs: Iterable[InputSymbol]) -> bool:
+        """
+        Check whether the automaton accepts a sequence of input symbols.
+
+        Args:
+            inputs: The input symbols to process.
+
+        Returns:
+            True if the state reached after the input is accepting.
+
+        Raises:
+            InvalidTransitionError: If a transition is not defined for a symbol.
+        """
+        return self.is_accepting(self.run(inputs))
+
+    def accepts_many(
+        self,
+        sequences: Iterable[Iterable[InputSymbol]],
+        return_states: bool = False,
+    ) -> np.ndarray | tuple[np.ndarray, np.ndarray]:
+        """
+        Check a batch of input sequences at once using NumPy.
+
+        Every sequence is encoded to table columns and concatenated into a
+        single ragged buffer. Sequences are ordered by decreasing length, so
+        at step j the ones still running form a prefix of the batch and are
+        all advanced with one fancy-indexed gather from the transition table.
+
+        Unlike accepts(), a sequence with an undefined transition or an
+        unknown symbol doesn't raise; it ends in the dead state and is
+        reported as rejected.
+
+        Args:
+            sequences: The input sequences, e.g. a list of lists or strings.
+            return_states: Whether to also return the final state ids.
+
+        Returns:
+            A boolean array with one entry per sequence, or a tuple of that
+            array and an integer array of final state ids if return_states is
+            set. Sequences that fell off the automaton end in ``self.dead``.
+
+        Raises:
+            ImportError: If NumPy is not installed.
+        """
+        numpy = _require_numpy("accepts_many()")
+
+        batch = list(sequences)
+        kinds = set(map(type, batch))
+        if not all(issubclass(kind, Sized) for kind in kinds):
+            batch = [s if isinstance(s, Sized) else list(s) for s in batch]
+            kinds = set(map(type, batch))
+        flat, length = self._encode_batch(numpy, batch, kinds <= {str})
+
+        dead = len(self._states)
+        width = self._width + 1
+        table = numpy.full((dead + 1, width), dead, dtype=numpy.int32)
+        table[:, : self._width] = numpy.frombuffer(
+            self._table, dtype=numpy.int32
+        ).reshape(dead + 1, self._width)
+        table = table.ravel()
+        accepting = numpy.unpackbits(
+            numpy.frombuffer(self._accepting, dtype=numpy.uint8), bitorder="little"
+        )[: dead + 1].astype(bool)
+
+        offsets = numpy.zeros(len(length), dtype=numpy.int64)
+        numpy.cumsum(length[:-1], out=offsets[1:])
+
+        # Longest first, so the sequences still running are always a prefix
+        order = numpy.argsort(-length, kind="stable")
+        sorted_length = length[order]
+        positions = offsets[order]
+        states = numpy.full(len(length), self._start, dtype=numpy.intp)
+
+        longest = int(sorted_length[0]) if len(length) else 0
+        running = numpy.searchsorted(
+            -sorted_length, -numpy.arange(longest), side="left"
+        ).tolist()
+        for step, count in enumerate(running):
+            current = states[:count]
+            current[:] = table[current * width + flat[positions[:count] + step]]
+
+        final: np.ndarray = numpy.empty_like(states)
+        final[order] = states
+        accepted: np.ndarray = accepting[final]
+        if return_states:
+            return accepted, final
+        return accepted
+
+    def _encode_batch(
+        self, numpy: Any, batch: list[Any], text: bool
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Encode a batch of sequences into one flat column buffer.
+
+        Batches made only of strings are translated by code point with a
+        NumPy lookup table; anything else goes through a cached dictionary
+        lookup per symbol.
+
+        Args:
+            numpy: The numpy module.
+            batch: The input sequences, each supporting len().
+            text: Whether every sequence is a string.
+
+        Returns:
+            The concatenated table columns and the length of each sequence.
+        """
+        reject = self._width
+        length = numpy.fromiter(map(len, batch), dtype=numpy.int64, count=len(batch))
+        total = int(length.sum())
+
+        if text:
+            joined = "".join(batch)
+            points = numpy.frombuffer(joined.encode("utf-32-le"), dtype=numpy.uint32)
+            chars = {
+                ord(symbol): column
+                for symbol, column in self._symbol_index.items()
+                if isinstance(symbol, str) and len(symbol) == 1
+            }
+            lookup = numpy.full(max(chars, default=0) + 2, reject, dtype=numpy.int32)
+            lookup[list(chars)] = list(chars.values())
+            flat = lookup[numpy.minimum(points, len(lookup) - 1)]
+        else:
+            columns = _ColumnLookup(self._symbol_index, reject)
+            flat = numpy.fromiter(
+                map(columns.__getitem__, chain.from_iterable(batch)),
+                dtype=numpy.int32,
+                count=total,
+            )
+
+        return flat, length
+
+    def _checksum(self) -> int:
+        """
+        Compute a CRC-32 of everything that decides how input is run.
+
+        That is the symbols and their classes, the start state, the
+        transition table as little-endian int32 values and the accept
+        bitmap. State names are left out, so a loaded file whose names were
+        never decoded doesn't decode them here.
+
+        Returns:
+            The checksum, the same on every platform for equal tables.
+        """
+        table: _Table = self._table
+        if sys.byteorder != "little":
+            table = array("i", table)
+            table.byteswap()
+
+        shape = repr((self._symbols, self.symbol_classes, self._start)).encode()
+        checksum = zlib.crc32(shape)
+        checksum = zlib.crc32(table, checksum)
+        return zlib.crc32(self._accepting, checksum)
+
+    def _byte_tables(self) -> _ByteTables:
+        """
+        Build, once, the tables used to run binary buffers.
+
+        Bytes are grouped into classes by the table column they map to, with
+        one extra class for bytes that aren't symbols of the automaton. Every
+        state gets a row of targets indexed by class, and bytes.translate()
+        turns raw input into class ids at C speed.
+
+        Returns:
+            The byte-to-class translation table, the per-state rows (including
+            the dead state) and the symbol each byte stands for.
+        """
+        if self._bytes is None:
+            symbols = byte_symbols(self._symbol_index)
+            columns = [self._symbol_index.get(s, self._width) for s in symbols]
+            used = sorted(set(columns))
+            class_of = {column: i for i, column in enumerate(used)}
+
+            table = self._table
+            width = self._width
+            dead = len(self._states)
+            rows = [
+                [table[state * width + c] if c < width else dead for c in used]
+                for state in range(dead + 1)
+            ]
+            self._bytes = (bytes(map(class_of.__getitem__, columns)), rows, symbols)
+        return self._bytes
+
+    def _run_buffer(self, data: Any, state: int) -> int:
+        """
+        Run a binary buffer through the automaton, a chunk at a time.
+
+        Each chunk is translated to byte classes and scanned without any
+        checks; the dead state absorbs every class, so one comparison after
+        the chunk finds whether a transition was missing. Only then is the
+        chunk scanned again to report the offending byte.
+
+        Args:
+            data: A bytes-like object or mmap.
+            state: State id to start from.
+
+        Returns:
+            The id of the state reached after consuming every byte.
+
+        Raises:
+            InvalidTransitionError: If a transition is not defined for a byte.
+        """
+        classes, rows, symbols = self._byte_tables()
+        dead = len(self._states)
+
+        with memoryview(data) as view, view.cast("B") as flat:
+            for offset in range(0, len(flat), _CHUNK_SIZE):
+                raw = flat[offset : offset + _CHUNK_SIZE].tobytes()
+                before = state
+                for byte_class in raw.translate(classes):
+                    state = rows[state][byte_class]
+
+                if state == dead:
+                    state = before
+                    for byte, byte_class in zip(raw, raw.translate(classes)):
+                        target = rows[state][byte_class]
+                        if target == dead:
+                            raise self._transition_error(state, symbols[byte])
+                        state = target
+
+        return state
+
+    def _fallback_column(self, state: int, symbol: InputSymbol) -> int:
+        """Resolve an unknown symbol through its string form, or raise."""
+        column: int | None = self._symbol_index.get(str(symbol))
+        if column is None:
+            raise self._transition_error(state, symbol)
+        return column
+
+    def _transition_error(
+        self, state: int, symbol: InputSymbol
+    ) -> InvalidTransitionError:
+        """Build the error raised when no transition exists for a symbol."""
+        return InvalidTransitionError(
+            self._states[state], str(symbol), "No transition defined for this input"
+        )
+
+    def memory_footprint(self) -> dict[str, int]:
+        """
+        Report how many bytes each part of the automaton holds.
+
+        Tables viewed in a file opened by load() are counted at full size,
+        although they live in the page cache and are shared by every
+        process that maps the file.
+
+        Returns:
+            Bytes held by the transition table ("table"), the accept bitmap
+            ("accepting"), the symbols and their classes ("symbols"), the
+            state names and the index built by state_id() ("states"), the
+            tables built for binary input ("byte_tables"), and their sum
+            ("total").
+        """
+        seen: set[int] = set()
+        footprint = {
+            "table": _deep_sizeof(seen, self._table),
+            "accepting": _deep_sizeof(seen, self._accepting),
+            "symbols": _deep_sizeof(seen, self._symbols, self._symbol_index),
+            "states": _deep_sizeof(seen, self._states, self._state_index),
+            "byte_tables": _deep_sizeof(seen, self._bytes),
+        }
+        footprint["total"] = sum(footprint.values())
+        return footprint
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """
+        Write the automaton to a file in a compact binary format.
+
+        The file holds a fixed header, the symbol table and state names as
+        JSON, then the transition table as little-endian int32 values and the
+        accept bitmap, each laid out exactly as in memory. The file is
+        replaced atomically, so processes that have the old version mapped
+        keep a consistent view of it.
+
+        Args:
+            path: Where to write the file.
+
+        Raises:
+            FSAError: If a symbol or state name is not a string or integer.
+        """
+        for symbol in self._symbols:
+            if not isinstance(symbol, (str, int)):
+                raise FSAError(f"Cannot save symbol {symbol!r}; use str or int")
+        try:
+            names = json.dumps(list(self._states)).encode()
+        except TypeError as e:
+            raise FSAError(f"Cannot save state names: {e}") from None
+        symbols = json.dumps(
+            [[symbol, self._symbol_index[symbol]] for symbol in self._symbols]
+        ).encode()
+
+        header = _FILE_HEADER.pack(
+            _FILE_MAGIC,
+            _FILE_VERSION,
+            0,
+            len(self._states),
+            self._width,
+            self._start,
+            len(symbols),
+            len(names),
+        )
+        # Pad so the table starts on a 4-byte boundary and can be cast in place
+        padding = bytes(-(len(header) + len(symbols) + len(names)) % 4)
+
+        table: _Table = self._table
+        if sys.byteorder != "little":
+            table = array("i", table)
+            table.byteswap()
+
+        path = os.fspath(path)
+        fd, temp = tempfile.mkstemp(dir=os.path.dirname(path) or ".")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for part in (header, symbols, names, padding, table, self._accepting):
+                    f.write(part)
+            os.replace(temp, path)
+        except BaseException:
+            os.unlink(temp)
+            raise
+
+    @classmethod
+    def load(
+        cls, path: str | os.PathLike[str], memory_map: bool = True
+    ) -> CompiledAutomaton:
+        """
+        Read an automaton written by save().
+
+        With memory_map set, the transition table and accept bitmap are used
+        straight from a read-only mapping of the file rather than copied, and
+        state names are only decoded when first needed. Loading then takes
+        about the same time whatever the size of the automaton, and worker
+        processes that load the same file share its pages.
+
+        The header and table sizes are checked, but the table entries are
+        trusted, so only load files written by save().
+
+        Args:
+            path: The file to read.
+            memory_map: Whether to map the file instead of reading it.
+
+        Returns:
+            The loaded automaton.
+
+        Raises:
+            FSAError: If the file is not a saved automaton, was written by an
+                unsupported version, or is truncated.
+        """
+        with open(path, "rb") as f:
+            data: bytes | mmap.mmap
+            if memory_map and os.fstat(f.fileno()).st_size > 0:
+                data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                data = f.read()
+
+        view = memoryview(data)
+        if len(view) < _FILE_HEADER.size:
+            raise FSAError("File is too short to be a saved automaton")
+        magic, version, _, num_states, width, start, symbols_size, names_size = (
+            _FILE_HEADER.unpack_from(view)
+        )
+        if magic != _FILE_MAGIC or version != _FILE_VERSION:
+            raise FSAError("Not a saved automaton, or an unsupported version")
+
+        names_start = _FILE_HEADER.size + symbols_size
+        table_start = names_start + names_size
+        table_start += -table_start % 4
+        accept_start = table_start + 4 * (num_states + 1) * width
+        if len(view) != accept_start + (num_states + 8) // 8:
+            raise FSAError("Saved automaton is truncated")
+
+        symbols = view[_FILE_HEADER.size : names_start].tobytes()
+        symbol_index: dict[Any, int] = dict(json.loads(symbols))
+        if max(symbol_index.values(), default=-1) + 1 != width:
+            raise FSAError("Saved automaton's symbol table doesn't match its header")
+        if not 0 <= start < num_states:
+            raise FSAError(f"Start state id {start} is out of range")
+
+        raw = view[table_start:accept_start]
+        table: _Table
+        if sys.byteorder == "little":
+            table = raw.cast("i")
+        else:
+            table = array("i", raw.tobytes())
+            table.byteswap()
+
+        compiled = cls.__new__(cls)
+        compiled._assign(
+            _StateNames(view[names_start:table_start], num_states),
+            tuple(symbol_index),
+            symbol_index,
+            table,
+            view[accept_start:],
+            start,
+        )
+        return compiled
+
+    def __len__(self) -> int:
+        """Return the number of states, not counting the dead state."""
+        return len(self._states)
+
+    def __repr__(self) -> str:
+        """Return a short summary of the automaton's dimensions."""
+        return (
+            f"CompiledAutomaton(states={len(self._states)}, "
+            f"symbols={len(self._symbols)}, classes={self._width}, "
+            f"start={self._start})"
+        )
+
+
+class _ColumnLookup(dict):
+    """
+    Symbol-to-column mapping that resolves misses like CompiledAutomaton.run.
+
+    Unknown symbols are retried as ``str(symbol)`` and otherwise mapped to
+    the extra reject column. Resolved misses are cached, so looking up a
+    whole batch stays a C-level dictionary probe per symbol.
+    """
+
+    def __init__(self, symbol_index: dict[Any, int], reject: int) -> None:
+        """
+        Initialize the lookup from a symbol index.
+
+        Args:
+            symbol_index: Mapping from input symbol to table column.
+            reject: Column that sends every state to the dead state.
+        """
+        super().__init__(symbol_index)
+        self._reject = reject
+
+    def __missing__(self, symbol: Any) -> int:
+        """Resolve and cache the column of a symbol not in the index."""
+        column: int = dict.get(self, str(symbol), self._reject)
+        self[symbol] = column
+        return column
+
+
+class _StateNames(Sequence["StateName"]):
+    """
+    State names in a loaded file, decoded from JSON on first access.
+
+    Decoding a million names takes a noticeable fraction of a second, and
+    most runs only need the number of states, so loading defers it.
+    """
+
+    __slots__ = ("_data", "_count", "_names")
+
+    def __init__(self, data: memoryview, count: int) -> None:
+        """
+        Wrap the encoded names.
+
+        Args:
+            data: The JSON array of names, with any padding after it.
+            count: The number of states given in the file header.
+        """
+        self._data = data
+        self._count = count
+        self._names: tuple[StateName, ...] | None = None
+
+    def _decode(self) -> tuple[StateName, ...]:
+        """Decode the names once and check their count."""
+        if self._names is None:
+            names = json.loads(self._data.tobytes().rstrip(b"\0"))
+            if len(names) != self._count:
+                raise FSAError("Saved automaton's state names don't match its header")
+            self._names = tuple(names)
+        return self._names
+
+    def __len__(self) -> int:
+        """Return the number of states, without decoding the names."""
+        return self._count
+
+    @overload
+    def __getitem__(self, index: int) -> StateName: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> tuple[StateName, ...]: ...
+
+    def __getitem__(self, index: int | slice) -> StateName | tuple[StateName, ...]:
+        """Return a name, or a slice of the names."""
+        return self._decode()[index]
@@ -93,3 +93,23 @@ class MinimizationError(FSAError):
             message: A clear description of what went wrong during minimization.
         """
         super().__init__(f"FSA minimization failed: {message}")
+
+
+class RegexSyntaxError(FSAError):
+    """Raised when a regular expression can't be parsed.
+
+    This exception is used by StateMachine.from_regex() and points at the
+    position in the pattern where parsing failed.
+    """
+
+    def __init__(self, pattern: str, position: int, message: str) -> None:
+        """Initialize with the pattern and the position of the error.
+
+        Args:
+            pattern: The regular expression being parsed.
+            position: Index in the pattern where the error was found.
+            message: A clear description of what's wrong with the pattern.
+        """
+        super().__init__(f"{message} at position {position} in '{pattern}'")
+        self.pattern = pattern
+        self.position = position
@@ -0,0 +1,101 @@
+"""
+Opt-in counters and timings for StateMachine hot paths.
+
+This module provides Instrumentation, which a StateMachine fills in while
+StateMachine.instrument() has it turned on: transitions taken, how often
+each state was entered, missing-transition errors, and the wall time of
+each phase of minimize(). A machine that isn't instrumented never touches
+these counters, since runs only pick the instrumented code path once per
+call rather than checking a flag for every symbol.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import TYPE_CHECKING, Any, Iterator
+
+if TYPE_CHECKING:
+    from .automaton import StateName
+
+
+class Instrumentation:
+    """
+    Counters and phase timings collected from an instrumented StateMachine.
+
+    Runs are recorded one symbol at a time: every symbol consumed counts as
+    a transition and adds a visit to the state it leads to, or to every
+    active state for a non-deterministic run. A missing transition is
+    counted before the error propagates. State names are recorded as they
+    were at the time, so counts made before minimize() renames states stay
+    under the old names.
+
+    One Instrumentation may be shared by several machines to aggregate
+    their counts.
+    """
+
+    __slots__ = ("transitions", "missing_transitions", "visits", "phases")
+
+    def __init__(self) -> None:
+        """Start with every counter at zero."""
+        self.transitions = 0
+        self.missing_transitions = 0
+        self.visits: Counter[StateName] = Counter()
+        # Phase name -> [number of times run, total seconds]
+        self.phases: dict[str, list[float]] = {}
+
+    def reset(self) -> None:
+        """Set every counter back to zero."""
+        self.transitions = 0
+        self.missing_transitions = 0
+        self.visits.clear()
+        self.phases.clear()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Time a block of code and add it to a named phase.
+
+        The time is recorded even if the block raises.
+
+        Args:
+            name: The phase, e.g. "merge".
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            totals = self.phases.setdefault(name, [0, 0.0])
+            totals[0] += 1
+            totals[1] += elapsed
+
+    def as_dict(self) -> dict[str, Any]:
+        """
+        Export the counters as plain data, e.g. for a metrics system.
+
+        Returns:
+            A dictionary with the number of transitions taken
+            ("transitions"), missing-transition errors
+            ("missing_transitions"), visits per state name ("visits") and,
+            per phase of minimize(), the number of runs and total seconds
+            ("phases", e.g. {"merge": {"calls": 1, "seconds": 0.002}}).
+        """
+        return {
+            "transitions": self.transitions,
+            "missing_transitions": self.missing_transitions,
+            "visits": dict(self.visits),
+            "phases": {
+                name: {"calls": int(calls), "seconds": seconds}
+                for name, (calls, seconds) in self.phases.items()
+            },
+        }
+
+    def __repr__(self) -> str:
+        """Return a short summary of the counters."""
+        return (
+            f"Instrumentation(transitions={self.transitions}, "
+            f"missing_transitions={self.missing_transitions}, "
+            f"states_visited={len(self.visits)}, phases={sorted(self.phases)})"
+        )
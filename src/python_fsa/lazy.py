@@ -0,0 +1,318 @@
+"""
+Lazy, on-the-fly determinization of non-deterministic automata.
+
+This module provides LazyDFA, which runs an NFA at close to DFA speed
+without building the full subset construction. DFA states (subsets of NFA
+states) are created only when the input first reaches them, and the
+(subset, symbol) -> subset edges are memoized in a bounded cache. When the
+cache is full, states are evicted according to a configurable policy; if
+the cache thrashes, the run falls back to direct bitset NFA simulation.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from .exceptions import FSAError, InvalidTransitionError
+
+if TYPE_CHECKING:
+    from .automaton import InputSymbol, StateName
+    from .nfa import BitsetNFA
+
+POLICIES = ("flush", "lru")
+
+
+class LazyDFA:
+    """
+    An NFA runner that determinizes on demand with a bounded state cache.
+
+    Cached DFA states are numbered densely; each has a row of edges with one
+    entry per input symbol, holding the id of the successor state or -1 if
+    that edge hasn't been computed yet. Looking up a computed edge is a hit
+    and costs two list indexings; computing a missing one is a miss and
+    costs one bitset NFA step.
+
+    When the cache holds ``max_states`` states and another one is needed,
+    the eviction policy decides what to drop:
+
+    - ``"flush"``: discard the whole cache, as RE2 does.
+    - ``"lru"``: keep the most recently used half and discard the rest.
+
+    If evictions happen with fewer than ``min_progress`` input symbols per
+    cached state processed in between, the cache is thrashing, and the rest
+    of that input is run by plain NFA simulation instead.
+    """
+
+    __slots__ = (
+        "_nfa",
+        "_columns",
+        "_rows",
+        "_max_states",
+        "_policy",
+        "_min_progress",
+        "_ids",
+        "_masks",
+        "_edges",
+        "_last_used",
+        "_clock",
+        "_progress",
+        "hits",
+        "misses",
+        "evictions",
+        "fallbacks",
+    )
+
+    def __init__(
+        self,
+        nfa: BitsetNFA,
+        max_states: int = 10000,
+        policy: str = "flush",
+        min_progress: int = 10,
+    ) -> None:
+        """
+        Initialize an empty cache over a bitset NFA.
+
+        Args:
+            nfa: Successor masks of the NFA to run.
+            max_states: Maximum number of DFA states kept in the cache.
+            policy: Eviction policy, "flush" or "lru".
+            min_progress: Symbols per cached state that must be processed
+                between evictions before the cache counts as thrashing.
+
+        Raises:
+            FSAError: If the policy is unknown or max_states is less than 2.
+        """
+        if policy not in POLICIES:
+            raise FSAError(f"Unknown eviction policy '{policy}'")
+        if max_states < 2:
+            raise FSAError(f"Cache must hold at least 2 states, got {max_states}")
+
+        self._nfa = nfa
+        self._rows = list(nfa.moves.values())
+        self._columns = {symbol: i for i, symbol in enumerate(nfa.moves)}
+        self._max_states = max_states
+        self._policy = policy
+        self._min_progress = min_progress
+
+        self._ids: dict[int, int] = {}
+        self._masks: list[int] = []
+        self._edges: list[list[int]] = []
+        self._last_used: list[int] = []
+        self._clock = 0
+        self._progress = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.fallbacks = 0
+
+    @property
+    def cached_states(self) -> int:
+        """Number of DFA states currently in the cache."""
+        return len(self._masks)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Report cache counters.
+
+        Returns:
+            Hits, misses, evicted states, NFA fallbacks and the current number
+            of cached states.
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "fallbacks": self.fallbacks,
+            "cached_states": len(self._masks),
+        }
+
+    def clear(self) -> None:
+        """Empty the cache and reset all counters."""
+        self._ids.clear()
+        self._masks.clear()
+        self._edges.clear()
+        self._last_used.clear()
+        self._clock = self._progress = 0
+        self.hits = self.misses = self.evictions = self.fallbacks = 0
+
+    def run(self, inputs: Iterable[InputSymbol], start: int | None = None) -> int:
+        """
+        Run input symbols from a set of NFA states.
+
+        Args:
+            inputs: The input symbols to process.
+            start: Bitset of states to start from; defaults to the start state.
+
+        Returns:
+            The bitset of NFA states reached after consuming every symbol.
+
+        Raises:
+            InvalidTransitionError: If no state has a transition on a symbol.
+        """
+        columns = self._columns
+        edges = self._edges
+        last_used = self._last_used
+        state = self._intern(self._nfa.start_mask if start is None else start)
+
+        hits = 0
+        start_tick = tick = self._clock
+        symbols = iter(inputs)
+        for symbol in symbols:
+            column = columns.get(symbol)
+            if column is None:
+                column = self._resolve(state, symbol)
+
+            target = edges[state][column]
+            if target < 0:
+                self._clock = tick
+                evictions = self.evictions
+                target = self._miss(state, column)
+                if self.evictions != evictions:
+                    progress = self._progress + tick - start_tick
+                    start_tick = tick
+                    self._progress = 0
+                    if progress < self._min_progress * self._max_states:
+                        self.hits += hits
+                        return self._fallback(self._masks[target], symbols)
+                    # Eviction replaced the per-state lists
+                    edges = self._edges
+                    last_used = self._last_used
+            else:
+                hits += 1
+
+            tick += 1
+            last_used[target] = tick
+            state = target
+
+        self.hits += hits
+        self._clock = tick
+        self._progress += tick - start_tick
+        return self._masks[state]
+
+    def accepts(self, inputs: Iterable[InputSymbol]) -> bool:
+        """
+        Check whether the NFA accepts a sequence of input symbols.
+
+        Args:
+            inputs: The input symbols to process.
+
+        Returns:
+            True if any state reached after the input is accepting.
+
+        Raises:
+            InvalidTransitionError: If no state has a transition on a symbol.
+        """
+        return self._nfa.accepts(self.run(inputs))
+
+    def final_state(self, inputs: Iterable[InputSymbol]) -> StateName:
+        """
+        Name the set of NFA states reached on a sequence of input symbols.
+
+        Args:
+            inputs: The input symbols to process.
+
+        Returns:
+            The reached set, named the way combine_states does.
+
+        Raises:
+            InvalidTransitionError: If no state has a transition on a symbol.
+        """
+        return self._nfa.name(self.run(inputs))
+
+    def _intern(self, mask: int) -> int:
+        """Return the cache id of a subset, adding it if needed."""
+        state = self._ids.get(mask)
+        if state is None:
+            if len(self._masks) >= self._max_states:
+                self._evict(keep=())
+            state = self._add(mask)
+        return state
+
+    def _add(self, mask: int) -> int:
+        """Add a subset to the cache and return its id."""
+        state = len(self._masks)
+        self._ids[mask] = state
+        self._masks.append(mask)
+        self._edges.append([-1] * len(self._rows))
+        self._last_used.append(self._clock)
+        return state
+
+    def _resolve(self, state: int, symbol: InputSymbol) -> int:
+        """Find the column of a symbol through its string form, or raise."""
+        column = self._columns.get(str(symbol))
+        if column is None:
+            raise InvalidTransitionError(
+                self._nfa.name(self._masks[state]),
+                str(symbol),
+                "No transition defined for this input",
+            )
+        return column
+
+    def _miss(self, state: int, column: int) -> int:
+        """Compute, cache and return the successor of a state on a column."""
+        self.misses += 1
+        row = self._rows[column]
+        mask = self._masks[state]
+        target_mask = 0
+        while mask:
+            low = mask & -mask
+            target_mask |= row[low.bit_length() - 1]
+            mask ^= low
+
+        target = self._ids.get(target_mask)
+        if target is None:
+            if len(self._masks) >= self._max_states:
+                state = self._evict(keep=(state,))
+            target = self._add(target_mask)
+
+        if state >= 0:
+            self._edges[state][column] = target
+        return target
+
+    def _evict(self, keep: tuple[int, ...]) -> int:
+        """
+        Make room in a full cache according to the eviction policy.
+
+        Args:
+            keep: Ids of states that must survive, if the policy allows.
+
+        Returns:
+            The new id of the first kept state, or -1 if it was evicted.
+        """
+        if self._policy == "flush":
+            survivors: list[int] = []
+        else:
+            by_recency = sorted(
+                range(len(self._masks)), key=self._last_used.__getitem__
+            )
+            survivors = sorted(set(by_recency[len(by_recency) // 2 :]) | set(keep))
+
+        renumber = {old: new for new, old in enumerate(survivors)}
+        self.evictions += len(self._masks) - len(survivors)
+
+        masks = [self._masks[old] for old in survivors]
+        last_used = [self._last_used[old] for old in survivors]
+        edges = [
+            [renumber.get(target, -1) for target in self._edges[old]]
+            for old in survivors
+        ]
+
+        self._masks[:] = masks
+        self._last_used[:] = last_used
+        self._edges[:] = edges
+        self._ids = {mask: new for new, mask in enumerate(masks)}
+
+        return renumber.get(keep[0], -1) if keep else -1
+
+    def _fallback(self, mask: int, symbols: Iterator[InputSymbol]) -> int:
+        """Finish a thrashing run with plain bitset NFA simulation."""
+        self.fallbacks += 1
+        return self._nfa.run(mask, symbols)
+
+    def __repr__(self) -> str:
+        """Return the cache configuration and occupancy."""
+        return (
+            f"LazyDFA(cached_states={len(self._masks)}, "
+            f"max_states={self._max_states}, policy='{self._policy}')"
+        )
@@ -0,0 +1,391 @@
+"""
+Partition refinement for DFA minimization, from scratch or after an edit.
+
+refine() is the core of Hopcroft's algorithm: it splits an initial
+partition of the states until every block holds states that no input can
+tell apart. StateMachine.minimize() runs it over a whole automaton.
+
+Predecessors and reminimize() keep a DFA minimal while it is edited a few
+transitions at a time. An edit to state p can only change the language of
+states that can reach p, so only those states, plus the unaffected states
+they could now be equivalent to, are refined again. Every other state
+keeps its block of one, because the DFA was minimal before the edit.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from typing import TYPE_CHECKING, Any, Iterable
+
+if TYPE_CHECKING:
+    from .automaton import FSADefinition, StateName
+
+
+def refine(blocks: list[set[int]], inverse: list[list[list[int]]]) -> list[set[int]]:
+    """
+    Split a partition of states until equivalent states share a block.
+
+    Every initial block is used as a splitter for every symbol, and after a
+    split only the smaller half needs to be, which gives Hopcroft's
+    O(n·k·log n) bound. The initial partition may be finer than accepting
+    and rejecting states, e.g. to keep states apart that must not merge.
+
+    Args:
+        blocks: The initial partition of the states 0..n-1, changed in place.
+        inverse: For each symbol and state, the states that move to it on
+            that symbol. Every state must have exactly one move per symbol.
+
+    Returns:
+        The refined partition, starting with the initial blocks.
+    """
+    num_symbols = len(inverse)
+    block_of = [0] * sum(len(block) for block in blocks)
+    for b, block in enumerate(blocks):
+        for state in block:
+            block_of[state] = b
+
+    pending = {(b, c) for b in range(len(blocks)) for c in range(num_symbols)}
+    worklist = deque(sorted(pending))
+
+    while worklist:
+        splitter, c = worklist.popleft()
+        pending.discard((splitter, c))
+
+        # Group the predecessors of the splitter by their current block
+        touched: dict[int, list[int]] = {}
+        for target in list(blocks[splitter]):
+            for state in inverse[c][target]:
+                touched.setdefault(block_of[state], []).append(state)
+
+        for b, members in touched.items():
+            if len(members) == len(blocks[b]):
+                continue
+
+            # Split block b into the predecessors and the rest
+            new_block = set(members)
+            blocks[b] -= new_block
+            new_index = len(blocks)
+            blocks.append(new_block)
+            for state in new_block:
+                block_of[state] = new_index
+
+            for d in range(num_symbols):
+                if (b, d) in pending:
+                    entry = (new_index, d)
+                elif len(new_block) <= len(blocks[b]):
+                    entry = (new_index, d)
+                else:
+                    entry = (b, d)
+                pending.add(entry)
+                worklist.append(entry)
+
+    return blocks
+
+
+class Predecessors:
+    """
+    A reverse transition index for a DFA definition.
+
+    For each state, the states with a transition into it, grouped by
+    symbol. It is built once and then updated edge by edge, so an edit
+    doesn't have to scan the automaton to find who points where.
+    """
+
+    __slots__ = ("_edges",)
+
+    def __init__(self, fsa: FSADefinition) -> None:
+        """
+        Index every transition of a deterministic FSA definition.
+
+        Args:
+            fsa: The definition; every transition must have one target.
+        """
+        self._edges: dict[StateName, dict[Any, set[StateName]]] = {
+            name: {} for name in fsa
+        }
+        for name, state_def in fsa.items():
+            for symbol, target in _transitions(state_def):
+                self.add(name, symbol, target)
+
+    def add(self, source: StateName, symbol: Any, target: StateName) -> None:
+        """Record a transition from source to target on symbol."""
+        self._edges[target].setdefault(symbol, set()).add(source)
+
+    def remove(self, source: StateName, symbol: Any, target: StateName) -> None:
+        """Forget a transition from source to target on symbol."""
+        sources = self._edges[target][symbol]
+        sources.discard(source)
+        if not sources:
+            del self._edges[target][symbol]
+
+    def of(self, target: StateName, symbol: Any) -> set[StateName]:
+        """The states that move to target on symbol."""
+        return self._edges[target].get(symbol, set())
+
+    def incoming(self, target: StateName) -> dict[Any, set[StateName]]:
+        """The states that move to target, by symbol."""
+        return self._edges[target]
+
+    def discard(self, fsa: FSADefinition, states: set[StateName]) -> None:
+        """
+        Forget states that are being removed from the definition.
+
+        Their outgoing transitions are removed from the index. Transitions
+        into them must come from each other, or have been redirected.
+        """
+        for state in states:
+            for symbol, target in _transitions(fsa[state]):
+                if target not in states:
+                    self.remove(state, symbol, target)
+        for state in states:
+            del self._edges[state]
+
+    def ancestors(self, states: Iterable[StateName]) -> set[StateName]:
+        """Every state with a path to one of the given states, and those states."""
+        found = set(states)
+        queue = deque(found)
+        while queue:
+            for sources in self._edges[queue.popleft()].values():
+                for source in sources:
+                    if source not in found:
+                        found.add(source)
+                        queue.append(source)
+        return found
+
+    def reaches(self, start: StateName, state: StateName) -> bool:
+        """Whether start has a path to state, searching backwards from state."""
+        if state == start:
+            return True
+        seen = {state}
+        queue = deque(seen)
+        while queue:
+            for sources in self._edges[queue.popleft()].values():
+                for source in sources:
+                    if source == start:
+                        return True
+                    if source not in seen:
+                        seen.add(source)
+                        queue.append(source)
+        return False
+
+
+def remove_unreachable(
+    fsa: FSADefinition, start: StateName, predecessors: Predecessors
+) -> set[StateName]:
+    """
+    Delete the states that start has no path to.
+
+    Args:
+        fsa: The definition, changed in place.
+        start: The start state.
+        predecessors: The reverse index of fsa, kept up to date.
+
+    Returns:
+        The names of the deleted states.
+    """
+    reachable = {start}
+    queue = deque(reachable)
+    while queue:
+        for _, target in _transitions(fsa[queue.popleft()]):
+            if target not in reachable:
+                reachable.add(target)
+                queue.append(target)
+
+    unreachable = set(fsa) - reachable
+    predecessors.discard(fsa, unreachable)
+    for state in unreachable:
+        del fsa[state]
+    return unreachable
+
+
+def reminimize(
+    fsa: FSADefinition,
+    start: StateName,
+    predecessors: Predecessors,
+    edited: StateName,
+) -> dict[StateName, StateName]:
+    """
+    Restore minimality after an edit to one state of a minimal DFA.
+
+    The affected states are those with a path to the edited one. Each of
+    them can only become equivalent to other affected states or to
+    unaffected states that have the same transitions out of the affected
+    region, which are found through the reverse index. Those states are
+    refined with refine(), while the targets outside them are kept as fixed
+    blocks of one. When an affected state's transitions all stay inside the
+    affected region, every unaffected state with the same acceptance and
+    symbols is a candidate, which costs a scan of the automaton.
+
+    Equivalent states are merged into the start state if it is among them,
+    otherwise into an unaffected state if there is one, so as few
+    transitions as possible are redirected.
+
+    Args:
+        fsa: The definition, minimal apart from the edit; changed in place.
+        start: The start state.
+        predecessors: The reverse index of fsa, kept up to date.
+        edited: The state whose transitions or acceptance changed.
+
+    Returns:
+        Each merged state mapped to the state that replaced it.
+    """
+    affected = predecessors.ancestors([edited])
+
+    region: dict[StateName, int] = {name: i for i, name in enumerate(affected)}
+    for candidate in _candidates(fsa, affected, predecessors):
+        region.setdefault(candidate, len(region))
+
+    # Symbols, and the states outside the region that are moved to
+    names = list(region)
+    symbols: dict[Any, int] = {}
+    outside: dict[StateName, int] = {}
+    edges: list[tuple[int, int, int]] = []
+    for i, name in enumerate(names):
+        for symbol, target in _transitions(fsa[name]):
+            c = symbols.setdefault(symbol, len(symbols))
+            t = region.get(target)
+            if t is None:
+                t = outside.setdefault(target, len(names) + len(outside))
+            edges.append((i, c, t))
+
+    # Missing transitions lead to a dead state, as in a full minimization
+    dead = len(names) + len(outside)
+    inverse: list[list[list[int]]] = [[[] for _ in range(dead + 1)] for _ in symbols]
+    moved: list[set[int]] = [set() for _ in names]
+    for i, c, t in edges:
+        inverse[c][t].append(i)
+        moved[i].add(c)
+    for c in range(len(symbols)):
+        for i in range(len(names)):
+            if c not in moved[i]:
+                inverse[c][dead].append(i)
+        for t in range(len(names), dead + 1):
+            inverse[c][dead].append(t)
+
+    accepting = {i for i, name in enumerate(names) if fsa[name].get("accept", False)}
+    rejecting = set(range(len(names))) - accepting
+    blocks = [block for block in (accepting, rejecting) if block]
+    blocks.extend({t} for t in range(len(names), dead + 1))
+
+    merged: dict[StateName, StateName] = {}
+    for block in refine(blocks, inverse):
+        members = [names[i] for i in sorted(block) if i < len(names)]
+        if len(members) < 2:
+            continue
+        if start in members:
+            keep = start
+        else:
+            unaffected = [name for name in members if name not in affected]
+            keep = unaffected[0] if unaffected else members[0]
+        for name in members:
+            if name != keep:
+                merged[name] = keep
+
+    for name, keep in merged.items():
+        _redirect(fsa, predecessors, name, keep)
+    predecessors.discard(fsa, set(merged))
+    for name in merged:
+        del fsa[name]
+    return merged
+
+
+def _candidates(
+    fsa: FSADefinition, affected: set[StateName], predecessors: Predecessors
+) -> set[StateName]:
+    """
+    Find the unaffected states that some affected state could equal.
+
+    An unaffected state q can only equal an affected state a if both accept
+    alike, have transitions on the same symbols, and each move of q leads to
+    the same state as a's move if that is unaffected, or to a candidate for
+    a's target if that is affected. So candidates are found backwards from
+    the targets: first for affected states with a move out of the affected
+    region, then for those whose move leads to a state already handled.
+    Affected states left over sit on cycles of affected states, and are
+    matched against every unaffected state.
+    """
+    found: dict[StateName, set[StateName]] = {}
+    moves = {state: dict(_transitions(fsa[state])) for state in affected}
+
+    def matching(state: StateName, sources: Iterable[StateName]) -> set[StateName]:
+        """Keep the sources that could equal an affected state."""
+        accept = bool(fsa[state].get("accept", False))
+        result = set()
+        for name in sources:
+            if name in affected:
+                continue
+            other = fsa[name]
+            if bool(other.get("accept", False)) != accept:
+                continue
+            other_moves = dict(_transitions(other))
+            if other_moves.keys() != moves[state].keys():
+                continue
+            if all(
+                (
+                    other_moves[symbol] == target
+                    if target not in affected
+                    else target not in found or other_moves[symbol] in found[target]
+                )
+                for symbol, target in moves[state].items()
+            ):
+                result.add(name)
+        return result
+
+    # An equivalent unaffected state has the very same exits from the region
+    pending = []
+    for state in affected:
+        exits = [(s, t) for s, t in moves[state].items() if t not in affected]
+        if exits:
+            symbol, target = min(exits, key=lambda e: len(predecessors.of(e[1], e[0])))
+            found[state] = matching(state, predecessors.of(target, symbol))
+        else:
+            pending.append(state)
+
+    # Otherwise its moves lead to candidates of the affected targets
+    progress = True
+    while pending and progress:
+        progress = False
+        waiting = []
+        for state in pending:
+            known = [(s, t) for s, t in moves[state].items() if t in found]
+            if not known:
+                waiting.append(state)
+                continue
+            symbol, target = min(known, key=lambda k: len(found[k[1]]))
+            sources = (
+                source
+                for candidate in found[target]
+                for source in predecessors.of(candidate, symbol)
+            )
+            found[state] = matching(state, sources)
+            progress = True
+        pending = waiting
+
+    if pending:
+        unaffected = [name for name in fsa if name not in affected]
+        for state in pending:
+            found[state] = matching(state, unaffected)
+
+    return set().union(*found.values())
+
+
+def _redirect(
+    fsa: FSADefinition, predecessors: Predecessors, old: StateName, new: StateName
+) -> None:
+    """Point every transition into old at new instead."""
+    for symbol, sources in list(predecessors.incoming(old).items()):
+        for source in list(sources):
+            if source == old:
+                continue
+            state_def = fsa[source]
+            state_def[symbol] = [new] if isinstance(state_def[symbol], list) else new
+            predecessors.remove(source, symbol, old)
+            predecessors.add(source, symbol, new)
+
+
+def _transitions(state_def: dict[str, Any]) -> Iterable[tuple[Any, StateName]]:
+    """The (symbol, target) pairs of a deterministic state definition."""
+    for symbol, target in state_def.items():
+        if symbol in ("start", "accept"):
+            continue
+        yield symbol, target[0] if isinstance(target, list) else target
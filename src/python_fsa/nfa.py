@@ -0,0 +1,341 @@
+"""
+Bitset tables for simulating non-deterministic automata.
+
+This module provides BitsetNFA, which numbers the states of an FSA
+definition and encodes every set of states as a Python int with bit i set
+for state i. Successor sets for each (state, symbol) pair are precomputed,
+so advancing the active set by one symbol is a series of OR operations.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Iterable
+
+from .compiled import BUFFER_TYPES, EPSILON, BinaryInput, byte_symbols
+from .exceptions import InvalidTransitionError
+
+if TYPE_CHECKING:
+    from .automaton import FSADefinition, InputSymbol, StateName
+
+
+class BitsetNFA:
+    """
+    Precomputed successor masks for a (possibly non-deterministic) FSA.
+
+    ``moves[symbol][i]`` is the bitset of states reachable from state i on
+    ``symbol``. Symbol lookup mirrors StateMachine.__call__: a symbol that is
+    not a key of a state is retried as ``str(symbol)``.
+
+    Epsilon moves are folded in when the tables are built: the start mask
+    and every successor mask are replaced by their epsilon-closures, so
+    runs never look at epsilon moves. ``closures[i]`` is the closure of
+    state i, or None if the FSA has no epsilon moves.
+    """
+
+    __slots__ = (
+        "states",
+        "index",
+        "moves",
+        "start_mask",
+        "accept_mask",
+        "closures",
+        "_bytes",
+    )
+
+    def __init__(self, fsa: FSADefinition) -> None:
+        """
+        Build the successor masks for an FSA definition.
+
+        Args:
+            fsa: A validated FSA definition with exactly one start state.
+        """
+        self.states: list[StateName] = list(fsa)
+        self.index: dict[StateName, int] = {
+            name: i for i, name in enumerate(self.states)
+        }
+        self.moves: dict[Any, list[int]] = {}
+        self.start_mask = 0
+        self.accept_mask = 0
+        self.closures: list[int] | None = None
+        self._bytes: list[Any] | None = None
+
+        num_states = len(self.states)
+        for i, state_def in enumerate(fsa.values()):
+            bit = 1 << i
+            if state_def.get("start", False):
+                self.start_mask |= bit
+            if state_def.get("accept", False):
+                self.accept_mask |= bit
+
+            for key, target in state_def.items():
+                if key in ("start", "accept"):
+                    continue
+
+                row = self.moves.get(key)
+                if row is None:
+                    row = self.moves[key] = [0] * num_states
+
+                targets = target if isinstance(target, list) else [target]
+                row[i] = self.mask(targets)
+
+        # Non-string keys fall back to their string form, as in __call__
+        for key, row in self.moves.items():
+            fallback = self.moves.get(str(key))
+            if isinstance(key, str) or fallback is None:
+                continue
+            for i, successors in enumerate(row):
+                if not successors and key not in fsa[self.states[i]]:
+                    row[i] = fallback[i]
+
+        epsilon = self.moves.pop(EPSILON, None)
+        if epsilon is not None:
+            self.closures = _closures(epsilon)
+            self.start_mask = self.closure(self.start_mask)
+            for row in self.moves.values():
+                row[:] = map(self.closure, row)
+
+    def closure(self, mask: int) -> int:
+        """
+        Add every state reachable by epsilon moves to a set of states.
+
+        Args:
+            mask: The bitset of states.
+
+        Returns:
+            The bitset of the states and everything their epsilon moves reach.
+        """
+        closures = self.closures
+        if closures is None:
+            return mask
+        result = 0
+        while mask:
+            low = mask & -mask
+            result |= closures[low.bit_length() - 1]
+            mask ^= low
+        return result
+
+    def mask(self, names: Iterable[StateName]) -> int:
+        """
+        Encode a collection of state names as a bitset.
+
+        Args:
+            names: The state names.
+
+        Returns:
+            An int with the bit of every named state set.
+        """
+        result = 0
+        for name in names:
+            result |= 1 << self.index[name]
+        return result
+
+    def names(self, mask: int) -> list[StateName]:
+        """
+        Decode a bitset into state names, in definition order.
+
+        Args:
+            mask: The bitset of states.
+
+        Returns:
+            The names of the states in the set.
+        """
+        result = []
+        while mask:
+            low = mask & -mask
+            result.append(self.states[low.bit_length() - 1])
+            mask ^= low
+        return result
+
+    def name(self, mask: int) -> StateName:
+        """
+        Name a set of states the way combine_states does.
+
+        Args:
+            mask: The bitset of states.
+
+        Returns:
+            The single state's name, or the sorted names joined as "{S0,S1}".
+        """
+        names = self.names(mask)
+        if len(names) == 1:
+            return names[0]
+        return "{" + ",".join(sorted(names)) + "}"
+
+    def accepts(self, mask: int) -> bool:
+        """
+        Check whether a set of states contains an accepting state.
+
+        Args:
+            mask: The bitset of states.
+
+        Returns:
+            True if any state in the set is accepting.
+        """
+        return bool(mask & self.accept_mask)
+
+    def row(self, mask: int, symbol: InputSymbol) -> list[int]:
+        """
+        Look up the successor masks of every state for a symbol.
+
+        Args:
+            mask: The current set of states, used for error reporting.
+            symbol: The input symbol.
+
+        Returns:
+            The per-state successor masks for the symbol.
+
+        Raises:
+            InvalidTransitionError: If no state has a transition on the symbol.
+        """
+        row = self.moves.get(symbol)
+        if row is None:
+            row = self.moves.get(str(symbol))
+            if row is None:
+                raise InvalidTransitionError(
+                    self.name(mask), str(symbol), "No transition defined for this input"
+                )
+        return row
+
+    def step(self, mask: int, symbol: InputSymbol) -> int:
+        """
+        Advance a set of states by one input symbol.
+
+        Args:
+            mask: The current set of states.
+            symbol: The input symbol.
+
+        Returns:
+            The set of states reachable from any state in mask on symbol.
+
+        Raises:
+            InvalidTransitionError: If no state has a transition on the symbol.
+        """
+        row = self.row(mask, symbol)
+        result = 0
+        while mask:
+            low = mask & -mask
+            result |= row[low.bit_length() - 1]
+            mask ^= low
+        return result
+
+    def run(self, mask: int, inputs: Iterable[InputSymbol] | BinaryInput) -> int:
+        """
+        Advance a set of states through a sequence of input symbols.
+
+        States without a transition on a symbol drop out of the set; once the
+        set is empty, no input can be accepted. Binary buffers are read a
+        byte at a time, each byte standing for the symbol that byte_symbols()
+        assigns it.
+
+        Args:
+            mask: The set of states to start from.
+            inputs: The input symbols to process, or a binary buffer.
+
+        Returns:
+            The set of states reached after consuming every input symbol.
+
+        Raises:
+            InvalidTransitionError: If no state has a transition on a symbol.
+        """
+        if isinstance(inputs, BUFFER_TYPES):
+            if self._bytes is None:
+                self._bytes = byte_symbols(self.moves)
+            with memoryview(inputs) as view, view.cast("B") as flat:
+                return self.run(mask, map(self._bytes.__getitem__, flat))
+
+        moves = self.moves
+        for symbol in inputs:
+            row = moves.get(symbol)
+            if row is None:
+                row = self.row(mask, symbol)
+
+            result = 0
+            while mask:
+                low = mask & -mask
+                result |= row[low.bit_length() - 1]
+                mask ^= low
+            mask = result
+
+        return mask
+
+
+def _closures(epsilon: list[int]) -> list[int]:
+    """
+    Compute the epsilon-closure of every state at once.
+
+    The epsilon graph is condensed into strongly connected components with
+    Tarjan's algorithm. States in one component share a closure, and the
+    components come out in reverse topological order, so each closure is
+    the component's own states plus the already computed closures of the
+    components it has moves into. Every state and move is visited once.
+
+    Args:
+        epsilon: The bitset of epsilon targets of each state.
+
+    Returns:
+        The bitset closure of each state, including the state itself.
+    """
+    num_states = len(epsilon)
+    closures = [0] * num_states
+    order = [-1] * num_states
+    low = [0] * num_states
+    on_stack = [False] * num_states
+    stack: list[int] = []
+    counter = 0
+
+    for root in range(num_states):
+        if order[root] >= 0:
+            continue
+
+        # Iterative DFS; each frame is a state and its unvisited targets
+        work = [(root, epsilon[root])]
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = True
+
+        while work:
+            state, pending = work[-1]
+            if pending:
+                bit = pending & -pending
+                work[-1] = (state, pending ^ bit)
+                target = bit.bit_length() - 1
+                if order[target] < 0:
+                    order[target] = low[target] = counter
+                    counter += 1
+                    stack.append(target)
+                    on_stack[target] = True
+                    work.append((target, epsilon[target]))
+                elif on_stack[target]:
+                    low[state] = min(low[state], order[target])
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[state])
+            if low[state] != order[state]:
+                continue
+
+            # state is the root of a component; pop and close it
+            members = []
+            while True:
+                member = stack.pop()
+                on_stack[member] = False
+                members.append(member)
+                if member == state:
+                    break
+
+            closure = 0
+            for member in members:
+                closure |= 1 << member
+            for member in members:
+                targets = epsilon[member] & ~closure
+                while targets:
+                    bit = targets & -targets
+                    closure |= closures[bit.bit_length() - 1]
+                    targets ^= bit
+            for member in members:
+                closures[member] = closure
+
+    return closures
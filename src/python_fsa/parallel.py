@@ -0,0 +1,263 @@
+"""
+Parallel runs of one large input across a process pool.
+
+This module provides run_parallel(), which splits a binary input into
+chunks and hands them to worker processes. A worker can't know which state
+its chunk starts in, so it runs the chunk from every candidate state and
+returns the resulting state -> state mapping; the mappings are then
+composed left to right to get the exact final state.
+
+Running from every state is cheap when lanes converge: two lanes that
+reach the same state are merged, and most DFAs forget their past after a
+few symbols. The candidates are also narrowed before the chunk starts by
+running every state over the last few bytes of the previous chunk, since
+the true entry state must be one of the states they can end in.
+Automata whose symbols permute the states (like divisibility checkers with
+a divisor coprime to the base) never converge and gain nothing from this.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .compiled import BinaryInput
+
+if TYPE_CHECKING:
+    from .compiled import CompiledAutomaton
+
+# Smallest chunk worth sending to another process
+MIN_CHUNK_SIZE = 1 << 20
+
+# Symbols without a merge after which lanes are run separately
+MERGE_WINDOW = 64
+
+# A chunk to run: the input (bytes, or a file path with its byte range), the
+# offset of the chunk itself within it, and whether its entry state is known
+_Task = Tuple[Union[bytes, Tuple[str, int, int]], int, Optional[int]]
+
+# Byte-class table and per-state rows of the automaton, set in each worker
+_tables: tuple[bytes, list[list[int]]] | None = None
+
+
+def run_parallel(
+    compiled: CompiledAutomaton,
+    data: BinaryInput | str | os.PathLike[str],
+    workers: int | None = None,
+    chunk_size: int | None = None,
+    lookback: int = 256,
+) -> int:
+    """
+    Run a large binary input through a compiled DFA on several processes.
+
+    Args:
+        compiled: The automaton to run.
+        data: A binary buffer, or the path of a file to memory-map. Paths
+            are opened by each worker, so the file is never copied between
+            processes.
+        workers: Number of worker processes; defaults to the CPU count.
+        chunk_size: Bytes per chunk; defaults to splitting the input into
+            four chunks per worker, but no smaller than MIN_CHUNK_SIZE.
+        lookback: Bytes of the previous chunk used to narrow down the
+            states a chunk can start in.
+
+    Returns:
+        The id of the state reached after consuming every byte.
+
+    Raises:
+        InvalidTransitionError: If a transition is not defined for a byte.
+    """
+    workers = workers or os.cpu_count() or 1
+    path: str | None = None
+    if isinstance(data, (str, os.PathLike)):
+        path = os.fspath(data)
+        size = os.path.getsize(path)
+    else:
+        with memoryview(data) as view:
+            size = view.nbytes
+
+    if chunk_size is None:
+        chunk_size = max(MIN_CHUNK_SIZE, -(-size // (workers * 4)))
+    if workers == 1 or size <= chunk_size:
+        return _run_sequential(compiled, data, path)
+
+    classes, rows, _ = compiled._byte_tables()
+    bounds = [
+        (start, min(start + chunk_size, size)) for start in range(0, size, chunk_size)
+    ]
+
+    mappings: list[dict[int, int]] = []
+    with ProcessPoolExecutor(
+        workers, initializer=_init_worker, initargs=(classes, rows)
+    ) as pool:
+        pending: deque[Future[dict[int, int]]] = deque()
+        for task in _tasks(data, path, bounds, lookback, compiled.start):
+            # Keep a bounded number of chunks in flight to bound memory use
+            if len(pending) >= 2 * workers:
+                mappings.append(pending.popleft().result())
+            pending.append(pool.submit(_run_chunk, task))
+        mappings.extend(future.result() for future in pending)
+
+    state = compiled.start
+    for (start, end), mapping in zip(bounds, mappings):
+        entry = state
+        state = mapping[state]
+        if state == compiled.dead:
+            # Rerun the failing chunk to report the exact symbol
+            with _byte_view(data, path) as view:
+                chunk = view[start:end].tobytes()
+            compiled.run(chunk, start=entry)
+    return state
+
+
+def _tasks(
+    data: Any,
+    path: str | None,
+    bounds: list[tuple[int, int]],
+    lookback: int,
+    start_state: int,
+) -> Iterator[_Task]:
+    """Yield one task per chunk, copying chunk bytes only for buffer input."""
+    with _byte_view(data, path) as view:
+        for i, (start, end) in enumerate(bounds):
+            entry = start_state if i == 0 else None
+            begin = max(0, start - lookback) if i else start
+            if path is not None:
+                yield (path, begin, end), start - begin, entry
+            else:
+                yield view[begin:end].tobytes(), start - begin, entry
+
+
+@contextmanager
+def _byte_view(data: Any, path: str | None) -> Iterator[memoryview]:
+    """
+    Give a flat byte view of a buffer, or of a memory-mapped file.
+
+    Args:
+        data: The buffer, if path is None.
+        path: The path of a file to map instead.
+
+    Yields:
+        A memoryview of unsigned bytes, released on exit.
+    """
+    if path is None:
+        with memoryview(data) as view, view.cast("B") as flat:
+            yield flat
+        return
+
+    with open(path, "rb") as f:
+        # Empty files can't be memory-mapped
+        if os.fstat(f.fileno()).st_size == 0:
+            yield memoryview(b"")
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as flat:
+                yield flat
+
+
+def _run_sequential(compiled: CompiledAutomaton, data: Any, path: str | None) -> int:
+    """Run the whole input in this process."""
+    if path is None:
+        return compiled.run(data)
+    with _byte_view(data, path) as view:
+        return compiled.run(view)
+
+
+def _init_worker(classes: bytes, rows: list[list[int]]) -> None:
+    """Receive the automaton's tables once per worker process."""
+    global _tables
+    _tables = (classes, rows)
+
+
+def _run_chunk(task: _Task) -> dict[int, int]:
+    """
+    Map every state a chunk may start in to the state it ends in.
+
+    Args:
+        task: The chunk's source, the offset of the chunk after its lookback
+            bytes, and its entry state if known.
+
+    Returns:
+        The final state for each candidate entry state.
+    """
+    assert _tables is not None
+    classes, rows = _tables
+    source, split, entry = task
+
+    if isinstance(source, bytes):
+        codes = source.translate(classes)
+    else:
+        path, begin, end = source
+        with _byte_view(None, path) as view:
+            codes = view[begin:end].tobytes().translate(classes)
+
+    # The dead state is left out: a chunk entered in it has already failed
+    dead = len(rows) - 1
+    if entry is not None:
+        candidates = [entry]
+    else:
+        # Only states reachable over the lookback bytes can start the chunk
+        reachable = _run_lanes(rows, codes[:split], range(dead))
+        candidates = sorted(set(reachable.values()) - {dead})
+    return _run_lanes(rows, codes[split:], candidates)
+
+
+def _run_lanes(
+    rows: list[list[int]], codes: bytes, origins: Iterable[int]
+) -> dict[int, int]:
+    """
+    Run several start states over the same codes, merging lanes that meet.
+
+    Lanes are advanced in lockstep while they keep merging. Once they stop,
+    for MERGE_WINDOW symbols in a row, the remaining lanes are finished one
+    at a time, which is cheaper per symbol than stepping them together.
+
+    Args:
+        rows: Per-state targets, indexed by byte class.
+        codes: The byte classes to run.
+        origins: The distinct start states.
+
+    Returns:
+        The final state reached from each start state.
+    """
+    lanes = list(origins)
+    groups: list[list[int]] = [[origin] for origin in lanes]
+
+    position = since_merge = 0
+    while len(lanes) > 1 and since_merge < MERGE_WINDOW and position < len(codes):
+        code = codes[position]
+        position += 1
+
+        targets = [rows[state][code] for state in lanes]
+        if len(set(targets)) == len(targets):
+            lanes = targets
+            since_merge += 1
+            continue
+
+        merged: dict[int, list[int]] = {}
+        for target, group in zip(targets, groups):
+            merged.setdefault(target, []).extend(group)
+        lanes = list(merged)
+        groups = list(merged.values())
+        since_merge = 0
+
+    rest = codes[position:]
+    finals = []
+    for state in lanes:
+        for code in rest:
+            state = rows[state][code]
+        finals.append(state)
+
+    return {origin: final for final, group in zip(finals, groups) for origin in group}
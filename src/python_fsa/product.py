@@ -0,0 +1,257 @@
+"""
+Boolean operations on automata by the product construction.
+
+This module builds the product of two compiled DFAs: a DFA whose states are
+pairs (p, q) of states of the operands, run in lockstep, and which accepts
+depending on whether p and q do. Only pairs reachable from the pair of
+start states are explored, so combining many automata costs in proportion
+to the pairs that actually occur rather than to |A|×|B|.
+
+The same pairs are searched to compare languages: distinguish() checks two
+DFAs for equivalence with Hopcroft and Karp's union-find algorithm, and
+include_counterexample() checks inclusion. Both return a shortest input
+that shows the difference.
+"""
+
+from __future__ import annotations
+
+import operator
+from typing import TYPE_CHECKING, Any, Callable
+
+from .exceptions import FSAError
+
+if TYPE_CHECKING:
+    from .automaton import FSADefinition, InputSymbol, StateDefinition
+    from .compiled import CompiledAutomaton
+
+# How each operation accepts, given whether each operand accepts
+ACCEPT: dict[str, Callable[[bool, bool], bool]] = {
+    "intersection": operator.and_,
+    "union": operator.or_,
+    "difference": lambda left, right: left and not right,
+    "symmetric_difference": operator.xor,
+}
+
+# Pairs that can never accept again under each operation, given which
+# operands are in their dead state; transitions into them are left out
+_HOPELESS: dict[str, Callable[[bool, bool], bool]] = {
+    "intersection": operator.or_,
+    "union": operator.and_,
+    "difference": lambda left, right: left,
+    "symmetric_difference": operator.and_,
+}
+
+
+def product(
+    left: CompiledAutomaton, right: CompiledAutomaton, operation: str
+) -> tuple[FSADefinition, int]:
+    """
+    Build the product of two DFAs under a boolean operation.
+
+    The product's alphabet is the union of both alphabets. A symbol that an
+    operand has no transition for sends that operand to its dead state, as
+    a run through it would fail. Pairs from which no input can be accepted
+    any more are dropped, so the result keeps the partial-transition style
+    of the operands instead of gaining an explicit sink.
+
+    Symbols that fall into the same class in both operands behave the same
+    in every pair, so each distinct pair of classes is only followed once.
+
+    Args:
+        left: The first operand.
+        right: The second operand.
+        operation: One of the keys of ACCEPT.
+
+    Returns:
+        The product's definition, with states named S0, S1... in the order
+        they were reached, and the number of pairs explored.
+
+    Raises:
+        FSAError: If the operation is unknown.
+    """
+    if operation not in ACCEPT:
+        raise FSAError(f"Unknown product operation '{operation}'")
+    accepts = ACCEPT[operation]
+    hopeless = _HOPELESS[operation]
+
+    groups = _symbol_groups(left, right)
+    left_step, right_step = _stepper(left), _stepper(right)
+    left_dead, right_dead = left.dead, right.dead
+
+    pairs = [(left.start, right.start)]
+    index = {(left.start, right.start): 0}
+    fsa: FSADefinition = {}
+
+    for i, (p, q) in enumerate(pairs):
+        state_def: StateDefinition = {}
+        for (left_column, right_column), symbols in groups.items():
+            p2 = left_step(p, left_column)
+            q2 = right_step(q, right_column)
+            if hopeless(p2 == left_dead, q2 == right_dead):
+                continue
+
+            target = index.get((p2, q2))
+            if target is None:
+                target = index[p2, q2] = len(pairs)
+                pairs.append((p2, q2))
+            name = f"S{target}"
+            for symbol in symbols:
+                state_def[symbol] = name
+
+        state_def["start"] = i == 0
+        state_def["accept"] = accepts(left.is_accepting(p), right.is_accepting(q))
+        fsa[f"S{i}"] = state_def
+
+    return fsa, len(pairs)
+
+
+def distinguish(
+    left: CompiledAutomaton, right: CompiledAutomaton
+) -> list[InputSymbol] | None:
+    """
+    Find a shortest input accepted by exactly one of two DFAs.
+
+    This is Hopcroft and Karp's algorithm: pairs of states are explored
+    breadth-first from the pair of start states and merged in a union-find
+    structure over the states of both automata. A pair whose states are
+    already in the same class is skipped, which keeps the work close to
+    linear in the number of states. Breadth-first order means the first
+    pair found with one accepting and one rejecting state is reached by a
+    shortest distinguishing input.
+
+    Args:
+        left: The first automaton.
+        right: The second automaton.
+
+    Returns:
+        The input symbols of a shortest distinguishing input, or None if
+        both automata accept the same inputs.
+    """
+    groups = _symbol_groups(left, right)
+    left_step, right_step = _stepper(left), _stepper(right)
+    offset = left.dead + 1
+
+    # Union-find over the states of both automata, right ones shifted by offset
+    parent = list(range(offset + right.dead + 1))
+
+    def find(state: int) -> int:
+        while parent[state] != state:
+            parent[state] = parent[parent[state]]
+            state = parent[state]
+        return state
+
+    start = (left.start, right.start)
+    if left.is_accepting(start[0]) != right.is_accepting(start[1]):
+        return []
+    parent[offset + right.start] = left.start
+
+    # Each pair explored, with the index of the pair and the symbol it came from
+    pairs = [start]
+    trail: list[tuple[int, Any]] = [(-1, None)]
+    for i, (p, q) in enumerate(pairs):
+        for (left_column, right_column), symbols in groups.items():
+            p2 = left_step(p, left_column)
+            q2 = right_step(q, right_column)
+            root_p, root_q = find(p2), find(offset + q2)
+            if root_p == root_q:
+                continue
+
+            parent[root_q] = root_p
+            pairs.append((p2, q2))
+            trail.append((i, symbols[0]))
+            if left.is_accepting(p2) != right.is_accepting(q2):
+                return _replay(trail)
+
+    return None
+
+
+def include_counterexample(
+    left: CompiledAutomaton, right: CompiledAutomaton
+) -> list[InputSymbol] | None:
+    """
+    Find a shortest input the first DFA accepts and the second doesn't.
+
+    Inclusion isn't symmetric, so states can't be merged as in distinguish();
+    this is a breadth-first search of the reachable pairs of the product,
+    skipping pairs where the first automaton is dead.
+
+    Args:
+        left: The automaton that should be included.
+        right: The automaton that should include it.
+
+    Returns:
+        The input symbols of a shortest counterexample, or None if every
+        input the first automaton accepts is accepted by the second.
+    """
+    groups = _symbol_groups(left, right)
+    left_step, right_step = _stepper(left), _stepper(right)
+
+    start = (left.start, right.start)
+    if left.is_accepting(start[0]) and not right.is_accepting(start[1]):
+        return []
+
+    pairs = [start]
+    seen = {start}
+    trail: list[tuple[int, Any]] = [(-1, None)]
+    for i, (p, q) in enumerate(pairs):
+        for (left_column, right_column), symbols in groups.items():
+            pair = (left_step(p, left_column), right_step(q, right_column))
+            if pair in seen or pair[0] == left.dead:
+                continue
+
+            seen.add(pair)
+            pairs.append(pair)
+            trail.append((i, symbols[0]))
+            if left.is_accepting(pair[0]) and not right.is_accepting(pair[1]):
+                return _replay(trail)
+
+    return None
+
+
+def _symbol_groups(
+    left: CompiledAutomaton, right: CompiledAutomaton
+) -> dict[tuple[int, int], list[Any]]:
+    """
+    Group the symbols of both automata by the pair of columns they use.
+
+    Args:
+        left: The first automaton.
+        right: The second automaton.
+
+    Returns:
+        The symbols for each pair of columns, in first-seen order. A column
+        of -1 means the symbol has no transitions in that automaton.
+    """
+    groups: dict[tuple[int, int], list[Any]] = {}
+    for symbol in dict.fromkeys(left.symbols + right.symbols):
+        columns = (_column(left, symbol), _column(right, symbol))
+        groups.setdefault(columns, []).append(symbol)
+    return groups
+
+
+def _column(compiled: CompiledAutomaton, symbol: Any) -> int:
+    """Table column of a symbol in an operand, or -1 if it has none."""
+    column = compiled.column(symbol)
+    return -1 if column is None else column
+
+
+def _stepper(compiled: CompiledAutomaton) -> Callable[[int, int], int]:
+    """Return a function following one transition, where column -1 is dead."""
+    table = compiled.transitions
+    width = compiled.num_classes
+    dead = compiled.dead
+
+    def step(state: int, column: int) -> int:
+        return dead if column < 0 else table[state * width + column]
+
+    return step
+
+
+def _replay(trail: list[tuple[int, Any]]) -> list[InputSymbol]:
+    """Follow the trail back from its last pair to the start pair."""
+    symbols = []
+    i = len(trail) - 1
+    while i > 0:
+        i, symbol = trail[i]
+        symbols.append(symbol)
+    return symbols[::-1]
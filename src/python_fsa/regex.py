@@ -0,0 +1,300 @@
+"""
+Regular expressions compiled to automata.
+
+This module parses a practical subset of regular expression syntax and
+builds a Thompson NFA for it: one small fragment per character, joined by
+epsilon moves for concatenation, alternation and repetition. Most of its
+states exist only to join fragments and are left by epsilon moves alone,
+so the moves are removed by closure before the NFA is returned, keeping
+only the start state and states entered on a character. That leaves about
+a third of the states for StateMachine.from_regex() to determinize and
+minimize.
+
+Supported syntax:
+
+- literal characters, and ``\\`` to escape any special character
+- ``.`` for any character of the alphabet
+- character classes ``[abc]``, ranges ``[a-z]`` and negation ``[^0-9]``
+- the escapes ``\\d``, ``\\w``, ``\\s``, ``\\n``, ``\\t`` and ``\\r``
+- grouping ``(...)``, alternation ``|`` and the repetitions ``*``, ``+``
+  and ``?``
+
+A pattern must match the whole input; there are no anchors.
+"""
+
+from __future__ import annotations
+
+import string
+from typing import TYPE_CHECKING, NoReturn, Tuple
+
+from .exceptions import RegexSyntaxError
+
+if TYPE_CHECKING:
+    from .automaton import FSADefinition, StateDefinition
+
+# Characters that ``.`` and negated classes range over by default
+DEFAULT_ALPHABET = string.printable
+
+_ESCAPES = {
+    "d": string.digits,
+    "w": string.ascii_letters + string.digits + "_",
+    "s": " \t\n\r\f\v",
+    "n": "\n",
+    "t": "\t",
+    "r": "\r",
+}
+
+# Start and end state of a piece of the NFA
+_Fragment = Tuple[int, int]
+
+
+class _ThompsonBuilder:
+    """
+    Recursive-descent parser that builds a Thompson NFA as it goes.
+
+    States are integers; ``epsilon[s]`` lists the epsilon moves out of s and
+    ``edges[s]`` its character moves, each a set of characters and a target.
+    Every fragment has a single start and end state.
+    """
+
+    def __init__(self, pattern: str, alphabet: str) -> None:
+        """
+        Prepare to parse a pattern.
+
+        Args:
+            pattern: The regular expression.
+            alphabet: The characters ``.`` and negated classes range over.
+        """
+        self.pattern = pattern
+        self.alphabet = frozenset(alphabet)
+        self.position = 0
+        self.epsilon: list[list[int]] = []
+        self.edges: list[list[tuple[frozenset[str], int]]] = []
+
+    def parse(self) -> _Fragment:
+        """
+        Parse the whole pattern.
+
+        Returns:
+            The fragment for the pattern.
+
+        Raises:
+            RegexSyntaxError: If the pattern is malformed.
+        """
+        fragment = self._alternation()
+        if self.position < len(self.pattern):
+            # Only an unmatched ')' stops an alternation early
+            self._error("Unbalanced ')'")
+        return fragment
+
+    def _state(self) -> int:
+        """Add a state with no moves."""
+        self.epsilon.append([])
+        self.edges.append([])
+        return len(self.epsilon) - 1
+
+    def _peek(self) -> str | None:
+        """Return the next character of the pattern, if any."""
+        if self.position < len(self.pattern):
+            return self.pattern[self.position]
+        return None
+
+    def _error(self, message: str) -> NoReturn:
+        """Raise a syntax error at the current position."""
+        raise RegexSyntaxError(self.pattern, self.position, message)
+
+    def _alternation(self) -> _Fragment:
+        """Parse branches separated by '|'."""
+        branches = [self._concatenation()]
+        while self._peek() == "|":
+            self.position += 1
+            branches.append(self._concatenation())
+        if len(branches) == 1:
+            return branches[0]
+
+        start, end = self._state(), self._state()
+        for branch_start, branch_end in branches:
+            self.epsilon[start].append(branch_start)
+            self.epsilon[branch_end].append(end)
+        return start, end
+
+    def _concatenation(self) -> _Fragment:
+        """Parse a run of repeated atoms, which may be empty."""
+        start = end = self._state()
+        while self._peek() not in (None, "|", ")"):
+            piece_start, piece_end = self._repetition()
+            self.epsilon[end].append(piece_start)
+            end = piece_end
+        return start, end
+
+    def _repetition(self) -> _Fragment:
+        """Parse an atom followed by any number of '*', '+' or '?'."""
+        inner_start, inner_end = self._atom()
+        while self._peek() in ("*", "+", "?"):
+            operator = self.pattern[self.position]
+            self.position += 1
+
+            start, end = self._state(), self._state()
+            self.epsilon[start].append(inner_start)
+            self.epsilon[inner_end].append(end)
+            if operator != "+":
+                self.epsilon[start].append(end)
+            if operator != "?":
+                self.epsilon[inner_end].append(inner_start)
+            inner_start, inner_end = start, end
+        return inner_start, inner_end
+
+    def _atom(self) -> _Fragment:
+        """Parse a character, class, '.' or parenthesized group."""
+        char = self.pattern[self.position]
+        if char == "(":
+            self.position += 1
+            fragment = self._alternation()
+            if self._peek() != ")":
+                self._error("Missing ')'")
+            self.position += 1
+            return fragment
+
+        if char in ("*", "+", "?"):
+            self._error(f"Nothing to repeat before '{char}'")
+
+        if char == "[":
+            chars = self._class()
+        elif char == ".":
+            self.position += 1
+            chars = self.alphabet
+        elif char == "\\":
+            chars = self._escape()
+        else:
+            self.position += 1
+            chars = frozenset(char)
+
+        start, end = self._state(), self._state()
+        self.edges[start].append((chars, end))
+        return start, end
+
+    def _escape(self) -> frozenset[str]:
+        """Parse a backslash escape, returning the characters it matches."""
+        self.position += 1
+        char = self._peek()
+        if char is None:
+            self._error("Pattern ends with a backslash")
+        self.position += 1
+
+        if char in _ESCAPES:
+            return frozenset(_ESCAPES[char])
+        if char.isalnum():
+            self.position -= 2
+            self._error(f"Unknown escape '\\{char}'")
+        return frozenset(char)
+
+    def _class(self) -> frozenset[str]:
+        """Parse a bracketed character class, returning its characters."""
+        opening = self.position
+        self.position += 1
+        negated = self._peek() == "^"
+        if negated:
+            self.position += 1
+
+        chars: set[str] = set()
+        first = True
+        while True:
+            char = self._peek()
+            if char is None:
+                self.position = opening
+                self._error("Unterminated character class")
+            if char == "]" and not first:
+                self.position += 1
+                break
+            first = False
+
+            if char == "\\":
+                low = self._escape()
+            else:
+                low = self._literal()
+
+            # A '-' between two single characters makes a range
+            rest = self.pattern[self.position : self.position + 2]
+            if len(low) == 1 and len(rest) == 2 and rest[0] == "-" and rest[1] != "]":
+                self.position += 1
+                high = self._escape() if rest[1] == "\\" else self._literal()
+                if len(high) != 1 or min(high) < min(low):
+                    self._error("Invalid range in character class")
+                chars.update(map(chr, range(ord(min(low)), ord(min(high)) + 1)))
+            else:
+                chars.update(low)
+
+        return self.alphabet - chars if negated else frozenset(chars)
+
+    def _literal(self) -> frozenset[str]:
+        """Consume one plain character."""
+        char = self.pattern[self.position]
+        self.position += 1
+        return frozenset(char)
+
+
+def regex_nfa(pattern: str, alphabet: str | None = None) -> FSADefinition:
+    """
+    Build an NFA definition accepting exactly the strings a pattern matches.
+
+    The Thompson NFA's epsilon moves are removed by giving each state the
+    character moves of every state in its epsilon closure, and making it
+    accepting if the closure contains the final state. Only the start state
+    and the states a character move leads to are kept, so the result is
+    much smaller than an NFA with EPSILON moves would be.
+
+    Args:
+        pattern: The regular expression.
+        alphabet: The characters that ``.`` and negated classes range over;
+            defaults to DEFAULT_ALPHABET.
+
+    Returns:
+        A StateMachine definition, whose states have lists of targets.
+
+    Raises:
+        RegexSyntaxError: If the pattern is malformed.
+    """
+    builder = _ThompsonBuilder(
+        pattern, DEFAULT_ALPHABET if alphabet is None else alphabet
+    )
+    start, final = builder.parse()
+
+    closures: dict[int, list[int]] = {}
+    index = {start: 0}
+    order = [start]
+    fsa: FSADefinition = {}
+
+    for i, state in enumerate(order):
+        closure = closures.get(state)
+        if closure is None:
+            closure = closures[state] = _closure(builder.epsilon, state)
+
+        state_def: StateDefinition = {}
+        for member in closure:
+            for chars, target in builder.edges[member]:
+                if target not in index:
+                    index[target] = len(order)
+                    order.append(target)
+                name = f"S{index[target]}"
+                for char in sorted(chars):
+                    targets = state_def.setdefault(char, [])
+                    if name not in targets:
+                        targets.append(name)
+
+        state_def["start"] = i == 0
+        state_def["accept"] = final in closure
+        fsa[f"S{i}"] = state_def
+
+    return fsa
+
+
+def _closure(epsilon: list[list[int]], state: int) -> list[int]:
+    """Return the states reachable from a state by epsilon moves alone."""
+    seen = {state}
+    stack = [state]
+    while stack:
+        for target in epsilon[stack.pop()]:
+            if target not in seen:
+                seen.add(target)
+                stack.append(target)
+    return sorted(seen)
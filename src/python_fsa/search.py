@@ -0,0 +1,579 @@
+"""
+Searching text for every match of an automaton.
+
+This module provides Scanner, which reports every position in an input
+where the automaton's language matches, rather than only whether the
+whole input is accepted. A forward DFA for "any prefix, then a word of the
+language" finds the end offsets in one pass; a second forward DFA, which
+also keeps track of where each partial match began, finds the leftmost
+start of every match in one more pass.
+"""
+
+from __future__ import annotations
+
+import re
+from array import array
+from collections.abc import Sized
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Tuple
+
+from .compiled import BUFFER_TYPES, BinaryInput, _ColumnLookup, byte_symbols
+from .exceptions import FSAError
+
+if TYPE_CHECKING:
+    from .automaton import InputSymbol
+    from .nfa import BitsetNFA
+
+# Input symbols scanned per step of a run over a buffer or string
+_CHUNK_SIZE = 1 << 16
+
+# A match as (start offset, end offset), like slice bounds
+Match = Tuple[int, int]
+
+
+class _SearchDFA:
+    """
+    A complete DFA built by subset construction for one scan direction.
+
+    States are numbered so that every accepting state has an id of at least
+    ``first_accepting``, which turns the per-symbol acceptance test into one
+    integer comparison. ``rows[state][column]`` is the next state for a
+    symbol column; ``byte_rows`` is the same table indexed by byte class.
+    """
+
+    __slots__ = ("rows", "byte_rows", "start", "dead", "first_accepting")
+
+    def __init__(
+        self,
+        moves: list[list[int]],
+        start_mask: int,
+        accept_mask: int,
+        restart: int,
+        byte_columns: list[int],
+        max_states: int | None,
+    ) -> None:
+        """
+        Run the subset construction over successor masks.
+
+        Args:
+            moves: Per-column lists of successor masks, indexed by NFA state.
+                One extra column with no successors stands for unknown symbols.
+            start_mask: The set of NFA states to start from.
+            accept_mask: The set of accepting NFA states.
+            restart: States added to every subset after each symbol; the start
+                mask for an unanchored search, 0 for an anchored one.
+            byte_columns: The column of each byte class.
+            max_states: Optional limit on the number of DFA states.
+
+        Raises:
+            FSAError: If more than max_states DFA states are reachable.
+        """
+        ids = {start_mask: 0}
+        subsets = [start_mask]
+        rows: list[list[int]] = []
+
+        for mask in subsets:
+            row = []
+            for column in moves:
+                target = restart
+                rest = mask
+                while rest:
+                    low = rest & -rest
+                    target |= column[low.bit_length() - 1]
+                    rest ^= low
+
+                state = ids.get(target)
+                if state is None:
+                    if max_states is not None and len(subsets) >= max_states:
+                        raise FSAError(f"Search automaton exceeded {max_states} states")
+                    state = ids[target] = len(subsets)
+                    subsets.append(target)
+                row.append(state)
+            rows.append(row)
+
+        # Renumber so that accepting states come last
+        accepting = [bool(subset & accept_mask) for subset in subsets]
+        order = sorted(range(len(subsets)), key=accepting.__getitem__)
+        renumber = [0] * len(order)
+        for new, old in enumerate(order):
+            renumber[old] = new
+
+        self.rows = [[renumber[target] for target in rows[old]] for old in order]
+        self.byte_rows = [[row[column] for column in byte_columns] for row in self.rows]
+        self.start = renumber[0]
+        self.dead = renumber[ids[0]] if 0 in ids else -1
+        self.first_accepting = accepting.count(False)
+
+
+class _StartDFA:
+    """
+    A DFA that tracks where the leftmost match ending at each offset starts.
+
+    Each state is a tuple of disjoint NFA state masks, one per start offset
+    that still has a partial match, oldest first. After a symbol every mask
+    moves to its successors, less the NFA states an older start has already
+    reached, and the start mask comes back as the newest. The leftmost match
+    ending at an offset then starts at the offset of the first mask that
+    holds an accepting state.
+
+    States and transitions are built on first use, so a scan only pays for
+    the part of the DFA it reaches. ``rows[state][column]`` is None until
+    then, and afterwards a tuple of the next state, the indices of the masks
+    it keeps (None if it keeps all of them in order), and whether it adds a
+    new start. ``leftmost[state]`` is the index of the first accepting mask,
+    or -1.
+    """
+
+    __slots__ = (
+        "moves",
+        "restart",
+        "accept_mask",
+        "max_states",
+        "ids",
+        "masks",
+        "rows",
+        "leftmost",
+    )
+
+    def __init__(
+        self,
+        moves: list[list[int]],
+        start_mask: int,
+        accept_mask: int,
+        max_states: int | None,
+    ) -> None:
+        """
+        Create the DFA with only its start state.
+
+        Args:
+            moves: Per-column lists of successor masks, indexed by NFA state.
+            start_mask: The set of NFA states a match starts from.
+            accept_mask: The set of accepting NFA states.
+            max_states: Optional limit on the number of DFA states.
+        """
+        self.moves = moves
+        self.restart = start_mask
+        self.accept_mask = accept_mask
+        self.max_states = max_states
+        self.ids: dict[tuple[int, ...], int] = {}
+        self.masks: list[tuple[int, ...]] = []
+        self.rows: list[list[tuple[int, tuple[int, ...] | None, bool] | None]] = []
+        self.leftmost: list[int] = []
+        self._add((start_mask,) if start_mask else ())
+
+    def _add(self, masks: tuple[int, ...]) -> int:
+        """
+        Add a state for a tuple of masks.
+
+        Raises:
+            FSAError: If the DFA already has max_states states.
+        """
+        if self.max_states is not None and len(self.masks) >= self.max_states:
+            raise FSAError(f"Search automaton exceeded {self.max_states} states")
+        state = self.ids[masks] = len(self.masks)
+        self.masks.append(masks)
+        self.rows.append([None] * len(self.moves))
+        self.leftmost.append(
+            next((i for i, mask in enumerate(masks) if mask & self.accept_mask), -1)
+        )
+        return state
+
+    def step(self, state: int, column: int) -> tuple[int, tuple[int, ...] | None, bool]:
+        """
+        Build, cache and return the transition of a state on a column.
+
+        Raises:
+            FSAError: If the DFA would exceed max_states states.
+        """
+        successors = self.moves[column]
+        masks = self.masks[state]
+        targets = []
+        kept = []
+        reached = 0
+        for index, mask in enumerate(masks):
+            target = 0
+            while mask:
+                low = mask & -mask
+                target |= successors[low.bit_length() - 1]
+                mask ^= low
+            target &= ~reached
+            if target:
+                targets.append(target)
+                kept.append(index)
+                reached |= target
+
+        fresh = self.restart & ~reached
+        if fresh:
+            targets.append(fresh)
+        key = tuple(targets)
+        following = self.ids.get(key)
+        if following is None:
+            following = self._add(key)
+
+        keeps = None if len(kept) == len(masks) else tuple(kept)
+        transition = self.rows[state][column] = (following, keeps, bool(fresh))
+        return transition
+
+
+class Scanner:
+    """
+    Finds every match of an automaton's language in a larger input.
+
+    By default matches may start anywhere: the forward DFA tracks every
+    partial match at once by adding the start state back after each symbol,
+    and symbols the automaton doesn't know simply end partial matches. With
+    ``anchored=True`` only prefixes of the input are reported.
+
+    finditer() pairs every end with its leftmost start through a second DFA
+    whose states remember where partial matches began. That DFA is built
+    while searching, so max_states also bounds it there.
+
+    Inputs can be strings, binary buffers (bytes, bytearray, memoryview,
+    mmap) or any iterable of symbols. Buffers are read a byte at a time
+    through a 256-entry class table, as in CompiledAutomaton.run.
+    """
+
+    __slots__ = (
+        "_lookup",
+        "_byte_classes",
+        "_byte_columns",
+        "_forward",
+        "_starts",
+        "_anchored",
+        "_skip_bytes",
+        "_skip_text",
+        "_skip_bytes_idle",
+        "_skip_text_idle",
+        "_text_codes",
+    )
+
+    def __init__(
+        self,
+        nfa: BitsetNFA,
+        anchored: bool = False,
+        max_states: int | None = None,
+    ) -> None:
+        """
+        Build the forward search DFA, and the start of the one finditer() uses.
+
+        Args:
+            nfa: Successor masks of the automaton to search for.
+            anchored: Whether matches must start at offset 0.
+            max_states: Optional limit on the number of states of each DFA.
+
+        Raises:
+            FSAError: If the forward DFA has more than max_states states.
+        """
+        symbols = list(nfa.moves)
+        other = len(symbols)
+        self._lookup = _ColumnLookup({s: i for i, s in enumerate(symbols)}, other)
+        self._anchored = anchored
+
+        columns = [self._lookup[symbol] for symbol in byte_symbols(self._lookup)]
+        byte_columns = sorted(set(columns))
+        class_of = {column: i for i, column in enumerate(byte_columns)}
+        self._byte_classes = bytes(class_of[column] for column in columns)
+        self._byte_columns = columns
+
+        num_states = len(nfa.states)
+        forward = [nfa.moves[symbol] for symbol in symbols] + [[0] * num_states]
+
+        restart = 0 if anchored else nfa.start_mask
+        self._forward = _SearchDFA(
+            forward,
+            nfa.start_mask,
+            nfa.accept_mask,
+            restart,
+            byte_columns,
+            max_states,
+        )
+        self._starts = _StartDFA(forward, nfa.start_mask, nfa.accept_mask, max_states)
+
+        # The forward DFA stays in its start state on symbols that don't leave
+        # it, but the start DFA only on those that no start state reads, as
+        # a partial match that begins earlier is its own state there
+        start = self._forward.start
+        start_row = self._forward.rows[start]
+        start_states = [i for i in range(num_states) if nfa.start_mask >> i & 1]
+        self._skip_bytes, self._skip_text = self._skip_patterns(
+            symbols, lambda column: start_row[column] == start
+        )
+        self._skip_bytes_idle, self._skip_text_idle = self._skip_patterns(
+            symbols, lambda column: not any(forward[column][i] for i in start_states)
+        )
+        self._text_codes = _TextCodes(self._lookup) if other < 256 else None
+
+    def _skip_patterns(
+        self, symbols: list[Any], stays: Callable[[int], bool]
+    ) -> tuple[re.Pattern[bytes] | None, re.Pattern[str] | None]:
+        """
+        Build regexes matching the symbols that leave a DFA's start state.
+
+        Any other symbol read in the start state leads straight back to it
+        without a match, so the scan can jump to the next match of these
+        patterns instead of stepping through the input.
+
+        Args:
+            symbols: The NFA's symbols, indexed by column.
+            stays: Whether the symbols of a column keep the start state.
+
+        Returns:
+            Character class patterns for bytes and for text, or None where
+            skipping isn't possible because the start state is accepting.
+        """
+        forward = self._forward
+        if forward.start >= forward.first_accepting:
+            return None, None
+
+        leaving_bytes = bytes(
+            byte for byte in range(256) if not stays(self._byte_columns[byte])
+        )
+        bytes_class = b"".join(re.escape(bytes([b])) for b in leaving_bytes)
+        bytes_pattern = b"[" + bytes_class + b"]" if bytes_class else b"(?!)"
+
+        # Only one-character string keys can match a character of text; any
+        # other character is read as an unknown symbol
+        chars = {
+            symbol: stays(column)
+            for column, symbol in enumerate(symbols)
+            if isinstance(symbol, str) and len(symbol) == 1
+        }
+        if stays(len(symbols)):
+            leaving = "".join(char for char, stays in chars.items() if not stays)
+            text_pattern = f"[{re.escape(leaving)}]" if leaving else "(?!)"
+        else:
+            staying = "".join(char for char, stays in chars.items() if stays)
+            text_pattern = f"[^{re.escape(staying)}]" if staying else "(?s:.)"
+
+        # An empty class never matches, so the rest of the input is skipped
+        return re.compile(bytes_pattern), re.compile(text_pattern)
+
+    @property
+    def num_states(self) -> tuple[int, int]:
+        """Number of states of the forward DFA, and of the start DFA so far."""
+        return len(self._forward.rows), len(self._starts.masks)
+
+    def scan(self, data: Iterable[InputSymbol] | BinaryInput) -> list[int]:
+        """
+        Find the end offset of every match in one pass over the input.
+
+        Args:
+            data: A string, binary buffer or iterable of input symbols.
+
+        Returns:
+            Every offset e, in increasing order, such that some match ends
+            just before position e. Offset 0 is included if the empty input
+            is accepted.
+        """
+        ends: list[int] = []
+        for chunk in self._ends(data):
+            ends.extend(chunk)
+        return ends
+
+    def finditer(self, data: Iterable[InputSymbol] | BinaryInput) -> Iterator[Match]:
+        """
+        Find every match with its start and end offsets.
+
+        Each end offset found by scan() is paired with the leftmost start
+        that gives a match ending there. Both come from one forward pass
+        that keeps, for every partial match, the offset where it began.
+
+        Args:
+            data: A string, binary buffer or sequence of input symbols.
+                Other iterables are read into a list first.
+
+        Yields:
+            (start, end) pairs, in increasing order of end offset, such that
+            ``data[start:end]`` is accepted by the automaton.
+
+        Raises:
+            FSAError: If the DFA tracking starts grows past max_states states.
+        """
+        if self._anchored:
+            for chunk in self._ends(data):
+                for end in chunk:
+                    yield 0, end
+            return
+
+        if isinstance(data, BUFFER_TYPES):
+            skip = self._skip_bytes_idle and self._skip_bytes_idle.search
+            with memoryview(data) as view, view.cast("B") as flat:
+                yield from self._with_starts(flat, self._byte_columns.__getitem__, skip)
+        elif isinstance(data, str):
+            skip_text = self._skip_text_idle and self._skip_text_idle.search
+            yield from self._with_starts(data, self._lookup.__getitem__, skip_text)
+        else:
+            if not (isinstance(data, Sized) and hasattr(data, "__getitem__")):
+                data = list(data)
+            yield from self._with_starts(data, self._lookup.__getitem__, None)
+
+    def _with_starts(
+        self, data: Any, column: Callable[[Any], int], skip: Any
+    ) -> Iterator[Match]:
+        """
+        Run the start DFA over a sequence, yielding each match as it ends.
+
+        While no partial match is alive, a regex search for the next symbol
+        a start state reads skips over the input in between.
+
+        Args:
+            data: The input, indexable by offset.
+            column: Maps an element of data to its symbol column.
+            skip: The search function of the idle skip pattern, or None.
+
+        Yields:
+            (start, end) pairs for every match.
+        """
+        starts = self._starts
+        rows = starts.rows
+        leftmost = starts.leftmost
+        state = 0
+        offsets = [0]
+        if leftmost[state] >= 0:
+            yield 0, 0
+
+        position = 0
+        size = len(data)
+        while position < size:
+            if state == 0 and skip is not None:
+                found = skip(data, position)
+                if found is None:
+                    return
+                if found.start() > position:
+                    position = found.start()
+                    offsets = [position]
+
+            code = column(data[position])
+            transition = rows[state][code] or starts.step(state, code)
+            state, kept, fresh = transition
+            if kept is not None:
+                offsets = [offsets[index] for index in kept]
+            position += 1
+            if fresh:
+                offsets.append(position)
+
+            rank = leftmost[state]
+            if rank >= 0:
+                yield offsets[rank], position
+
+    def _ends(self, data: Iterable[InputSymbol] | BinaryInput) -> Iterator[list[int]]:
+        """
+        Run the forward DFA, yielding the end offsets found in each chunk.
+
+        Whenever the DFA is back in its start state, a regex search for the
+        next symbol that leaves it skips over the input in between at C
+        speed. For a typical search that is most of the input.
+
+        Args:
+            data: A string, binary buffer or iterable of input symbols.
+
+        Yields:
+            Lists of end offsets, one list per chunk of input.
+        """
+        forward = self._forward
+        first_accepting = forward.first_accepting
+        start = state = forward.start
+        if state >= first_accepting:
+            yield [0]
+
+        for offset, text, codes, rows, skip in self._chunks(data):
+            ends: list[int] = []
+            if skip is None:
+                for position, code in enumerate(codes, offset + 1):
+                    state = rows[state][code]
+                    if state >= first_accepting:
+                        ends.append(position)
+            else:
+                view = memoryview(codes)
+                resume = 0
+                while True:
+                    if state == start:
+                        found = skip(text, resume)
+                        if found is None:
+                            break
+                        resume = found.start()
+
+                    for position, code in enumerate(view[resume:], resume):
+                        state = rows[state][code]
+                        if state >= first_accepting:
+                            ends.append(offset + position + 1)
+                        if state == start:
+                            break
+                    else:
+                        break
+                    resume = position + 1
+            yield ends
+
+            # Anchored searches can't match again once every path is dead
+            if state == forward.dead:
+                return
+
+    def _chunks(
+        self, data: Iterable[InputSymbol] | BinaryInput
+    ) -> Iterator[tuple[int, Any, Any, list[list[int]], Any]]:
+        """
+        Split input into chunks of symbol codes.
+
+        Args:
+            data: A string, binary buffer or iterable of input symbols.
+
+        Yields:
+            For each chunk: its offset, the raw chunk, its codes (byte classes
+            for buffers, symbol columns otherwise), the forward rows indexed
+            by those codes, and the search function of the skip pattern, or
+            None if the chunk can't be skipped through.
+        """
+        lookup = self._lookup.__getitem__
+        if isinstance(data, BUFFER_TYPES):
+            rows = self._forward.byte_rows
+            skip = self._skip_bytes and self._skip_bytes.search
+            with memoryview(data) as view, view.cast("B") as flat:
+                for offset in range(0, len(flat), _CHUNK_SIZE):
+                    raw = flat[offset : offset + _CHUNK_SIZE].tobytes()
+                    yield offset, raw, raw.translate(self._byte_classes), rows, skip
+        elif isinstance(data, str):
+            rows = self._forward.rows
+            skip_text = self._skip_text and self._skip_text.search
+            for offset in range(0, len(data), _CHUNK_SIZE):
+                chunk = data[offset : offset + _CHUNK_SIZE]
+                if self._text_codes is not None:
+                    codes: Any = chunk.translate(self._text_codes).encode("latin-1")
+                else:
+                    codes = array("i", map(lookup, chunk))
+                yield offset, chunk, codes, rows, skip_text
+        else:
+            yield 0, None, map(lookup, data), self._forward.rows, None
+
+    def __repr__(self) -> str:
+        """Return the sizes of the search DFAs."""
+        forward, starts = self.num_states
+        return (
+            f"Scanner(forward_states={forward}, start_states={starts}, "
+            f"anchored={self._anchored})"
+        )
+
+
+class _TextCodes(dict):
+    """
+    Code point to column mapping for translating text with str.translate().
+
+    Each column is stored as the character with that code, so a translated
+    chunk encoded as Latin-1 is a bytes object of columns. Characters are
+    resolved through the symbol lookup on first use and cached.
+    """
+
+    def __init__(self, lookup: _ColumnLookup) -> None:
+        """
+        Initialize an empty mapping over a symbol lookup.
+
+        Args:
+            lookup: Mapping from input symbol to column, with fewer than 256
+                columns.
+        """
+        super().__init__()
+        self._lookup = lookup
+
+    def __missing__(self, point: int) -> str:
+        """Resolve and cache the column of a code point."""
+        column = chr(self._lookup[chr(point)])
+        self[point] = column
+        return column
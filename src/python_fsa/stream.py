@@ -0,0 +1,198 @@
+"""
+Incremental processing of unbounded input streams.
+
+This module provides StreamCursor, which runs input through an automaton
+one chunk at a time without ever holding more than the current chunk. The
+cursor's position can be saved as a few bytes with checkpoint() and loaded
+back with restore(), so a long-running consumer can resume after a restart
+without replaying the stream.
+"""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from collections.abc import Sized
+from itertools import count
+from operator import itemgetter
+from typing import TYPE_CHECKING, Iterable
+
+from .compiled import CompiledAutomaton
+from .exceptions import FSAError
+from .nfa import BitsetNFA
+
+if TYPE_CHECKING:
+    from .automaton import InputSymbol, StateName
+
+# magic, format version, kind, number of states, position, automaton checksum
+_HEADER = struct.Struct("<4sBBIQI")
+_MAGIC = b"FSAC"
+_VERSION = 2
+_DFA, _NFA = 0, 1
+
+
+class StreamCursor:
+    """
+    A resumable position in a stream of input symbols.
+
+    Deterministic automata are run through their compiled integer table and
+    the cursor stores a single state id; non-deterministic ones are simulated
+    with bitsets and the cursor stores the set of active states. Either way
+    the cursor's memory use doesn't depend on how much input it has seen.
+
+    A checkpoint holds a short header, including a checksum of the compiled
+    table or of the successor masks, followed by the state id or the
+    active-set bitmap. It can only be restored into a cursor over the same
+    automaton.
+    """
+
+    __slots__ = ("_compiled", "_nfa", "_checksum", "_num_states", "_state", "position")
+
+    def __init__(self, automaton: CompiledAutomaton | BitsetNFA) -> None:
+        """
+        Start a cursor at the start state of an automaton.
+
+        The automaton is shared, not copied; neither kind is changed by runs.
+
+        Args:
+            automaton: A compiled DFA, or the successor masks of an NFA.
+        """
+        self._compiled: CompiledAutomaton | None = None
+        self._nfa: BitsetNFA | None = None
+        if isinstance(automaton, CompiledAutomaton):
+            self._compiled = automaton
+            self._checksum = automaton._checksum()
+            self._num_states = automaton.num_states
+        else:
+            self._nfa = automaton
+            masks = (automaton.states, list(automaton.moves.items()))
+            shape = (masks, automaton.start_mask, automaton.accept_mask)
+            self._checksum = zlib.crc32(repr(shape).encode())
+            self._num_states = len(automaton.states)
+
+        self._state = 0
+        self.position = 0
+        self.reset()
+
+    @property
+    def state(self) -> StateName:
+        """Name of the current state, or of the active set for an NFA."""
+        if self._compiled is not None:
+            return self._compiled.state_name(self._state)
+        assert self._nfa is not None
+        return self._nfa.name(self._state)
+
+    @property
+    def accepting(self) -> bool:
+        """Whether the input fed so far is accepted."""
+        if self._compiled is not None:
+            return self._compiled.is_accepting(self._state)
+        assert self._nfa is not None
+        return self._nfa.accepts(self._state)
+
+    def feed(self, chunk: Iterable[InputSymbol]) -> StreamCursor:
+        """
+        Advance the cursor through a chunk of input symbols.
+
+        The chunk is consumed lazily, so generators are never materialized.
+        If a symbol has no transition, the cursor stays where it was before
+        the chunk.
+
+        Args:
+            chunk: The input symbols to process, e.g. a string, list or generator.
+
+        Returns:
+            Self to allow method chaining.
+
+        Raises:
+            InvalidTransitionError: If a transition is not defined for a symbol.
+        """
+        counter = None if isinstance(chunk, Sized) else count()
+        symbols: Iterable[InputSymbol] = chunk
+        if counter is not None:
+            # zip stops before advancing the counter once the chunk is exhausted
+            symbols = map(itemgetter(0), zip(chunk, counter))
+
+        if self._compiled is not None:
+            state = self._compiled.run(symbols, start=self._state)
+        else:
+            assert self._nfa is not None
+            state = self._nfa.run(self._state, symbols)
+
+        self._state = state
+        if isinstance(chunk, Sized):
+            self.position += len(chunk)
+        elif counter is not None:
+            self.position += next(counter)
+        return self
+
+    def reset(self) -> None:
+        """Return the cursor to the start state and position 0."""
+        if self._compiled is not None:
+            self._state = self._compiled.start
+        else:
+            assert self._nfa is not None
+            self._state = self._nfa.start_mask
+        self.position = 0
+
+    def checkpoint(self) -> bytes:
+        """
+        Save the cursor's state and position.
+
+        Returns:
+            A compact binary snapshot that restore() accepts.
+        """
+        if self._compiled is not None:
+            kind, payload = _DFA, struct.pack("<I", self._state)
+        else:
+            size = (self._num_states + 7) // 8
+            kind, payload = _NFA, self._state.to_bytes(size, "little")
+
+        header = _HEADER.pack(
+            _MAGIC, _VERSION, kind, self._num_states, self.position, self._checksum
+        )
+        return header + payload
+
+    def restore(self, data: bytes) -> None:
+        """
+        Load a state and position saved by checkpoint().
+
+        Args:
+            data: The snapshot bytes.
+
+        Raises:
+            FSAError: If the snapshot is malformed or was taken on a cursor
+                over a different automaton.
+        """
+        if len(data) < _HEADER.size:
+            raise FSAError("Checkpoint is truncated")
+
+        magic, version, kind, num_states, position, checksum = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != _VERSION:
+            raise FSAError("Not a stream checkpoint, or an unsupported version")
+
+        expected_kind = _DFA if self._compiled is not None else _NFA
+        expected = (expected_kind, self._num_states, self._checksum)
+        if (kind, num_states, checksum) != expected:
+            raise FSAError("Checkpoint was taken on a different FSA definition")
+
+        payload = data[_HEADER.size :]
+        if kind == _DFA:
+            if len(payload) != 4:
+                raise FSAError("Checkpoint is truncated")
+            (state,) = struct.unpack("<I", payload)
+            if state >= num_states:
+                raise FSAError(f"Checkpoint has invalid state id {state}")
+        else:
+            if len(payload) != (num_states + 7) // 8:
+                raise FSAError("Checkpoint is truncated")
+            state = int.from_bytes(payload, "little")
+            if state >> num_states:
+                raise FSAError("Checkpoint has invalid active states")
+
+        self._state = state
+        self.position = position
+
+    def __repr__(self) -> str:
+        """Return the current state and position."""
+        return f"StreamCursor(state='{self.state}', position={self.position})"
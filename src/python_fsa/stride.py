@@ -0,0 +1,286 @@
+"""
+Multi-symbol stride tables for running long inputs k symbols per step.
+
+This module provides StrideTable, which extends a CompiledAutomaton with a
+table mapping (state, block of k symbols) -> state. Text and binary buffers
+are turned into one block id per k symbols at C speed, and the Python loop
+then takes one step per block instead of one per symbol. Small alphabets
+gain the most: a binary divisibility checker runs eight bits per step.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Iterable
+
+from .compiled import _CHUNK_SIZE, BUFFER_TYPES, byte_symbols
+from .exceptions import FSAError
+
+if TYPE_CHECKING:
+    from .automaton import InputSymbol
+    from .compiled import BinaryInput, CompiledAutomaton
+
+# Default limit, in bytes, for the table built by StrideTable
+DEFAULT_MEMORY_BUDGET = 1 << 22
+
+# Largest number of distinct blocks, so that a block id fits in one byte
+MAX_BLOCKS = 256
+
+# Approximate bytes per table entry, i.e. per list slot
+_ENTRY_SIZE = 8
+
+# Class code of symbols the automaton doesn't know
+_UNKNOWN = 255
+
+
+def choose_stride(rows: int, classes: int, memory_budget: int) -> int:
+    """
+    Pick the largest block size whose table fits in a memory budget.
+
+    Args:
+        rows: Number of table rows, including the dead state.
+        classes: Number of symbol classes.
+        memory_budget: Approximate limit, in bytes, for the table.
+
+    Returns:
+        The number of symbols per block, at least 1.
+    """
+    if classes < 2:
+        return 1
+    k = 1
+    while (
+        classes ** (k + 1) <= MAX_BLOCKS
+        and classes ** (k + 1) * rows * _ENTRY_SIZE <= memory_budget
+    ):
+        k += 1
+    return k
+
+
+class StrideTable:
+    """
+    A compiled automaton that consumes input k symbols at a time.
+
+    With W symbol classes, the block of classes c[0], ..., c[k-1] has id
+    ``c[0] + c[1]*W + ... + c[k-1]*W**(k-1)``, and ``rows[state][block]`` is
+    the state reached from state after all k symbols. Ids are computed for
+    a whole chunk at once: the input is translated to one class code per
+    byte, every k-th code starting at offset i is scaled by W**i through a
+    translation table, and the k scaled columns are summed as big integers
+    with one byte per digit. Block ids stay below MAX_BLOCKS, so digits
+    never carry into each other, and the bytes of the sum are the ids.
+
+    Symbols the automaton doesn't know get a reserved code, and missing
+    transitions lead to the dead state, which absorbs every block. Either
+    way the chunk is run again through the 1-stride CompiledAutomaton, which
+    raises the usual error for the offending symbol. Input left over after
+    the last whole block is run through it as well.
+    """
+
+    __slots__ = ("_compiled", "_k", "_rows", "_scales", "_codes", "_text")
+
+    def __init__(
+        self,
+        compiled: CompiledAutomaton,
+        k: int | None = None,
+        memory_budget: int = DEFAULT_MEMORY_BUDGET,
+    ) -> None:
+        """
+        Build the stride table for a compiled automaton.
+
+        Args:
+            compiled: The automaton to run.
+            k: Symbols per block; by default the largest whose table fits in
+                memory_budget.
+            memory_budget: Approximate limit, in bytes, for the table when k
+                is chosen automatically.
+
+        Raises:
+            FSAError: If k is less than 1, or blocks of k symbols would have
+                more than MAX_BLOCKS ids.
+        """
+        classes = compiled.num_classes
+        if k is None:
+            k = choose_stride(compiled.dead + 1, classes, memory_budget)
+        elif k < 1:
+            raise FSAError(f"Stride must be at least 1, got {k}")
+        elif k > 1 and classes**k > MAX_BLOCKS:
+            raise FSAError(
+                f"Blocks of {k} symbols over {classes} classes need more than "
+                f"{MAX_BLOCKS} ids"
+            )
+
+        self._compiled = compiled
+        self._k = k
+
+        table = compiled.transitions
+        base = [
+            list(table[row * classes : (row + 1) * classes])
+            for row in range(compiled.dead + 1)
+        ]
+        self._rows = base
+        for _ in range(k - 1):
+            self._rows = [
+                [base[middle][last] for last in range(classes) for middle in row]
+                for row in self._rows
+            ]
+
+        # Translation tables from class code to code * W**i
+        self._scales = [
+            bytes(code * classes**i & 0xFF for code in range(256)) for i in range(k)
+        ]
+
+        codes = [_UNKNOWN] * 256
+        for byte, symbol in enumerate(byte_symbols(frozenset(compiled.symbols))):
+            column = compiled.column(symbol)
+            if column is not None and column < _UNKNOWN:
+                codes[byte] = column
+        self._codes = bytes(codes)
+        self._text = _TextClasses(compiled)
+
+    @property
+    def k(self) -> int:
+        """Number of symbols consumed per step."""
+        return self._k
+
+    @property
+    def compiled(self) -> CompiledAutomaton:
+        """The 1-stride automaton the table was built from."""
+        return self._compiled
+
+    @property
+    def num_entries(self) -> int:
+        """Number of entries in the stride table, over every row."""
+        return len(self._rows) * len(self._rows[0])
+
+    def run(
+        self,
+        inputs: str | BinaryInput | Iterable[InputSymbol],
+        start: int | None = None,
+    ) -> int:
+        """
+        Run input through the automaton, k symbols per step.
+
+        Strings are run character by character and binary buffers byte by
+        byte, as by CompiledAutomaton.run(). Other iterables have no cheap
+        way to form blocks and are run by the 1-stride automaton.
+
+        Args:
+            inputs: A string, a binary buffer or other input symbols.
+            start: State id to start from; defaults to the start state.
+
+        Returns:
+            The id of the state reached after consuming every input symbol.
+
+        Raises:
+            InvalidTransitionError: If a transition is not defined for a symbol.
+        """
+        compiled = self._compiled
+        state = compiled.start if start is None else start
+        if self._k == 1:
+            return compiled.run(inputs, state)
+        if isinstance(inputs, str):
+            return self._run_chunks(inputs, state, self._text_codes)
+        if isinstance(inputs, BUFFER_TYPES):
+            with memoryview(inputs) as view, view.cast("B") as flat:
+                return self._run_chunks(flat, state, self._byte_codes)
+        return compiled.run(inputs, state)
+
+    def accepts(self, inputs: str | BinaryInput | Iterable[InputSymbol]) -> bool:
+        """
+        Check whether the automaton accepts an input.
+
+        Args:
+            inputs: A string, a binary buffer or other input symbols.
+
+        Returns:
+            True if the state reached after the input is accepting.
+
+        Raises:
+            InvalidTransitionError: If a transition is not defined for a symbol.
+        """
+        return self._compiled.is_accepting(self.run(inputs))
+
+    def _text_codes(self, chunk: str) -> bytes:
+        """Translate a piece of text to class codes."""
+        return chunk.translate(self._text).encode("latin-1")
+
+    def _byte_codes(self, chunk: memoryview) -> bytes:
+        """Translate a piece of a binary buffer to class codes."""
+        return chunk.tobytes().translate(self._codes)
+
+    def _block_ids(self, codes: bytes) -> bytes:
+        """
+        Compute the id of every block in a run of class codes.
+
+        Args:
+            codes: Class codes, a whole number of blocks long, none unknown.
+
+        Returns:
+            The block ids, in input order.
+        """
+        k = self._k
+        total = 0
+        for i, scale in enumerate(self._scales):
+            total += int.from_bytes(codes[i::k].translate(scale), "little")
+        return total.to_bytes(len(codes) // k, "little")
+
+    def _run_chunks(self, data: Any, state: int, encode: Any) -> int:
+        """
+        Run a string or flat byte view through the table, a chunk at a time.
+
+        Args:
+            data: The string or memoryview of bytes.
+            state: State id to start from.
+            encode: Function translating a slice of data to class codes.
+
+        Returns:
+            The id of the state reached after consuming all of data.
+
+        Raises:
+            InvalidTransitionError: If a transition is not defined for a symbol.
+        """
+        compiled = self._compiled
+        rows = self._rows
+        dead = compiled.dead
+        k = self._k
+        whole = len(data) - len(data) % k
+        step = _CHUNK_SIZE - _CHUNK_SIZE % k
+
+        for offset in range(0, whole, step):
+            chunk = data[offset : min(offset + step, whole)]
+            codes = encode(chunk)
+            before = state
+            if _UNKNOWN in codes:
+                state = dead
+            else:
+                for block in self._block_ids(codes):
+                    state = rows[state][block]
+            if state == dead:
+                state = compiled.run(chunk, before)
+
+        return compiled.run(data[whole:], state)
+
+
+class _TextClasses(dict):
+    """
+    Code point to class code mapping for translating text with str.translate().
+
+    Characters are resolved through CompiledAutomaton.column() on first use
+    and cached; characters that aren't symbols get the reserved code.
+    """
+
+    def __init__(self, compiled: CompiledAutomaton) -> None:
+        """
+        Initialize an empty mapping over a compiled automaton.
+
+        Args:
+            compiled: The automaton whose columns are the class codes.
+        """
+        super().__init__()
+        self._compiled = compiled
+
+    def __missing__(self, point: int) -> str:
+        """Resolve and cache the class code of a code point."""
+        column = self._compiled.column(chr(point))
+        code = chr(_UNKNOWN if column is None or column >= _UNKNOWN else column)
+        self[point] = code
+        return code
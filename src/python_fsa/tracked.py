@@ -0,0 +1,302 @@
+"""
+FSA definitions that count their own changes.
+
+A StateMachine caches data derived from its definition, such as compiled
+tables, successor masks, the reverse transition index and the arrows drawn
+by create_graph(). To tell when that data is out of date, the definition is
+held in a TrackedDefinition whose state dictionaries are TrackedStates,
+and whose lists of non-deterministic targets are TrackedTargets. Every
+change to any of them bumps a Version shared by the whole definition,
+including changes made directly through ``machine.fsa``, so a cache is valid
+exactly as long as the version it was built at is current.
+
+These classes are plain dicts and lists otherwise, and compare equal to
+dicts and lists with the same items. A deep copy, or a pickled
+StateMachine once loaded, counts its changes with a Version of its own.
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, SupportsIndex
+
+if TYPE_CHECKING:
+    from .automaton import FSADefinition, StateDefinition
+
+StateName = str
+
+
+class Version:
+    """A counter of changes, shared by a definition and its states."""
+
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        """Start at version 0."""
+        self.value = 0
+
+
+class TrackedTargets(List[StateName]):
+    """
+    The targets of a non-deterministic transition, bumping its Version
+    whenever they change.
+
+    Made by track_state() for every list in a state definition, so the
+    list given is copied rather than tracked itself.
+    """
+
+    __slots__ = ("_version",)
+
+    _version: Version
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        """Replace a target, or a slice of them."""
+        super().__setitem__(index, value)
+        self._version.value += 1
+
+    def __delitem__(self, index: Any) -> None:
+        """Delete a target, or a slice of them."""
+        super().__delitem__(index)
+        self._version.value += 1
+
+    def __iadd__(  # type: ignore[misc,override]
+        self, other: Iterable[StateName]
+    ) -> TrackedTargets:
+        """Add targets, like extend()."""
+        self.extend(other)
+        return self
+
+    def __imul__(self, count: SupportsIndex) -> TrackedTargets:
+        """Repeat the targets in place."""
+        super().__imul__(count)
+        self._version.value += 1
+        return self
+
+    def __reduce__(self) -> tuple[Any, tuple[Version, list[StateName]]]:
+        """Copy and pickle with the Version, which deep copies don't share."""
+        return _track_targets, (self._version, list(self))
+
+    def append(self, target: StateName) -> None:
+        """Add a target."""
+        super().append(target)
+        self._version.value += 1
+
+    def extend(self, targets: Iterable[StateName]) -> None:
+        """Add every target in an iterable."""
+        super().extend(targets)
+        self._version.value += 1
+
+    def insert(self, index: SupportsIndex, target: StateName) -> None:
+        """Add a target before an index."""
+        super().insert(index, target)
+        self._version.value += 1
+
+    def pop(self, index: SupportsIndex = -1) -> StateName:
+        """Remove a target and return it."""
+        self._version.value += 1
+        return super().pop(index)
+
+    def remove(self, target: StateName) -> None:
+        """Remove the first occurrence of a target."""
+        super().remove(target)
+        self._version.value += 1
+
+    def clear(self) -> None:
+        """Remove every target."""
+        super().clear()
+        self._version.value += 1
+
+    def reverse(self) -> None:
+        """Reverse the targets in place."""
+        super().reverse()
+        self._version.value += 1
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        """Sort the targets in place."""
+        super().sort(*args, **kwargs)
+        self._version.value += 1
+
+
+class TrackedState(Dict[Any, Any]):
+    """
+    A state definition that bumps its Version whenever it changes.
+
+    Made by track_state(). It has no __init__ of its own, so copying a
+    definition into TrackedStates stays close to the cost of dict.copy().
+    Lists of targets stored in it are copied into TrackedTargets sharing
+    its Version.
+    """
+
+    __slots__ = ("_version",)
+
+    _version: Version
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        """Set a transition or flag."""
+        if isinstance(value, list):
+            value = _track_targets(self._version, value)
+        super().__setitem__(key, value)
+        self._version.value += 1
+
+    def __delitem__(self, key: Any) -> None:
+        """Delete a transition."""
+        super().__delitem__(key)
+        self._version.value += 1
+
+    def __ior__(self, other: Any) -> TrackedState:  # type: ignore[misc]
+        """Update from another mapping, like update()."""
+        self.update(other)
+        return self
+
+    def __reduce__(self) -> tuple[Any, tuple[Version, dict[Any, Any]]]:
+        """Copy and pickle with the Version, which deep copies don't share."""
+        return track_state, (self._version, dict(self))
+
+    def pop(self, key: Any, *default: Any) -> Any:
+        """Remove a transition and return its target."""
+        self._version.value += 1
+        return super().pop(key, *default)
+
+    def popitem(self) -> tuple[Any, Any]:
+        """Remove the last item and return it."""
+        self._version.value += 1
+        return super().popitem()
+
+    def setdefault(self, key: Any, default: Any = None) -> Any:
+        """Set a transition or flag unless it exists, and return it."""
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        """Set every transition or flag in a mapping or iterable of pairs."""
+        super().update(*args, **kwargs)
+        _track_lists(self)
+        self._version.value += 1
+
+    def clear(self) -> None:
+        """Remove every transition and flag."""
+        super().clear()
+        self._version.value += 1
+
+
+class TrackedDefinition(Dict[StateName, Dict[str, Any]]):
+    """
+    An FSA definition that bumps its Version whenever it changes.
+
+    States stored in it are copied into TrackedStates sharing its Version,
+    unless they already are, so a state dictionary given to it is not
+    tracked itself.
+    """
+
+    __slots__ = ("_version",)
+
+    def __init__(self, version: Version, fsa: FSADefinition) -> None:
+        """
+        Copy an FSA definition.
+
+        Args:
+            version: The counter to bump on every change.
+            fsa: The state definitions by name.
+        """
+        super().__init__()
+        self._version = version
+
+        # Inlined track_state(), as this copies every state of an FSA
+        put = super().__setitem__
+        for name, state_def in fsa.items():
+            if type(state_def) is not TrackedState or state_def._version is not version:
+                state_def = TrackedState(state_def)
+                state_def._version = version
+                for target in state_def.values():
+                    if isinstance(target, list):
+                        _track_lists(state_def)
+                        break
+            put(name, state_def)
+
+    def __setitem__(self, name: StateName, state_def: StateDefinition) -> None:
+        """Add or replace a state."""
+        super().__setitem__(name, track_state(self._version, state_def))
+        self._version.value += 1
+
+    def __delitem__(self, name: StateName) -> None:
+        """Delete a state."""
+        super().__delitem__(name)
+        self._version.value += 1
+
+    def __ior__(self, other: Any) -> TrackedDefinition:  # type: ignore[misc,override]
+        """Update from another mapping, like update()."""
+        self.update(other)
+        return self
+
+    def __reduce__(self) -> tuple[type, tuple[Version, dict[Any, Any]]]:
+        """Copy and pickle with the Version, which deep copies don't share."""
+        return type(self), (self._version, dict(self))
+
+    def pop(self, name: StateName, *default: Any) -> Any:
+        """Remove a state and return its definition."""
+        self._version.value += 1
+        return super().pop(name, *default)
+
+    def popitem(self) -> tuple[StateName, StateDefinition]:
+        """Remove the last state and return it with its name."""
+        self._version.value += 1
+        return super().popitem()
+
+    def setdefault(self, name: StateName, default: Any = None) -> Any:
+        """Add a state unless it exists, and return its definition."""
+        if name not in self:
+            self[name] = default
+        return self[name]
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        """Add or replace every state in a mapping or iterable of pairs."""
+        items: Iterable[tuple[StateName, StateDefinition]] = dict(
+            *args, **kwargs
+        ).items()
+        for name, state_def in items:
+            self[name] = state_def
+
+    def clear(self) -> None:
+        """Remove every state."""
+        super().clear()
+        self._version.value += 1
+
+
+def track_state(version: Version, state_def: Mapping[str, Any]) -> TrackedState:
+    """
+    Return a state definition as a TrackedState with the given Version.
+
+    Args:
+        version: The counter to bump on every change.
+        state_def: The transitions and start and accept flags; copied unless
+            it already is a TrackedState with this Version. Lists of targets
+            in a copy are copied into TrackedTargets.
+
+    Returns:
+        The tracked state definition.
+    """
+    if type(state_def) is TrackedState and state_def._version is version:
+        return state_def
+    tracked = TrackedState(state_def)
+    tracked._version = version
+    _track_lists(tracked)
+    return tracked
+
+
+def _track_targets(version: Version, targets: list[StateName]) -> TrackedTargets:
+    """Return a list of targets as TrackedTargets with the given Version."""
+    if type(targets) is TrackedTargets and targets._version is version:
+        return targets
+    tracked = TrackedTargets(targets)
+    tracked._version = version
+    return tracked
+
+
+def _track_lists(state_def: TrackedState) -> None:
+    """Copy the lists of targets in a TrackedState into TrackedTargets."""
+    version = state_def._version
+    for key, value in state_def.items():
+        if value.__class__ is list or (
+            value.__class__ is TrackedTargets and value._version is not version
+        ):
+            dict.__setitem__(state_def, key, _track_targets(version, value))
@@ -0,0 +1,37 @@
+"""
+Fixtures shared by the test suite.
+
+Each fixture returns a fresh FSA definition, so tests can edit it freely.
+"""
+
+from typing import Any
+
+import pytest
+
+
+@pytest.fixture  # type: ignore[misc]
+def simple_dfa() -> dict[str, dict[str, Any]]:
+    """A DFA accepting binary strings with an even number of 1s."""
+    return {
+        "S0": {"0": "S0", "1": "S1", "start": True, "accept": True},
+        "S1": {"0": "S1", "1": "S0", "start": False, "accept": False},
+    }
+
+
+@pytest.fixture  # type: ignore[misc]
+def simple_nfa() -> dict[str, dict[str, Any]]:
+    """An NFA accepting binary strings that contain a 1."""
+    return {
+        "S0": {"0": "S0", "1": ["S0", "S1"], "start": True, "accept": False},
+        "S1": {"0": "S1", "1": "S1", "start": False, "accept": True},
+    }
+
+
+@pytest.fixture  # type: ignore[misc]
+def ends_in_ab() -> dict[str, dict[str, Any]]:
+    """A DFA accepting strings over {a, b} that end in 'ab'."""
+    return {
+        "S0": {"a": "S1", "b": "S0", "start": True, "accept": False},
+        "S1": {"a": "S1", "b": "S2", "start": False, "accept": False},
+        "S2": {"a": "S1", "b": "S0", "start": False, "accept": True},
+    }
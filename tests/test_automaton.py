@@ -6,16 +6,21 @@ DFA/NFA operations, minimization, state combination, visualization,
 and error handling.
 """
 
+import copy
+import itertools
 import math
+import random
 from typing import Any
 
 import pytest
 
-from python_fsa import StateMachine
+from python_fsa import EPSILON, StateMachine
 from python_fsa.exceptions import (
+    FSAError,
     InvalidFSADefinitionError,
     InvalidStateError,
     InvalidTransitionError,
+    MinimizationError,
 )
 
 
@@ -58,6 +63,48 @@ class TestStateMachine:
         fsa = StateMachine.create_divisibility_checker(2, 3)
         assert fsa(1)(1).accept, "Multiple calls: 3 mod 3 (base 2)"
 
+    def test_non_mutating_acceptance(self) -> None:
+        """Test that accepts() and final_state() leave the machine untouched."""
+        fsa = StateMachine.create_divisibility_checker(2, 3)
+        definition = {name: dict(state) for name, state in fsa.fsa.items()}
+
+        assert fsa.accepts([1, 1])
+        assert not fsa.accepts([1, 0, 1])
+        assert fsa.accepts("110")
+        assert fsa.accepts([])
+        assert fsa.final_state([1, 0, 1]) == "S2"
+
+        assert fsa.state == "S0"
+        assert fsa.accept is True
+        assert fsa.fsa == definition
+
+    def test_reset(self) -> None:
+        """Test returning the machine to its start state."""
+        fsa = StateMachine.create_divisibility_checker(2, 3)
+
+        assert not fsa(1, 0, 1).accept
+        assert fsa.state == "S2"
+        assert fsa.reset() is fsa
+        assert fsa.state == "S0"
+        assert fsa.accept
+        assert fsa(1, 1).accept
+
+    def test_accepts_after_partial_input(self) -> None:
+        """Test that accepts() always starts from the start state."""
+        fsa = StateMachine.create_divisibility_checker(2, 3)
+        fsa(1)
+
+        assert fsa.accepts([1, 1])
+        assert fsa.state == "S1"
+
+    def test_accepts_invalid_transition(self) -> None:
+        """Test that accepts() reports undefined transitions."""
+        fsa = StateMachine.create_divisibility_checker(2, 3)
+
+        with pytest.raises(InvalidTransitionError, match="No transition defined"):
+            fsa.accepts([1, 2])
+        assert fsa.state == "S0"
+
     def test_minimized_fsa_processing(self) -> None:
         """Test input processing on minimized FSAs."""
         fsa = StateMachine.create_divisibility_checker(2, 8).minimize()
@@ -68,6 +115,26 @@ class TestStateMachine:
         assert not fsa([1, 1, 1, 0]).accept, "List: 14 mod 8 (base 2)"
         assert not fsa(1)(1)(1)(0).accept, "Multiple calls: 14 mod 8 (base 2)"
 
+    @pytest.mark.parametrize("method", ["hopcroft", "table"])  # type: ignore[misc]
+    def test_minimize_keeps_start_state(self, method: str) -> None:
+        """Test that a merged group keeps its start state, not its lowest name."""
+        fsa = StateMachine(
+            {
+                "S1": {"a": "S0", "start": True, "accept": False},
+                "S0": {"a": "S0", "start": False, "accept": False},
+                "S2": {"b": "S2", "start": False, "accept": True},
+            }
+        )
+        fsa("a")
+
+        fsa.minimize(method)
+
+        assert fsa.is_min
+        assert [name for name, state in fsa.fsa.items() if state["start"]] == ["S0"]
+        assert fsa.state in fsa.fsa
+        assert not fsa.accepts("aa")
+        assert fsa.reset().state == "S0"
+
     def test_wikipedia_minimization_example(self) -> None:
         """Test DFA minimization using the Wikipedia example."""
         pre = {
@@ -114,6 +181,84 @@ class TestStateMachine:
             fsa.minimize() is fsa
         ), "Multiple minimization calls should return same object"
 
+    @pytest.mark.parametrize("seed", range(20))  # type: ignore[misc]
+    def test_hopcroft_matches_table_filling(self, seed: int) -> None:
+        """Test that both minimization algorithms give the same result."""
+        rng = random.Random(seed)
+        num_states = rng.randrange(1, 25)
+        symbols = ["a", "b", "c"][: rng.randrange(1, 4)]
+        definition: dict[str, dict[str, Any]] = {}
+        for i in range(num_states):
+            state: dict[str, Any] = {
+                symbol: f"S{rng.randrange(num_states)}" for symbol in symbols
+            }
+            state.update({"start": i == 0, "accept": rng.random() < 0.4})
+            definition[f"S{i}"] = state
+
+        hopcroft = StateMachine(copy.deepcopy(definition)).minimize()
+        table = StateMachine(copy.deepcopy(definition)).minimize(method="table")
+
+        assert hopcroft.fsa == table.fsa
+        assert hopcroft.is_min
+
+    @pytest.mark.parametrize("base,divisor", [(2, 8), (10, 4), (3, 9)])  # type: ignore[misc]
+    def test_hopcroft_divisibility_checkers(self, base: int, divisor: int) -> None:
+        """Test Hopcroft minimization on divisibility checkers."""
+        hopcroft = StateMachine.create_divisibility_checker(base, divisor).minimize()
+        table = StateMachine.create_divisibility_checker(base, divisor).minimize(
+            method="table"
+        )
+
+        assert hopcroft.fsa == table.fsa
+
+    def test_hopcroft_partial_dfa(self) -> None:
+        """Test that missing transitions aren't merged with explicit ones."""
+        fsa = StateMachine(
+            {
+                "S0": {"a": "S1", "b": "S2", "start": True, "accept": False},
+                "S1": {"a": "S3", "start": False, "accept": True},
+                "S2": {"a": "S3", "b": "S3", "start": False, "accept": True},
+                "S3": {"a": "S3", "b": "S3", "start": False, "accept": False},
+                "S4": {"a": "S3", "start": False, "accept": True},
+            }
+        ).minimize()
+
+        assert len(fsa.fsa) == 4
+        assert fsa.accepts("a")
+        with pytest.raises(InvalidTransitionError):
+            fsa.accepts("ab")
+
+    def test_minimize_errors(self) -> None:
+        """Test minimization failures."""
+        with pytest.raises(MinimizationError, match="Unknown minimization method"):
+            StateMachine.create_divisibility_checker(2, 3).minimize(method="magic")
+
+        nfa = StateMachine(
+            {
+                "S0": {"0": "S0", "1": ["S0", "S1"], "start": True, "accept": False},
+                "S1": {"0": "S1", "1": "S1", "start": False, "accept": True},
+            }
+        )
+        with pytest.raises(MinimizationError, match="non-deterministic"):
+            nfa.minimize()
+
+    @pytest.mark.parametrize("method", ["hopcroft", "table"])  # type: ignore[misc]
+    def test_minimize_rejects_epsilon(self, method: str) -> None:
+        """Test that minimize() asks for determinize() on an epsilon-NFA."""
+        machine = StateMachine(
+            {
+                "S0": {EPSILON: "S1", "a": "S2", "start": True, "accept": False},
+                "S1": {"a": "S1", "start": False, "accept": True},
+                "S2": {"a": "S2", "start": False, "accept": True},
+            }
+        )
+
+        with pytest.raises(MinimizationError, match="determinize"):
+            machine.minimize(method=method)
+
+        assert not machine.is_min
+        assert machine.determinize().minimize(method=method).is_min
+
     def test_state_combination(self) -> None:
         """Test NFA state combination functionality."""
         test_fsa = {
@@ -129,6 +274,144 @@ class TestStateMachine:
         result = fsa.combine_states("S1", "S2")
         assert result == expected_combination, "State combination test"
 
+    def test_nfa_simulation(self) -> None:
+        """Test running an NFA with multiple targets per symbol."""
+        nfa = StateMachine(
+            {
+                "S0": {
+                    "a": ["S0", "S1"],
+                    "b": ["S0", "S2"],
+                    "start": True,
+                    "accept": False,
+                },
+                "S1": {"b": "S3", "start": False, "accept": False},
+                "S2": {"a": "S3", "start": False, "accept": False},
+                "S3": {"a": "S3", "b": "S3", "start": False, "accept": True},
+            }
+        )
+
+        assert not nfa.is_deterministic
+        for word, expected in [
+            ("ab", True),
+            ("ba", True),
+            ("aab", True),
+            ("bba", True),
+            ("aaa", False),
+            ("bbbb", False),
+            ("", False),
+        ]:
+            assert nfa.accepts(word) == expected, word
+
+        assert nfa.final_state("a") == "{S0,S1}"
+        assert nfa.state == "S0"
+
+    def test_nfa_callable_mode(self, simple_nfa: dict[str, dict[str, Any]]) -> None:
+        """Test that __call__ tracks the active state set across calls."""
+        nfa = StateMachine(simple_nfa)
+
+        assert not nfa(0).accept
+        assert nfa.active_states == ["S0"]
+        assert nfa(1).accept
+        assert nfa.state == "{S0,S1}"
+        assert nfa.active_states == ["S0", "S1"]
+        assert nfa(0)(0).accept
+
+        nfa.reset()
+        assert nfa.state == "S0"
+        assert nfa.active_states == ["S0"]
+        assert not nfa.accept
+
+    def test_nfa_dead_paths(self) -> None:
+        """Test that paths without a transition drop out of the active set."""
+        nfa = StateMachine(
+            {
+                "S0": {"a": ["S1", "S2"], "start": True, "accept": False},
+                "S1": {"b": "S1", "start": False, "accept": True},
+                "S2": {"c": "S2", "start": False, "accept": True},
+                "S3": {"d": [], "start": False, "accept": True},
+            }
+        )
+
+        assert nfa.accepts("abb")
+        assert nfa.accepts("acc")
+        assert not nfa.accepts("abc")
+        assert nfa.final_state("abc") == "{}"
+
+        with pytest.raises(InvalidTransitionError, match="No transition defined"):
+            nfa.accepts("ax")
+
+    def test_deterministic_machine_flag(self) -> None:
+        """Test the determinism check."""
+        assert StateMachine.create_divisibility_checker(2, 3).is_deterministic
+        assert StateMachine(
+            {"S0": {"a": ["S0"], "start": True, "accept": True}}
+        ).is_deterministic
+
+    def test_determinize(self) -> None:
+        """Test NFA to DFA conversion with the subset construction."""
+        nfa = StateMachine(
+            {
+                "S0": {
+                    "a": ["S0", "S1"],
+                    "b": ["S0", "S2"],
+                    "start": True,
+                    "accept": False,
+                },
+                "S1": {"b": "S3", "start": False, "accept": False},
+                "S2": {"a": "S3", "start": False, "accept": False},
+                "S3": {"a": "S3", "b": "S3", "start": False, "accept": True},
+            }
+        )
+
+        dfa = nfa.determinize()
+
+        assert dfa.is_deterministic
+        assert dfa.subsets_explored == len(dfa.fsa)
+        for length in range(6):
+            for letters in itertools.product("ab", repeat=length):
+                assert dfa.accepts(letters) == nfa.accepts(letters)
+
+    def test_determinize_empty_subset(
+        self, simple_nfa: dict[str, dict[str, Any]]
+    ) -> None:
+        """Test that symbols leading nowhere go to a sink state."""
+        nfa = StateMachine(
+            {
+                "S0": {"a": ["S0", "S1"], "start": True, "accept": False},
+                "S1": {"b": "S1", "start": False, "accept": True},
+            }
+        )
+
+        dfa = nfa.determinize()
+
+        assert dfa.subsets_explored == 4
+        assert dfa.accepts("abb")
+        assert not dfa.accepts("aba")
+        assert StateMachine(simple_nfa).determinize().minimize().fsa == {
+            "S0": {"0": "S0", "1": "S1", "start": True, "accept": False},
+            "S1": {"0": "S1", "1": "S1", "start": False, "accept": True},
+        }
+
+    def test_determinize_limit(self) -> None:
+        """Test the subset limit that guards against blow-up."""
+        # The classic "n-th symbol from the end is 1" NFA needs 2^n subsets
+        n = 6
+        definition: dict[str, dict[str, Any]] = {
+            "S0": {"0": "S0", "1": ["S0", "S1"], "start": True, "accept": False}
+        }
+        for i in range(1, n):
+            definition[f"S{i}"] = {
+                "0": f"S{i + 1}",
+                "1": f"S{i + 1}",
+                "start": False,
+                "accept": False,
+            }
+        definition[f"S{n}"] = {"start": False, "accept": True}
+
+        assert StateMachine(definition).determinize().subsets_explored == 2**n
+        with pytest.raises(FSAError, match="exceeded 10 states"):
+            StateMachine(definition).determinize(max_states=10)
+
     def test_string_representation(self) -> None:
         """Test string representation of FSAs."""
         fsa = StateMachine.create_divisibility_checker(2, 3)
@@ -278,6 +561,82 @@ class TestStateMachine:
         assert "S3" not in fsa.fsa
         assert len(fsa.fsa) == 3
 
+    def test_unreachable_removal_long_chain(self) -> None:
+        """Test reachability on a long chain, with and without epsilon moves."""
+        size = 20000
+        chain = {
+            f"S{i}": {"a": f"S{i + 1}", "start": i == 0, "accept": False}
+            for i in range(size)
+        }
+        chain[f"S{size}"] = {"start": False, "accept": True}
+        chain["S9999"][EPSILON] = "S0"
+        chain[f"S{size + 1}"] = {"a": "S0", "start": False, "accept": False}
+
+        fsa = StateMachine(chain)
+        fsa.remove_unreachable_states()
+
+        assert len(fsa.fsa) == size + 1
+        assert f"S{size + 1}" not in fsa.fsa
+
+    def test_trim(self) -> None:
+        """Test removing unreachable and dead states."""
+        definition = {
+            "S0": {"a": "S1", "b": "S2", "start": True, "accept": False},
+            "S1": {"a": "S3", "b": "S1", "start": False, "accept": False},
+            "S2": {"a": "S2", "b": "S4", "start": False, "accept": False},
+            "S3": {"a": "S3", "b": "S3", "start": False, "accept": True},
+            "S4": {"a": "S2", "b": "S2", "start": False, "accept": False},
+            "S5": {"a": "S3", "b": "S0", "start": False, "accept": True},
+        }
+
+        trimmed = StateMachine(definition).trim()
+        assert trimmed.fsa == {
+            "S0": {"a": "S1", "start": True, "accept": False},
+            "S1": {"a": "S2", "b": "S1", "start": False, "accept": False},
+            "S2": {"a": "S2", "b": "S2", "start": False, "accept": True},
+        }
+        assert trimmed.accepts("aba")
+        with pytest.raises(InvalidTransitionError):
+            trimmed.accepts("ba")
+
+        # With a sink, every input is answered as before
+        original = StateMachine(definition)
+        sunk = StateMachine(definition).trim(keep_sink=True)
+        assert len(sunk.fsa) == 4
+        assert sunk.fsa["S3"] == {"a": "S3", "b": "S3", "start": False, "accept": False}
+        for length in range(6):
+            for word in itertools.product("ab", repeat=length):
+                assert sunk.accepts(word) == original.accepts(word)
+
+    def test_trim_nfa_and_empty_language(self) -> None:
+        """Test trimming list targets and a start state that is dead."""
+        nfa = StateMachine(
+            {
+                "S0": {"a": ["S0", "S1", "S2"], "start": True, "accept": False},
+                "S1": {"b": "S3", "start": False, "accept": False},
+                "S2": {"b": "S2", "start": False, "accept": False},
+                "S3": {"start": False, "accept": True},
+            }
+        )
+        nfa("a")
+        nfa.trim()
+
+        assert nfa.fsa["S0"]["a"] == ["S0", "S1"]
+        assert "S3" not in nfa.fsa and nfa.active_states == ["S0"]
+        assert nfa.accepts("aab") and not nfa.accepts("aa")
+
+        cycle = {
+            "S0": {"a": "S1", "start": True, "accept": False},
+            "S1": {"a": "S0", "start": False, "accept": False},
+        }
+        assert StateMachine(cycle).trim().fsa == {
+            "S0": {"start": True, "accept": False}
+        }
+        sunk = StateMachine(cycle).trim(keep_sink=True)
+        assert sunk.fsa["S0"] == {"a": "S1", "start": True, "accept": False}
+        assert sunk.fsa["S1"] == {"a": "S1", "start": False, "accept": False}
+        assert not sunk.accepts("aaa")
+
     def test_math_isclose_for_float_tolerances(self) -> None:
         """Test using math.isclose for float comparisons in tests."""
         # This test demonstrates the recommended approach for float comparisons
@@ -304,24 +663,6 @@ class TestStateMachine:
 
 
 # Pytest fixtures for common test data
-@pytest.fixture  # type: ignore[misc]
-def simple_dfa() -> dict[str, dict[str, Any]]:
-    """A simple DFA for testing."""
-    return {
-        "S0": {"0": "S0", "1": "S1", "start": True, "accept": True},
-        "S1": {"0": "S1", "1": "S0", "start": False, "accept": False},
-    }
-
-
-@pytest.fixture  # type: ignore[misc]
-def simple_nfa() -> dict[str, dict[str, Any]]:
-    """A simple NFA for testing."""
-    return {
-        "S0": {"0": "S0", "1": ["S0", "S1"], "start": True, "accept": False},
-        "S1": {"0": "S1", "1": "S1", "start": False, "accept": True},
-    }
-
-
 def test_fixture_usage(simple_dfa: dict[str, dict[str, Any]]) -> None:
     """Test that fixtures work correctly."""
     fsa = StateMachine(simple_dfa)
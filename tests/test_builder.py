@@ -0,0 +1,197 @@
+"""
+Test suite for StateMachineBuilder.
+
+These tests check that automata built by integer id compile to the same
+tables as the equivalent dictionary definitions, and that bad ids and
+conflicting transitions are reported when build() runs.
+"""
+
+import random
+from array import array
+
+import pytest
+
+from python_fsa import EPSILON, StateMachine, StateMachineBuilder
+from python_fsa.exceptions import (
+    FSAError,
+    InvalidFSADefinitionError,
+    InvalidStateError,
+)
+
+
+def divisibility_builder(base: int, divisor: int) -> StateMachineBuilder:
+    """Build a divisibility checker one whole column per digit."""
+    builder = StateMachineBuilder()
+    states = builder.add_states(divisor)
+    builder.set_accept(0)
+    for digit in range(base):
+        builder.add_transitions(
+            str(digit), array("i", [(s * base + digit) % divisor for s in states])
+        )
+    return builder
+
+
+class TestStateMachineBuilder:
+    """Test cases for StateMachineBuilder."""
+
+    @pytest.mark.parametrize(  # type: ignore[misc]
+        "base,divisor", [(2, 3), (10, 7), (10, 4), (16, 100)]
+    )
+    def test_matches_compile(self, base: int, divisor: int) -> None:
+        """Test that bulk columns give the same tables as compile()."""
+        built = divisibility_builder(base, divisor).build()
+        compiled = StateMachine.create_divisibility_checker(base, divisor).compile()
+
+        assert built.states == compiled.states
+        assert built.symbols == compiled.symbols
+        assert built.symbol_classes == compiled.symbol_classes
+        assert bytes(built.transitions) == bytes(compiled.transitions)
+        for state in range(divisor):
+            assert built.is_accepting(state) == compiled.is_accepting(state)
+
+    def test_single_transitions(self) -> None:
+        """Test add_transition() with names, forward references and a start."""
+        builder = StateMachineBuilder()
+        builder.add_transition(0, "a", 1)
+        builder.add_transition(1, "b", 2)
+        builder.add_transition(2, "a", 1)
+        builder.add_transition(2, "b", 0)
+        builder.add_state(name="idle")
+        builder.add_state()
+        builder.add_state(accept=True, name="done")
+        builder.add_state(start=True)
+        builder.add_transition(3, "a", 1)
+        compiled = builder.build()
+
+        assert compiled.states == ("idle", "S1", "done", "S3")
+        assert compiled.start == 3
+        assert compiled.accepts("ab")
+        assert compiled.accepts("abab")
+        assert not compiled.accepts("abb")
+        assert len(builder) == 4
+        assert builder.num_transitions == 5
+
+    def test_sparse_bulk_and_rebuild(self) -> None:
+        """Test explicit sources, and building again after more edges."""
+        builder = StateMachineBuilder()
+        builder.add_states(3)
+        builder.set_accept(2)
+        builder.add_transitions("x", [1, 2], sources=[0, 1])
+        first = builder.build()
+        builder.add_transitions("y", array("i", [0, 0, 0]))
+        second = builder.build()
+
+        assert first.symbols == ("x",)
+        assert first.accepts("xx")
+        assert not first.accepts("x")
+        assert second.accepts("xyxx")
+        assert first.num_classes == 1
+
+    def test_fallbacks_and_classes(self) -> None:
+        """Test that int symbols fall back to strings, as in compile()."""
+        builder = StateMachineBuilder()
+        builder.add_states(2)
+        builder.set_accept(1)
+        builder.add_transitions("1", [1, 1])
+        builder.add_transitions("0", [0, 1])
+        builder.add_transition(0, 1, 0)
+        compiled = builder.build()
+
+        assert compiled.run([1]) == 0
+        assert compiled.run(["1", 1]) == 1
+        assert compiled.run([0]) == 0
+        assert compiled.num_classes == 2
+
+    def test_random_against_definition(self) -> None:
+        """Test random sparse machines against their dict definitions."""
+        rng = random.Random(19)
+        for _ in range(30):
+            size = rng.randrange(1, 15)
+            builder = StateMachineBuilder()
+            builder.add_states(size)
+            fsa: dict = {f"S{i}": {} for i in range(size)}
+            for state in range(size):
+                for symbol in rng.sample("abc", rng.randrange(4)):
+                    target = rng.randrange(size)
+                    builder.add_transition(state, symbol, target)
+                    fsa[f"S{state}"][symbol] = f"S{target}"
+                accept = rng.random() < 0.5
+                builder.set_accept(state, accept)
+                fsa[f"S{state}"].update(start=state == 0, accept=accept)
+
+            built = builder.build()
+            compiled = StateMachine(fsa).compile()
+            for length in range(5):
+                word = "".join(rng.choice("abc") for _ in range(length))
+                try:
+                    expected = compiled.run(word)
+                except FSAError:
+                    with pytest.raises(FSAError):
+                        built.run(word)
+                    continue
+                assert built.state_name(built.run(word)) == compiled.state_name(
+                    expected
+                )
+
+    def test_invalid_ids(self) -> None:
+        """Test that ids are checked when build() runs."""
+        builder = StateMachineBuilder()
+        with pytest.raises(InvalidFSADefinitionError, match="empty"):
+            builder.build()
+
+        builder.add_states(2)
+        builder.add_transition(0, "a", 5)
+        with pytest.raises(InvalidStateError, match="5"):
+            builder.build()
+
+        dense = StateMachineBuilder()
+        dense.add_states(2)
+        dense.add_transitions("a", [0, 1, 0])
+        with pytest.raises(InvalidStateError, match="2"):
+            dense.build()
+
+        with pytest.raises(InvalidStateError):
+            dense.set_accept(7)
+        with pytest.raises(InvalidStateError):
+            dense.set_start(-1)
+
+    @pytest.mark.parametrize(  # type: ignore[misc]
+        "edges",
+        [
+            [("x", [1, 0], None), ("x", [1], [0]), ("x", [1], [1])],
+            [("x", [1], [0]), ("x", [0], [0])],
+            [("x", [1, 0], None), ("x", [0, 0], None)],
+        ],
+    )
+    def test_conflicts(self, edges: list) -> None:
+        """Test that two targets for one state and symbol are rejected."""
+        builder = StateMachineBuilder()
+        builder.add_states(2)
+        for symbol, targets, sources in edges:
+            builder.add_transitions(symbol, targets, sources)
+
+        with pytest.raises(FSAError, match="non-deterministic"):
+            builder.build()
+
+    def test_repeated_transition_is_allowed(self) -> None:
+        """Test that adding the same transition twice is not a conflict."""
+        builder = StateMachineBuilder()
+        builder.add_states(2)
+        builder.add_transitions("x", [1, 0])
+        builder.add_transition(0, "x", 1)
+        builder.add_transition(0, "x", 1)
+
+        assert builder.build().run("xx") == 0
+
+    def test_bad_arguments(self) -> None:
+        """Test epsilon symbols, mismatched lengths and duplicate names."""
+        builder = StateMachineBuilder()
+        builder.add_states(2)
+        with pytest.raises(FSAError, match="epsilon"):
+            builder.add_transition(0, EPSILON, 1)
+        with pytest.raises(FSAError, match="2 sources for 1"):
+            builder.add_transitions("a", [1], sources=[0, 1])
+
+        builder.add_state(name="S0")
+        with pytest.raises(InvalidFSADefinitionError, match="unique"):
+            builder.build()
@@ -0,0 +1,466 @@
+"""
+Test suite for the compiled integer-table automaton.
+
+These tests check that CompiledAutomaton gives the same answers as the
+dictionary-based StateMachine.__call__ path and that it rejects the same
+inputs with the same errors.
+"""
+
+import mmap
+import random
+from typing import Any
+
+import pytest
+
+from python_fsa import CompiledAutomaton, StateMachine
+from python_fsa.exceptions import FSAError, InvalidStateError, InvalidTransitionError
+
+
+class TestCompiledAutomaton:
+    """Test cases for CompiledAutomaton."""
+
+    def test_compile_returns_compiled_automaton(self) -> None:
+        """Test that compile() interns states and symbols densely."""
+        compiled = StateMachine.create_divisibility_checker(2, 3).compile()
+
+        assert isinstance(compiled, CompiledAutomaton)
+        assert compiled.states == ("S0", "S1", "S2")
+        assert compiled.symbols == ("0", "1")
+        assert compiled.start == 0
+        assert compiled.dead == 3
+        assert len(compiled) == 3
+        assert len(compiled.transitions) == (3 + 1) * 2
+
+    @pytest.mark.parametrize("base,divisor", [(2, 3), (2, 8), (3, 4), (10, 7)])  # type: ignore[misc]
+    def test_matches_dict_path(self, base: int, divisor: int) -> None:
+        """Test that compiled results agree with __call__ on random inputs."""
+        rng = random.Random(base * 100 + divisor)
+        compiled = StateMachine.create_divisibility_checker(base, divisor).compile()
+
+        for _ in range(50):
+            digits = [rng.randrange(base) for _ in range(rng.randrange(1, 12))]
+            machine = StateMachine.create_divisibility_checker(base, divisor)
+            machine(*digits)
+
+            final = compiled.run(digits)
+            assert compiled.state_name(final) == machine.state
+            assert compiled.accepts(digits) == machine.accept
+
+    def test_minimized_machine(self) -> None:
+        """Test compiling a minimized machine."""
+        compiled = StateMachine.create_divisibility_checker(2, 8).minimize().compile()
+
+        assert not compiled.accepts([1, 1, 1, 0])
+        assert compiled.accepts([1, 0, 0, 0])
+
+    def test_string_input(self, ends_in_ab: dict[str, dict[str, Any]]) -> None:
+        """Test that strings are processed one character at a time."""
+        compiled = StateMachine(ends_in_ab).compile()
+
+        assert compiled.accepts("ab")
+        assert compiled.accepts("baab")
+        assert not compiled.accepts("ba")
+        assert not compiled.accepts("")
+
+    def test_run_from_given_state(self, ends_in_ab: dict[str, dict[str, Any]]) -> None:
+        """Test starting a run from an explicit state id."""
+        compiled = StateMachine(ends_in_ab).compile()
+        s1 = compiled.state_id("S1")
+
+        assert compiled.state_name(compiled.run("b", start=s1)) == "S2"
+
+    def test_integer_and_string_keys(self) -> None:
+        """Test that non-string inputs fall back to their string form."""
+        compiled = StateMachine(
+            {
+                "S0": {0: "S1", "1": "S0", "start": True, "accept": False},
+                "S1": {"0": "S1", 1: "S0", "start": False, "accept": True},
+            }
+        ).compile()
+
+        assert compiled.accepts([0, 0])
+        assert compiled.accepts(["1", 0, 0])
+        assert not compiled.accepts([0, 1])
+
+    def test_missing_transition(self) -> None:
+        """Test that unknown symbols raise the same error as __call__."""
+        compiled = StateMachine.create_divisibility_checker(2, 3).compile()
+
+        with pytest.raises(InvalidTransitionError, match="No transition defined"):
+            compiled.run([1, 2])
+
+        partial = StateMachine(
+            {
+                "S0": {"a": "S1", "start": True, "accept": False},
+                "S1": {"b": "S0", "start": False, "accept": True},
+            }
+        ).compile()
+        with pytest.raises(InvalidTransitionError) as info:
+            partial.run("aa")
+        assert info.value.from_state == "S1"
+        assert info.value.input_symbol == "a"
+
+    def test_nondeterministic_definition_rejected(self) -> None:
+        """Test that NFAs with multiple targets can't be compiled."""
+        nfa = StateMachine(
+            {
+                "S0": {"0": "S0", "1": ["S0", "S1"], "start": True, "accept": False},
+                "S1": {"0": "S1", "1": "S1", "start": False, "accept": True},
+            }
+        )
+
+        with pytest.raises(FSAError, match="non-deterministic"):
+            nfa.compile()
+
+    def test_single_target_lists(self) -> None:
+        """Test that one-element target lists compile like plain targets."""
+        compiled = StateMachine(
+            {
+                "S0": {"0": ["S1"], "start": True, "accept": False},
+                "S1": {"0": ["S0"], "start": False, "accept": True},
+            }
+        ).compile()
+
+        assert compiled.accepts("0")
+        assert not compiled.accepts("00")
+
+    def test_snapshot_is_immutable(self) -> None:
+        """Test that the compiled tables can't be modified."""
+        machine = StateMachine.create_divisibility_checker(2, 3)
+        compiled = machine.compile()
+
+        with pytest.raises(TypeError):
+            compiled.transitions[0] = 1
+        with pytest.raises(AttributeError):
+            compiled.start = 1  # type: ignore[misc]
+
+        machine.minimize()
+        assert compiled.states == ("S0", "S1", "S2")
+
+    def test_symbol_classes(self) -> None:
+        """Test that symbols with identical columns share one table column."""
+        machine = StateMachine.create_divisibility_checker(10, 5)
+        compiled = machine.compile()
+
+        assert compiled.num_classes == 5
+        assert len(compiled.transitions) == (5 + 1) * 5
+        assert compiled.symbol_classes == (0, 1, 2, 3, 4, 0, 1, 2, 3, 4)
+        assert repr(compiled).endswith("symbols=10, classes=5, start=0)")
+
+        rng = random.Random(5)
+        for _ in range(50):
+            digits = [rng.randrange(10) for _ in range(rng.randrange(1, 12))]
+            assert compiled.accepts(digits) == machine.accepts(digits)
+            assert compiled.accepts("".join(map(str, digits)).encode()) == (
+                digits[-1] % 5 == 0
+            )
+
+    def test_symbol_classes_keep_fallbacks(self) -> None:
+        """Test that keys differing only by their string fallback stay apart."""
+        compiled = StateMachine(
+            {
+                "S0": {0: "S1", "0": "S0", "1": "S0", "start": True, "accept": False},
+                "S1": {0: "S1", "0": "S0", "1": "S0", "start": False, "accept": True},
+            }
+        ).compile()
+
+        assert compiled.num_classes == 2
+        assert compiled.accepts([0])
+        assert not compiled.accepts(["0"])
+        with pytest.raises(InvalidTransitionError):
+            compiled.run("2")
+
+    def test_state_lookup_errors(self) -> None:
+        """Test that invalid state ids and names are reported."""
+        compiled = StateMachine.create_divisibility_checker(2, 3).compile()
+
+        with pytest.raises(InvalidStateError):
+            compiled.state_name(compiled.dead)
+        with pytest.raises(InvalidStateError):
+            compiled.state_id("S9")
+
+
+class TestAcceptsMany:
+    """Test cases for NumPy batch acceptance."""
+
+    def test_matches_single_input_path(self) -> None:
+        """Test that batch results agree with accepts() and run()."""
+        np = pytest.importorskip("numpy")
+        rng = random.Random(7)
+        machine = StateMachine.create_divisibility_checker(10, 7)
+        compiled = machine.compile()
+        sequences = [
+            "".join(str(rng.randrange(10)) for _ in range(rng.randrange(0, 20)))
+            for _ in range(200)
+        ]
+
+        accepted, states = compiled.accepts_many(sequences, return_states=True)
+
+        assert accepted.dtype == np.bool_
+        assert accepted.tolist() == [machine.accepts(s) for s in sequences]
+        assert states.tolist() == [compiled.run(s) for s in sequences]
+
+    def test_state_machine_delegates(self) -> None:
+        """Test StateMachine.accepts_many with list inputs."""
+        pytest.importorskip("numpy")
+        machine = StateMachine.create_divisibility_checker(2, 3)
+
+        result = machine.accepts_many([[1, 1], [1, 0, 1], [1, 1, 0], []])
+
+        assert result.tolist() == [True, False, True, True]
+
+    def test_invalid_sequences_rejected(self) -> None:
+        """Test that undefined transitions are rejected instead of raising."""
+        pytest.importorskip("numpy")
+        compiled = StateMachine.create_divisibility_checker(2, 3).compile()
+
+        accepted, states = compiled.accepts_many(
+            [[1, 1], [1, 2, 1], ["x"], [0]], return_states=True
+        )
+
+        assert accepted.tolist() == [True, False, False, True]
+        assert states.tolist() == [0, compiled.dead, compiled.dead, 0]
+
+    def test_empty_batch(self) -> None:
+        """Test that an empty batch gives empty results."""
+        pytest.importorskip("numpy")
+        compiled = StateMachine.create_divisibility_checker(2, 3).compile()
+
+        assert compiled.accepts_many([]).tolist() == []
+
+
+class TestBinaryInput:
+    """Test cases for running bytes-like objects and mmaps."""
+
+    def test_buffer_types(self, ends_in_ab: dict[str, dict[str, Any]]) -> None:
+        """Test that every buffer type gives the same answer as a string."""
+        compiled = StateMachine(ends_in_ab).compile()
+
+        for text in ["ab", "baab", "ba", "", "abba"]:
+            data = text.encode()
+            expected = compiled.run(text)
+            assert compiled.run(data) == expected
+            assert compiled.run(bytearray(data)) == expected
+            assert compiled.run(memoryview(data)) == expected
+
+    def test_mmap(self, tmp_path: Any) -> None:
+        """Test scanning a memory-mapped file longer than one chunk."""
+        rng = random.Random(1)
+        text = "".join(rng.choice("0123456789") for _ in range(200_000))
+        path = tmp_path / "digits.txt"
+        path.write_text(text)
+        machine = StateMachine.create_divisibility_checker(10, 7)
+
+        with open(path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as m:
+            assert machine.final_state(m) == machine.final_state(text)
+            assert machine.accepts(m) == machine.accepts(text)
+
+    def test_error_in_later_chunk(self) -> None:
+        """Test that a bad byte past the first chunk is reported exactly."""
+        compiled = StateMachine.create_divisibility_checker(2, 3).compile()
+        data = b"1" * 100_000 + b"2" + b"0" * 10
+
+        with pytest.raises(InvalidTransitionError) as info:
+            compiled.run(data)
+        assert info.value.from_state == compiled.state_name(
+            compiled.run(b"1" * 100_000)
+        )
+        assert info.value.input_symbol == "2"
+
+    def test_integer_keys(self) -> None:
+        """Test that bytes map to integer keys when there is no character key."""
+        compiled = StateMachine(
+            {
+                "S0": {0: "S1", 1: "S0", "start": True, "accept": False},
+                "S1": {0: "S1", 1: "S0", "start": False, "accept": True},
+            }
+        ).compile()
+
+        assert compiled.accepts(bytes([1, 0]))
+        assert not compiled.accepts(bytes([0, 1]))
+
+    def test_state_machine_call(self) -> None:
+        """Test that __call__ runs buffers alongside ordinary symbols."""
+        machine = StateMachine.create_divisibility_checker(10, 7)
+
+        machine(1, b"23", [4], bytearray(b"56"))
+
+        assert machine.state == StateMachine.create_divisibility_checker(
+            10, 7
+        ).final_state("123456")
+
+    def test_nondeterministic(self) -> None:
+        """Test that NFAs read buffers through the same byte mapping."""
+        machine = StateMachine(
+            {
+                "S0": {"0": "S0", "1": ["S0", "S1"], "start": True, "accept": False},
+                "S1": {"0": "S1", "1": "S1", "start": False, "accept": True},
+            }
+        )
+
+        assert machine.accepts(b"0010")
+        assert not machine.accepts(memoryview(b"000"))
+        assert machine.stream().feed(b"01").state == "{S0,S1}"
+        with pytest.raises(InvalidTransitionError):
+            machine.accepts(b"012")
+
+
+class TestSaveLoad:
+    """Test cases for saving and loading compiled automata."""
+
+    @pytest.mark.parametrize("memory_map", [True, False])  # type: ignore[misc]
+    def test_round_trip(self, tmp_path: Any, memory_map: bool) -> None:
+        """Test that a loaded automaton gives the same answers."""
+        path = tmp_path / "div.fsa"
+        compiled = StateMachine.create_divisibility_checker(10, 7).compile()
+        compiled.save(path)
+
+        loaded = CompiledAutomaton.load(path, memory_map=memory_map)
+
+        assert loaded.states == compiled.states
+        assert loaded.symbols == compiled.symbols
+        assert loaded.symbol_classes == compiled.symbol_classes
+        assert loaded.start == compiled.start
+        assert bytes(loaded.transitions) == bytes(compiled.transitions)
+        rng = random.Random(13)
+        for _ in range(30):
+            text = "".join(str(rng.randrange(10)) for _ in range(rng.randrange(12)))
+            assert loaded.run(text) == compiled.run(text)
+            assert loaded.accepts(text.encode()) == compiled.accepts(text)
+
+    def test_names_and_errors(
+        self, tmp_path: Any, ends_in_ab: dict[str, dict[str, Any]]
+    ) -> None:
+        """Test state lookups and transition errors on a mapped file."""
+        path = tmp_path / "ab.fsa"
+        StateMachine(ends_in_ab).save(path)
+        loaded = CompiledAutomaton.load(path)
+
+        assert len(loaded) == 3
+        assert loaded.state_name(loaded.run("aab")) == "S2"
+        assert loaded.state_id("S1") == 1
+        with pytest.raises(InvalidTransitionError) as info:
+            loaded.run("abc")
+        assert info.value.from_state == "S2"
+
+    def test_integer_symbols(self, tmp_path: Any) -> None:
+        """Test that integer and string keys keep their types."""
+        path = tmp_path / "mixed.fsa"
+        StateMachine(
+            {
+                "S0": {0: "S1", "1": "S0", "start": True, "accept": False},
+                "S1": {"0": "S1", 1: "S0", "start": False, "accept": True},
+            }
+        ).save(path)
+        loaded = CompiledAutomaton.load(path)
+
+        assert set(loaded.symbols) == {0, "1", "0", 1}
+        assert loaded.accepts([0, 0])
+        assert not loaded.accepts([0, 1])
+
+    def test_overwrite_while_mapped(self, tmp_path: Any) -> None:
+        """Test that saving over a mapped file leaves the old mapping intact."""
+        path = tmp_path / "div.fsa"
+        StateMachine.create_divisibility_checker(2, 3).save(path)
+        old = CompiledAutomaton.load(path)
+
+        StateMachine.create_divisibility_checker(2, 5).save(path)
+
+        assert old.accepts("11") and not old.accepts("101")
+        assert CompiledAutomaton.load(path).accepts("101")
+
+    def test_invalid_files(self, tmp_path: Any) -> None:
+        """Test that foreign, truncated and unsavable inputs are reported."""
+        path = tmp_path / "bad.fsa"
+        path.write_bytes(b"")
+        with pytest.raises(FSAError, match="too short"):
+            CompiledAutomaton.load(path)
+
+        path.write_bytes(b"x" * 64)
+        with pytest.raises(FSAError, match="Not a saved automaton"):
+            CompiledAutomaton.load(path)
+
+        StateMachine.create_divisibility_checker(2, 3).save(path)
+        path.write_bytes(path.read_bytes()[:-1])
+        with pytest.raises(FSAError, match="truncated"):
+            CompiledAutomaton.load(path)
+
+        tuples = StateMachine(
+            {"S0": {("a",): "S0", "start": True, "accept": True}}  # type: ignore[dict-item]
+        )
+        with pytest.raises(FSAError, match="Cannot save symbol"):
+            tuples.save(path)
+
+
+class TestCompactRepresentation:
+    """Test cases for StateMachines held in compiled form."""
+
+    def test_definition_round_trip(self, ends_in_ab: dict[str, dict[str, Any]]) -> None:
+        """Test that to_definition() gives back the compiled definition."""
+        compiled = StateMachine(ends_in_ab).compile()
+
+        assert compiled.to_definition() == ends_in_ab
+        assert StateMachine(compiled.to_definition()).compile().run("abab") == 2
+
+    def test_from_compiled_is_lazy(self) -> None:
+        """Test that the definition is only built when fsa is read."""
+        compiled = StateMachine.create_divisibility_checker(10, 7).compile()
+        machine = StateMachine.from_compiled(compiled)
+
+        assert machine._fsa is None
+        assert machine.state == "S0" and machine.accept
+        assert machine.accepts("49") and not machine.accepts("50")
+        assert machine.final_state("15") == "S1"
+        assert machine(*"14") is machine and machine.accept
+        assert machine.active_states == ["S0"]
+        assert machine.memory_footprint()["definition"] == 0
+        assert machine._fsa is None
+
+        with pytest.raises(InvalidTransitionError):
+            machine.accepts("1x")
+
+        assert machine.fsa == compiled.to_definition()
+        assert machine.memory_footprint()["definition"] > 0
+
+    def test_divisibility_checker_definition(self) -> None:
+        """Test that the divisibility checker still exposes its definition."""
+        machine = StateMachine.create_divisibility_checker(2, 3)
+
+        assert machine.fsa == {
+            "S0": {"0": "S0", "1": "S1", "start": True, "accept": True},
+            "S1": {"0": "S2", "1": "S0", "start": False, "accept": False},
+            "S2": {"0": "S1", "1": "S2", "start": False, "accept": False},
+        }
+        machine.minimize()
+        assert machine.is_min and len(machine.fsa) == 3
+        assert machine.accepts("110") and not machine.accepts("111")
+
+    def test_memory_footprint(self) -> None:
+        """Test that each representation is reported and summed."""
+        machine = StateMachine.create_divisibility_checker(10, 1000)
+        before = machine.memory_footprint()
+        assert before["compiled"] > 0
+        assert before["definition"] == before["nfa"] == before["scanner"] == 0
+
+        _ = machine.fsa
+        after = machine.memory_footprint()
+        assert after["definition"] > after["compiled"]
+        assert after["total"] == sum(v for k, v in after.items() if k != "total")
+
+        parts = machine.compile().memory_footprint()
+        assert parts["table"] >= 1001 * 10 * 4
+        assert parts["byte_tables"] == 0
+        machine.accepts(b"1000")
+        parts = machine.compile().memory_footprint()
+        assert parts["byte_tables"] > 0
+        assert parts["total"] == sum(v for k, v in parts.items() if k != "total")
+
+    def test_slots(self, ends_in_ab: dict[str, dict[str, Any]]) -> None:
+        """Test that StateMachine instances carry no per-instance __dict__."""
+        machine = StateMachine(ends_in_ab)
+
+        assert not hasattr(machine, "__dict__")
+        with pytest.raises(AttributeError):
+            machine.extra = 1  # type: ignore[attr-defined]
@@ -0,0 +1,146 @@
+"""
+Test suite for epsilon transitions.
+
+These tests check that epsilon moves, written with the EPSILON key, are
+followed by simulation, determinization, combine_states and the engines
+built on the bitset NFA, and that closures match a plain graph search.
+"""
+
+import random
+import re
+from itertools import product
+from typing import Any
+
+import pytest
+
+from python_fsa import EPSILON, StateMachine
+from python_fsa.exceptions import FSAError
+from python_fsa.nfa import _closures
+
+
+@pytest.fixture  # type: ignore[misc]
+def ab_star_abb() -> dict[str, dict[str, Any]]:
+    """A Thompson-style epsilon-NFA for (a|b)*abb."""
+    return {
+        "S0": {EPSILON: ["S1", "S7"], "start": True, "accept": False},
+        "S1": {EPSILON: ["S2", "S4"], "start": False, "accept": False},
+        "S2": {"a": "S3", "start": False, "accept": False},
+        "S3": {EPSILON: "S6", "start": False, "accept": False},
+        "S4": {"b": "S5", "start": False, "accept": False},
+        "S5": {EPSILON: "S6", "start": False, "accept": False},
+        "S6": {EPSILON: ["S1", "S7"], "start": False, "accept": False},
+        "S7": {"a": "S8", "start": False, "accept": False},
+        "S8": {"b": "S9", "start": False, "accept": False},
+        "S9": {"b": "S10", "start": False, "accept": False},
+        "S10": {"start": False, "accept": True},
+    }
+
+
+@pytest.fixture  # type: ignore[misc]
+def optional_a() -> dict[str, dict[str, Any]]:
+    """An epsilon-NFA for 'a?' whose start state reaches acceptance freely."""
+    return {
+        "S0": {"a": "S1", EPSILON: "S1", "start": True, "accept": False},
+        "S1": {"start": False, "accept": True},
+    }
+
+
+class TestEpsilonTransitions:
+    """Test cases for epsilon moves in FSA definitions."""
+
+    def test_matches_regex(self, ab_star_abb: dict[str, dict[str, Any]]) -> None:
+        """Test accepts() and determinize() against re on all short strings."""
+        nfa = StateMachine(ab_star_abb)
+        dfa = nfa.determinize()
+
+        assert not nfa.is_deterministic
+        assert dfa.is_deterministic
+        for length in range(8):
+            for letters in product("ab", repeat=length):
+                word = "".join(letters)
+                expected = bool(re.fullmatch("(a|b)*abb", word))
+                assert nfa.accepts(word) == expected, word
+                assert dfa.accepts(word) == expected, word
+
+    def test_start_closure(self, optional_a: dict[str, dict[str, Any]]) -> None:
+        """Test that the start state's closure counts before any input."""
+        machine = StateMachine(optional_a)
+
+        assert machine.accept
+        assert machine.active_states == ["S0", "S1"]
+        assert machine.accepts("")
+        assert machine.accepts("a")
+        machine("a")
+        assert machine.accept and machine.state == "S1"
+        machine.reset()
+        assert machine.accept
+
+    def test_single_target_is_not_deterministic(self) -> None:
+        """Test that an epsilon move with one target still needs the NFA path."""
+        machine = StateMachine(
+            {
+                "S0": {EPSILON: "S1", "start": True, "accept": False},
+                "S1": {"a": "S1", "start": False, "accept": True},
+            }
+        )
+
+        assert not machine.is_deterministic
+        assert machine.accepts("aa")
+        with pytest.raises(FSAError, match="epsilon"):
+            machine.compile()
+        assert machine.determinize().compile().accepts("aa")
+
+    def test_combine_states(self, optional_a: dict[str, dict[str, Any]]) -> None:
+        """Test that combining a state pulls in its epsilon-closure."""
+        combined = StateMachine(optional_a).combine_states("S0")
+
+        assert combined == {
+            "{S0,S1}": {"a": "S1", "start": True, "accept": True},
+        }
+
+    def test_search_lazy_and_stream(
+        self, ab_star_abb: dict[str, dict[str, Any]]
+    ) -> None:
+        """Test the engines built on the bitset NFA."""
+        machine = StateMachine(ab_star_abb)
+
+        assert machine.scan("babbaabb") == [4, 8]
+        assert machine.lazy().accepts("aabb")
+        cursor = machine.stream().feed("ab")
+        assert not cursor.accepting
+        assert cursor.feed("b").accepting
+
+    def test_arrows_and_graph(self, optional_a: dict[str, dict[str, Any]]) -> None:
+        """Test that epsilon moves keep their own, labelled arrow."""
+        machine = StateMachine(optional_a)
+
+        assert machine.minimize_arrows()["S0"] == {
+            "a": "S1",
+            EPSILON: "S1",
+            "start": True,
+            "accept": False,
+        }
+        assert "ε" in machine.create_graph().source
+
+    def test_closures_match_search(self) -> None:
+        """Test SCC-condensed closures against a search from every state."""
+        rng = random.Random(17)
+        for _ in range(50):
+            size = rng.randrange(1, 12)
+            epsilon = [0] * size
+            for state in range(size):
+                for target in rng.sample(range(size), rng.randrange(min(size, 3))):
+                    epsilon[state] |= 1 << target
+
+            expected = []
+            for state in range(size):
+                seen, stack = {state}, [state]
+                while stack:
+                    current = stack.pop()
+                    for target in range(size):
+                        if epsilon[current] >> target & 1 and target not in seen:
+                            seen.add(target)
+                            stack.append(target)
+                expected.append(sum(1 << s for s in seen))
+
+            assert _closures(epsilon) == expected
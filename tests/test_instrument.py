@@ -0,0 +1,145 @@
+"""
+Test suite for StateMachine instrumentation.
+
+These tests check that an instrumented machine gives the same answers as
+an uninstrumented one while counting transitions, state visits, missing
+transitions and the phases of minimize().
+"""
+
+import mmap
+from typing import Any
+
+import pytest
+
+from python_fsa import Instrumentation, StateMachine
+from python_fsa.exceptions import InvalidTransitionError
+
+
+class TestInstrumentation:
+    """Test cases for StateMachine.instrument()."""
+
+    def test_counts_transitions_and_visits(
+        self, ends_in_ab: dict[str, dict[str, Any]]
+    ) -> None:
+        """Test that every step of a deterministic run is recorded."""
+        machine = StateMachine(ends_in_ab)
+        counters = machine.instrument()
+
+        assert machine.accepts("aab")
+        assert machine.final_state("b") == "S0"
+        machine("a", ["b", "b"])
+
+        assert counters.transitions == 7
+        assert counters.visits == {"S1": 3, "S2": 2, "S0": 2}
+        assert machine.state == "S0" and not machine.accept
+
+    def test_binary_input(
+        self, ends_in_ab: dict[str, dict[str, Any]], tmp_path: Any
+    ) -> None:
+        """Test that buffers are recorded a byte at a time."""
+        machine = StateMachine(ends_in_ab)
+        counters = machine.instrument()
+
+        assert machine.accepts(b"abab")
+        assert not machine.accepts(memoryview(b"aba"))
+        path = tmp_path / "input"
+        path.write_bytes(b"bab")
+        with open(path, "rb") as file, mmap.mmap(
+            file.fileno(), 0, access=mmap.ACCESS_READ
+        ) as data:
+            assert machine.accepts(data)
+
+        assert counters.transitions == 10
+        assert counters.visits["S2"] == 4
+
+    def test_compiled_machine(self) -> None:
+        """Test that a machine held in compiled form is recorded too."""
+        machine = StateMachine.create_divisibility_checker(10, 7)
+        counters = machine.instrument()
+
+        assert machine.accepts("49")
+        assert counters.transitions == 2
+        assert counters.visits == {"S4": 1, "S0": 1}
+
+    def test_nondeterministic(self) -> None:
+        """Test that every active state of an NFA run gets a visit."""
+        machine = StateMachine(
+            {
+                "S0": {"a": ["S0", "S1"], "start": True, "accept": False},
+                "S1": {"b": "S0", "start": False, "accept": True},
+            }
+        )
+        counters = machine.instrument()
+
+        machine("a", "a", "b")
+
+        assert machine.active_states == ["S0"]
+        assert counters.transitions == 3
+        assert counters.visits == {"S0": 3, "S1": 2}
+
+    def test_missing_transition(self, ends_in_ab: dict[str, dict[str, Any]]) -> None:
+        """Test that a missing transition is counted and still raised."""
+        machine = StateMachine(ends_in_ab)
+        counters = machine.instrument()
+
+        with pytest.raises(InvalidTransitionError):
+            machine.accepts("abx")
+        with pytest.raises(InvalidTransitionError):
+            machine.accepts(b"x")
+
+        assert counters.missing_transitions == 2
+        assert counters.transitions == 2
+        assert machine.instrumentation is counters
+
+    @pytest.mark.parametrize(  # type: ignore[misc]
+        "method,search", [("hopcroft", "partition"), ("table", "table_fill")]
+    )
+    def test_minimize_phases(self, method: str, search: str) -> None:
+        """Test that each phase of minimize() is timed."""
+        machine = StateMachine.create_divisibility_checker(2, 6)
+        counters = machine.instrument()
+
+        machine.minimize(method=method)
+
+        phases = counters.as_dict()["phases"]
+        assert set(phases) == {"remove_unreachable", "normalize", search, "merge"}
+        assert phases["normalize"]["calls"] == 2
+        assert all(phase["seconds"] >= 0 for phase in phases.values())
+
+    def test_shared_export_and_reset(
+        self, ends_in_ab: dict[str, dict[str, Any]]
+    ) -> None:
+        """Test sharing counters between machines, exporting and resetting."""
+        counters = Instrumentation()
+        first = StateMachine(ends_in_ab)
+        second = StateMachine(ends_in_ab)
+        assert first.instrument(counters) is counters
+        second.instrument(counters)
+
+        first.accepts("ab")
+        second.accepts("b")
+
+        assert counters.as_dict() == {
+            "transitions": 3,
+            "missing_transitions": 0,
+            "visits": {"S1": 1, "S2": 1, "S0": 1},
+            "phases": {},
+        }
+        assert "transitions=3" in repr(counters)
+
+        counters.reset()
+        assert counters.as_dict()["transitions"] == 0
+        assert not counters.visits
+
+    def test_uninstrument(self, ends_in_ab: dict[str, dict[str, Any]]) -> None:
+        """Test that an uninstrumented machine stops recording."""
+        machine = StateMachine(ends_in_ab)
+        assert machine.uninstrument() is None
+
+        counters = machine.instrument()
+        assert machine.uninstrument() is counters
+        assert machine.instrumentation is None
+
+        assert machine.accepts("ab")
+        machine.minimize()
+        assert counters.transitions == 0 and not counters.phases
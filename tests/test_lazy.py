@@ -0,0 +1,156 @@
+"""
+Test suite for lazy on-the-fly determinization.
+
+These tests check that LazyDFA gives the same answers as simulating the
+NFA directly, whatever the cache size and eviction policy, and that its
+counters reflect what the cache did.
+"""
+
+import random
+from typing import Any
+
+import pytest
+
+from python_fsa import LazyDFA, StateMachine
+from python_fsa.exceptions import FSAError, InvalidTransitionError
+
+
+def nth_from_end(n: int) -> dict[str, dict[str, Any]]:
+    """An NFA accepting strings over {a, b} whose n-th symbol from the end is 'a'."""
+    fsa: dict[str, dict[str, Any]] = {
+        "Q0": {"a": ["Q0", "Q1"], "b": "Q0", "start": True, "accept": False}
+    }
+    for i in range(1, n):
+        fsa[f"Q{i}"] = {"a": f"Q{i + 1}", "b": f"Q{i + 1}"}
+        fsa[f"Q{i}"].update({"start": False, "accept": False})
+    fsa[f"Q{n}"] = {"start": False, "accept": True}
+    return fsa
+
+
+class TestLazyDFA:
+    """Test cases for LazyDFA."""
+
+    def test_matches_nfa_simulation(self) -> None:
+        """Test that lazy results agree with accepts() on random inputs."""
+        rng = random.Random(5)
+        machine = StateMachine(nth_from_end(4))
+        lazy = machine.lazy()
+
+        assert isinstance(lazy, LazyDFA)
+        for _ in range(200):
+            word = "".join(rng.choice("ab") for _ in range(rng.randrange(0, 15)))
+            assert lazy.accepts(word) == machine.accepts(word)
+            assert lazy.final_state(word) == machine.final_state(word)
+
+    def test_states_created_on_demand(self) -> None:
+        """Test that only subsets reached by the input are cached."""
+        lazy = StateMachine(nth_from_end(10)).lazy()
+
+        assert lazy.cached_states == 0
+        assert not lazy.accepts("b" * 100)
+        assert lazy.cached_states == 1
+        assert lazy.stats() == {
+            "hits": 99,
+            "misses": 1,
+            "evictions": 0,
+            "fallbacks": 0,
+            "cached_states": 1,
+        }
+
+    def test_cache_reused_across_runs(self) -> None:
+        """Test that edges computed by one run are hits in the next."""
+        lazy = StateMachine(nth_from_end(3)).lazy()
+
+        lazy.accepts("abab")
+        misses = lazy.misses
+        lazy.accepts("abab")
+
+        assert lazy.misses == misses
+        assert lazy.hits >= 4
+
+    @pytest.mark.parametrize("policy", ["flush", "lru"])  # type: ignore[misc]
+    def test_eviction_keeps_results_correct(self, policy: str) -> None:
+        """Test that a small cache evicts states without changing answers."""
+        rng = random.Random(11)
+        machine = StateMachine(nth_from_end(6))
+        lazy = machine.lazy(max_states=8, policy=policy, min_progress=0)
+
+        for _ in range(100):
+            word = "".join(rng.choice("ab") for _ in range(rng.randrange(0, 30)))
+            assert lazy.accepts(word) == machine.accepts(word)
+
+        assert lazy.evictions > 0
+        assert lazy.fallbacks == 0
+        assert lazy.cached_states <= 8
+
+    def test_lru_keeps_recent_states(self) -> None:
+        """Test that LRU eviction only drops part of the cache."""
+        lazy = StateMachine(nth_from_end(6)).lazy(
+            max_states=8, policy="lru", min_progress=0
+        )
+
+        lazy.run("ab" * 20 + "aabbbabaab")
+
+        assert lazy.evictions > 0
+        assert 4 <= lazy.cached_states <= 8
+
+    def test_thrashing_falls_back_to_nfa(self) -> None:
+        """Test that evictions with little progress switch to NFA simulation."""
+        rng = random.Random(3)
+        machine = StateMachine(nth_from_end(8))
+        lazy = machine.lazy(max_states=4)
+        word = "".join(rng.choice("ab") for _ in range(200))
+
+        assert lazy.accepts(word) == machine.accepts(word)
+        assert lazy.fallbacks == 1
+
+    def test_deterministic_machine(self) -> None:
+        """Test that a DFA runs with integer inputs through their string keys."""
+        machine = StateMachine.create_divisibility_checker(2, 3)
+        lazy = machine.lazy()
+
+        assert lazy.accepts([1, 1])
+        assert not lazy.accepts([1, 0, 0])
+        assert lazy.final_state([1, 0]) == "S2"
+
+    def test_dead_paths(self) -> None:
+        """Test that inputs leaving every path reject rather than raise."""
+        lazy = StateMachine(
+            {
+                "S0": {"a": "S1", "start": True, "accept": False},
+                "S1": {"b": "S0", "start": False, "accept": True},
+            }
+        ).lazy()
+
+        assert lazy.final_state("aa") == "{}"
+        assert not lazy.accepts("aab")
+
+    def test_missing_transition(self) -> None:
+        """Test that symbols unknown to every state raise."""
+        lazy = StateMachine(nth_from_end(2)).lazy()
+
+        with pytest.raises(InvalidTransitionError, match="No transition defined"):
+            lazy.run("abc")
+
+    def test_invalid_configuration(self) -> None:
+        """Test that bad cache settings are rejected."""
+        machine = StateMachine(nth_from_end(2))
+
+        with pytest.raises(FSAError, match="Unknown eviction policy"):
+            machine.lazy(policy="random")
+        with pytest.raises(FSAError, match="at least 2"):
+            machine.lazy(max_states=1)
+
+    def test_clear(self) -> None:
+        """Test that clear() empties the cache and counters."""
+        lazy = StateMachine(nth_from_end(3)).lazy()
+        lazy.run("abba")
+
+        lazy.clear()
+
+        assert lazy.stats() == dict.fromkeys(
+            ["hits", "misses", "evictions", "fallbacks", "cached_states"], 0
+        )
+        assert (
+            repr(lazy) == "LazyDFA(cached_states=0, max_states=10000, policy='flush')"
+        )
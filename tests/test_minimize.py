@@ -0,0 +1,165 @@
+"""
+Test suite for incremental re-minimization.
+
+These tests check that edits to a minimized StateMachine leave it with the
+same number of states and the same language as minimizing the edited
+definition from scratch, and that edits to other machines are applied
+as given.
+"""
+
+import copy
+import random
+from typing import Any
+
+import pytest
+
+from python_fsa import StateMachine
+from python_fsa.exceptions import FSAError, InvalidStateError, InvalidTransitionError
+
+
+def random_definition(rng: random.Random, size: int) -> dict[str, Any]:
+    """Build a random partial DFA over {0, 1, 2}."""
+    definition: dict[str, Any] = {}
+    for i in range(size):
+        state: dict[str, Any] = {
+            str(c): f"S{rng.randrange(size)}" for c in range(3) if rng.random() < 0.9
+        }
+        state.update({"start": i == 0, "accept": rng.random() < 0.4})
+        definition[f"S{i}"] = state
+    return definition
+
+
+def assert_minimal(machine: StateMachine) -> None:
+    """Check a machine against minimizing its definition from scratch."""
+    reference = StateMachine(copy.deepcopy(machine.fsa)).minimize()
+    assert machine.is_min
+    assert len(machine.fsa) == len(reference.fsa)
+    assert machine.equivalent(reference)
+
+
+class TestIncrementalMinimization:
+    """Test cases for edits to minimized machines."""
+
+    def test_edit_merges_states(self) -> None:
+        """Test that states made equivalent by an edit are merged."""
+        machine = StateMachine(
+            {
+                "S0": {"a": "S1", "b": "S2", "start": True, "accept": False},
+                "S1": {"a": "S3", "start": False, "accept": False},
+                "S2": {"a": "S4", "start": False, "accept": False},
+                "S3": {"start": False, "accept": True},
+                "S4": {"start": False, "accept": False},
+            }
+        ).minimize()
+        assert len(machine.fsa) == 5
+
+        machine.set_accept("S4")
+
+        assert machine.fsa == {
+            "S0": {"a": "S1", "b": "S1", "start": True, "accept": False},
+            "S1": {"a": "S3", "start": False, "accept": False},
+            "S3": {"start": False, "accept": True},
+        }
+        assert machine.accepts("ba")
+        assert_minimal(machine)
+
+    def test_edit_splits_language(self) -> None:
+        """Test an edit that gives a merged state a language of its own."""
+        machine = StateMachine.create_divisibility_checker(2, 4).minimize()
+        assert len(machine.fsa) == 3
+
+        machine.add_transition("S2", "1", "S2")
+        assert_minimal(machine)
+
+        machine.set_accept("S0", False)
+        assert not machine.accepts("100")
+        assert_minimal(machine)
+
+    def test_remove_transition_drops_unreachable(self) -> None:
+        """Test that states only reached through a removed edge go away."""
+        machine = StateMachine(
+            {
+                "S0": {"a": "S1", "b": "S0", "start": True, "accept": True},
+                "S1": {"a": "S2", "start": False, "accept": False},
+                "S2": {"a": "S0", "start": False, "accept": False},
+            }
+        ).minimize()
+        machine("a", "a")
+        assert machine.state == "S2"
+
+        machine.remove_transition("S0", "a")
+
+        assert list(machine.fsa) == ["S0"]
+        assert machine.state == "S0" and machine.accept
+        with pytest.raises(InvalidTransitionError):
+            machine.accepts("a")
+
+    def test_current_state_follows_merge(self) -> None:
+        """Test that a run in progress stays in an equivalent state."""
+        machine = StateMachine(
+            {
+                "S0": {"a": "S1", "b": "S2", "start": True, "accept": False},
+                "S1": {"a": "S1", "start": False, "accept": True},
+                "S2": {"a": "S0", "start": False, "accept": True},
+            }
+        ).minimize()
+        machine("b")
+        assert machine.state == "S2"
+
+        machine.add_transition("S2", "a", "S2")
+
+        assert machine.state == "S1" and machine.accept
+        assert_minimal(machine)
+
+    @pytest.mark.parametrize("seed", range(40))  # type: ignore[misc]
+    def test_random_edits(self, seed: int) -> None:
+        """Test random edits against minimizing from scratch."""
+        rng = random.Random(seed)
+        machine = StateMachine(random_definition(rng, rng.randint(1, 30))).minimize()
+
+        for _ in range(10):
+            names = list(machine.fsa)
+            state = rng.choice(names)
+            moves = [
+                key for key in machine.fsa[state] if key not in ("start", "accept")
+            ]
+            choice = rng.random()
+            if choice < 0.5:
+                machine.add_transition(state, str(rng.randrange(3)), rng.choice(names))
+            elif choice < 0.75 and moves:
+                machine.remove_transition(state, rng.choice(moves))
+            else:
+                machine.set_accept(state, not machine.fsa[state]["accept"])
+            assert_minimal(machine)
+
+    def test_plain_edits(self) -> None:
+        """Test that edits to machines that aren't minimized are kept as given."""
+        machine = StateMachine.create_divisibility_checker(2, 4)
+        machine.add_transition("S3", "1", "S0").set_accept("S2")
+        machine.remove_transition("S1", 0)
+
+        assert not machine.is_min
+        assert len(machine.fsa) == 4
+        assert machine.fsa["S3"]["1"] == "S0" and "0" not in machine.fsa["S1"]
+        assert machine.accepts("110") and machine.accepts("111")
+
+        machine.minimize().add_transition("S0", "", "S1")
+        assert not machine.is_min and not machine.is_deterministic
+
+    def test_invalid_edits(self) -> None:
+        """Test that edits naming missing states or transitions are rejected."""
+        machine = StateMachine.create_divisibility_checker(2, 3).minimize()
+
+        with pytest.raises(InvalidStateError):
+            machine.add_transition("S9", "0", "S0")
+        with pytest.raises(InvalidStateError):
+            machine.add_transition("S0", "0", "S9")
+        with pytest.raises(InvalidStateError):
+            machine.set_accept("S9")
+        with pytest.raises(FSAError, match="reserved"):
+            machine.add_transition("S0", "accept", "S1")
+        with pytest.raises(InvalidTransitionError):
+            machine.remove_transition("S0", "2")
+        with pytest.raises(InvalidTransitionError):
+            machine.remove_transition("S0", "start")
+        assert machine.is_min and len(machine.fsa) == 3
@@ -0,0 +1,75 @@
+"""
+Test suite for parallel runs of one large input.
+
+These tests force small chunks so that the process pool, the chunk
+mappings and their composition are exercised on small inputs, and check
+the results against a sequential run.
+"""
+
+import random
+from pathlib import Path
+
+import pytest
+
+from python_fsa import StateMachine, run_parallel
+from python_fsa.exceptions import InvalidTransitionError
+
+
+def random_digits(base: int, length: int, seed: int = 0) -> bytes:
+    """Random digits in a base, encoded as ASCII."""
+    rng = random.Random(seed)
+    return "".join(str(rng.randrange(base)) for _ in range(length)).encode()
+
+
+class TestRunParallel:
+    """Test cases for run_parallel and StateMachine.accepts_parallel."""
+
+    @pytest.mark.parametrize(  # type: ignore[misc]
+        "base,divisor", [(10, 1000), (2, 64), (2, 3), (10, 7)]
+    )
+    def test_matches_sequential_run(self, base: int, divisor: int) -> None:
+        """Test converging and permuting DFAs against a sequential run."""
+        compiled = StateMachine.create_divisibility_checker(base, divisor).compile()
+        data = random_digits(base, 20_000, seed=divisor)
+
+        result = run_parallel(compiled, data, workers=2, chunk_size=3_000, lookback=16)
+
+        assert result == compiled.run(data)
+
+    def test_file_path(self, tmp_path: Path) -> None:
+        """Test that workers can map the file themselves."""
+        path = tmp_path / "digits.txt"
+        data = random_digits(10, 50_000)
+        path.write_bytes(data)
+        compiled = StateMachine.create_divisibility_checker(10, 100).compile()
+
+        assert run_parallel(compiled, path, workers=3, chunk_size=7_000) == (
+            compiled.run(data)
+        )
+
+    def test_empty_file(self, tmp_path: Path) -> None:
+        """Test that an empty file ends in the start state."""
+        path = tmp_path / "empty.txt"
+        path.write_bytes(b"")
+        machine = StateMachine.create_divisibility_checker(2, 3)
+
+        assert machine.accepts_parallel(path, workers=2)
+
+    def test_invalid_byte_reported(self) -> None:
+        """Test that a bad byte in a later chunk raises the usual error."""
+        compiled = StateMachine.create_divisibility_checker(2, 4).compile()
+        data = bytearray(random_digits(2, 10_000))
+        data[7_500] = ord("x")
+
+        with pytest.raises(InvalidTransitionError) as info:
+            run_parallel(compiled, data, workers=2, chunk_size=2_000)
+        assert info.value.input_symbol == "x"
+
+    def test_accepts_parallel(self) -> None:
+        """Test the StateMachine wrapper, in and out of process."""
+        machine = StateMachine.create_divisibility_checker(10, 1000)
+        data = random_digits(10, 9_997) + b"000"
+
+        assert machine.accepts_parallel(data)
+        assert machine.accepts_parallel(data, workers=2, chunk_size=1_000)
+        assert not machine.accepts_parallel(data + b"1", workers=2, chunk_size=1_000)
@@ -0,0 +1,197 @@
+"""
+Test suite for boolean operations on automata.
+
+These tests compare products built with the &, |, - and ^ operators against
+running both operands on every short input over their combined alphabet.
+"""
+
+import random
+from itertools import product as words
+from typing import Any, Callable, Optional
+
+import pytest
+
+from python_fsa import StateMachine
+from python_fsa.exceptions import FSAError, InvalidTransitionError
+from python_fsa.product import product
+
+OPERATIONS: dict[str, Callable[[bool, bool], bool]] = {
+    "&": lambda x, y: x and y,
+    "|": lambda x, y: x or y,
+    "-": lambda x, y: x and not y,
+    "^": lambda x, y: x != y,
+}
+
+
+def accepts(machine: StateMachine, word: str) -> bool:
+    """Check a word, treating a missing transition as a rejection."""
+    try:
+        return machine.accepts(word)
+    except InvalidTransitionError:
+        return False
+
+
+def random_dfa(rng: random.Random, size: int) -> StateMachine:
+    """Build a random partial DFA over {a, b}."""
+    fsa: dict[str, dict[str, Any]] = {}
+    for i in range(size):
+        state: dict[str, Any] = {"start": i == 0, "accept": rng.random() < 0.4}
+        for symbol in "ab":
+            if rng.random() < 0.85:
+                state[symbol] = f"S{rng.randrange(size)}"
+        fsa[f"S{i}"] = state
+    return StateMachine(fsa)
+
+
+def shortest_word(
+    test: Callable[[str], bool], alphabet: str = "ab", limit: int = 10
+) -> Optional[str]:
+    """Find the shortest word up to a length that passes a test."""
+    for length in range(limit + 1):
+        for letters in words(alphabet, repeat=length):
+            if test("".join(letters)):
+                return "".join(letters)
+    return None
+
+
+@pytest.fixture  # type: ignore[misc]
+def ends_in_ab(ends_in_ab: dict[str, dict[str, Any]]) -> StateMachine:
+    """The shared DFA for strings that end in 'ab', as a StateMachine."""
+    return StateMachine(ends_in_ab)
+
+
+@pytest.fixture  # type: ignore[misc]
+def even_cs() -> StateMachine:
+    """An NFA over {a, c} accepting strings with an even number of 'c's."""
+    return StateMachine(
+        {
+            "S0": {"a": ["S0"], "c": ["S1", "S2"], "start": True, "accept": True},
+            "S1": {"a": "S1", "c": "S0", "start": False, "accept": False},
+            "S2": {"start": False, "accept": False},
+        }
+    )
+
+
+class TestProduct:
+    """Test cases for intersection, union, difference and symmetric difference."""
+
+    @pytest.mark.parametrize("op", list(OPERATIONS))  # type: ignore[misc]
+    def test_matches_operands(
+        self, op: str, ends_in_ab: StateMachine, even_cs: StateMachine
+    ) -> None:
+        """Test every operation against both operands on all short words."""
+        combined = {
+            "&": ends_in_ab & even_cs,
+            "|": ends_in_ab | even_cs,
+            "-": ends_in_ab - even_cs,
+            "^": ends_in_ab ^ even_cs,
+        }[op]
+
+        for length in range(7):
+            for letters in words("abc", repeat=length):
+                word = "".join(letters)
+                expected = OPERATIONS[op](
+                    accepts(ends_in_ab, word), accepts(even_cs, word)
+                )
+                assert accepts(combined, word) == expected, word
+
+    def test_named_methods_and_minimize(self) -> None:
+        """Test the named methods and minimizing the result."""
+        by_2 = StateMachine.create_divisibility_checker(10, 2)
+        by_5 = StateMachine.create_divisibility_checker(10, 5)
+
+        both = by_2.intersection(by_5)
+        small = by_2.intersection(by_5, minimize=True)
+
+        assert both.pairs_explored == len(both.fsa)
+        assert len(small.fsa) < len(both.fsa)
+        for n in range(200):
+            assert small.accepts(str(n)) == (n % 10 == 0)
+        assert by_2.union(by_5).accepts("5")
+        assert by_2.difference(by_5).accepts("4")
+        assert not by_2.symmetric_difference(by_5).accepts("10")
+
+    def test_only_reachable_pairs(self) -> None:
+        """Test that unreachable pairs of the full cross product are skipped."""
+        by_3 = StateMachine.create_divisibility_checker(2, 3)
+        by_9 = StateMachine.create_divisibility_checker(2, 9)
+
+        # Residues mod 9 determine residues mod 3, so only 9 of 27 pairs occur
+        assert (by_3 & by_9).pairs_explored == 9
+
+    def test_operands_unchanged(self, ends_in_ab: StateMachine) -> None:
+        """Test that building a product leaves the operands as they were."""
+        before = dict(ends_in_ab.fsa)
+        ends_in_ab("a")
+
+        result = ends_in_ab | StateMachine.create_divisibility_checker(2, 3)
+
+        assert ends_in_ab.fsa == before
+        assert ends_in_ab.state == "S1"
+        assert result.state == "S0"
+
+    def test_errors(self, ends_in_ab: StateMachine) -> None:
+        """Test unsupported operands and operations."""
+        other: Any = 1
+        with pytest.raises(TypeError):
+            ends_in_ab & other
+
+        compiled = ends_in_ab.compile()
+        with pytest.raises(FSAError, match="Unknown product operation"):
+            product(compiled, compiled, "implication")
+
+
+class TestLanguageComparison:
+    """Test cases for equivalent(), included_in() and counterexample()."""
+
+    def test_random_machines(self) -> None:
+        """Test counterexamples against a brute-force search on random DFAs."""
+        rng = random.Random(15)
+        for _ in range(100):
+            self.check_pair(
+                random_dfa(rng, rng.randrange(1, 5)),
+                random_dfa(rng, rng.randrange(1, 5)),
+            )
+
+    def check_pair(self, a: StateMachine, b: StateMachine) -> None:
+        """Compare both kinds of counterexample with the shortest words found."""
+        differs = shortest_word(lambda w: accepts(a, w) != accepts(b, w))
+        found = a.counterexample(b)
+        assert a.equivalent(b) == (differs is None)
+        assert (found is None) == (differs is None)
+        if found is not None and differs is not None:
+            word = "".join(map(str, found))
+            assert accepts(a, word) != accepts(b, word)
+            assert len(word) == len(differs)
+
+        escapes = shortest_word(lambda w: accepts(a, w) and not accepts(b, w))
+        found = a.counterexample(b, inclusion=True)
+        assert a.included_in(b) == (escapes is None)
+        assert (found is None) == (escapes is None)
+        if found is not None and escapes is not None:
+            word = "".join(map(str, found))
+            assert accepts(a, word) and not accepts(b, word)
+            assert len(word) == len(escapes)
+
+    def test_without_minimizing(self) -> None:
+        """Test that differently sized machines for one language are equivalent."""
+        full = StateMachine.create_divisibility_checker(2, 6)
+        small = StateMachine.create_divisibility_checker(2, 6).minimize()
+
+        assert len(small.fsa) < len(full.fsa)
+        assert full.equivalent(small)
+        assert not full.is_min
+        assert full.counterexample(small) is None
+
+    def test_nfa_and_inclusion(
+        self, ends_in_ab: StateMachine, even_cs: StateMachine
+    ) -> None:
+        """Test an NFA operand and inclusion of a product in its operands."""
+        both = ends_in_ab & even_cs
+
+        assert both.included_in(ends_in_ab)
+        assert both.included_in(even_cs)
+        assert not ends_in_ab.included_in(both)
+        assert ends_in_ab.counterexample(both, inclusion=True) == ["a", "b"]
+        assert (ends_in_ab | even_cs).counterexample(even_cs) == ["a", "b"]
+        assert even_cs.counterexample(ends_in_ab) == []
@@ -0,0 +1,101 @@
+"""
+Test suite for building automata from regular expressions.
+
+These tests compare StateMachine.from_regex() against Python's re module
+on every short string over a small alphabet.
+"""
+
+import re
+from itertools import product
+from typing import Any
+
+import pytest
+
+from python_fsa import StateMachine
+from python_fsa.automaton import _regex_dfa
+from python_fsa.exceptions import InvalidTransitionError, RegexSyntaxError
+
+ALPHABET = "abcx0-]."
+
+
+def accepts(machine: StateMachine, word: str) -> bool:
+    """Check a word, treating a missing transition as a rejection."""
+    try:
+        return machine.accepts(word)
+    except InvalidTransitionError:
+        return False
+
+
+class TestFromRegex:
+    """Test cases for StateMachine.from_regex."""
+
+    @pytest.mark.parametrize(  # type: ignore[misc]
+        "pattern",
+        [
+            "(a|b)*ab",
+            "a+b?c*",
+            "(ab|a)*b",
+            "a|",
+            "",
+            "()*x",
+            "[a-c]x|0",
+            "[^ab]+",
+            "[]a]*",
+            "[a-]+",
+            r"\d+\.\d*",
+            r"[\d.]+",
+            ".a.",
+            "(a*)*",
+            "a??",
+        ],
+    )
+    def test_matches_re(self, pattern: str) -> None:
+        """Test a pattern against re.fullmatch on all short strings."""
+        machine = StateMachine.from_regex(pattern, alphabet=ALPHABET)
+        expected = re.compile(pattern)
+
+        for length in range(6):
+            for letters in product(ALPHABET, repeat=length):
+                word = "".join(letters)
+                assert accepts(machine, word) == bool(expected.fullmatch(word)), word
+
+    def test_minimal_result(self, ends_in_ab: dict[str, dict[str, Any]]) -> None:
+        """Test that the result is the minimal DFA for the README example."""
+        machine = StateMachine.from_regex("(a|b)*ab")
+
+        assert machine.is_min
+        assert len(machine.fsa) == 3
+        assert machine.equivalent(StateMachine(ends_in_ab))
+
+    def test_cached(self) -> None:
+        """Test that repeated patterns reuse the cached DFA but not the machine."""
+        _regex_dfa.cache_clear()
+        first = StateMachine.from_regex("[a-z]+@[a-z]+")
+        second = StateMachine.from_regex("[a-z]+@[a-z]+")
+
+        assert _regex_dfa.cache_info().hits == 1
+        assert first is not second
+        first.fsa["S0"]["accept"] = True
+        assert not second.accepts("")
+        assert not StateMachine.from_regex("[a-z]+@[a-z]+").accepts("")
+        assert second.accepts("me@example")
+
+    @pytest.mark.parametrize(  # type: ignore[misc]
+        "pattern,position,message",
+        [
+            ("a)", 1, "Unbalanced"),
+            ("(a", 2, "Missing"),
+            ("*a", 0, "Nothing to repeat"),
+            ("a|+", 2, "Nothing to repeat"),
+            ("[ab", 0, "Unterminated"),
+            ("[z-a]", 4, "Invalid range"),
+            ("a\\", 2, "ends with a backslash"),
+            (r"\q", 0, "Unknown escape"),
+        ],
+    )
+    def test_syntax_errors(self, pattern: str, position: int, message: Any) -> None:
+        """Test that malformed patterns report where parsing failed."""
+        with pytest.raises(RegexSyntaxError, match=message) as info:
+            StateMachine.from_regex(pattern)
+        assert info.value.position == position
+        assert info.value.pattern == pattern
@@ -0,0 +1,155 @@
+"""
+Test suite for searching inputs for every match of an automaton.
+
+These tests compare Scanner results against a brute-force check of every
+slice of the input with StateMachine.accepts().
+"""
+
+import mmap
+import random
+from typing import Any
+
+import pytest
+
+from python_fsa import Scanner, StateMachine
+from python_fsa.exceptions import FSAError, InvalidTransitionError
+
+
+@pytest.fixture  # type: ignore[misc]
+def a_then_b() -> dict[str, dict[str, Any]]:
+    """An NFA accepting 'a', then any number of 'a's, then 'b'."""
+    return {
+        "S0": {"a": ["S0", "S1"], "start": True, "accept": False},
+        "S1": {"b": "S2", "start": False, "accept": False},
+        "S2": {"start": False, "accept": True},
+    }
+
+
+def brute_force(machine: StateMachine, text: str) -> list[tuple[int, int]]:
+    """Find the leftmost match ending at each offset by checking every slice."""
+
+    def accepts(word: str) -> bool:
+        try:
+            return machine.accepts(word)
+        except InvalidTransitionError:
+            return False
+
+    matches = []
+    for end in range(len(text) + 1):
+        for start in range(end + 1):
+            if accepts(text[start:end]):
+                matches.append((start, end))
+                break
+    return matches
+
+
+class TestScanner:
+    """Test cases for Scanner."""
+
+    @pytest.mark.parametrize("fixture", ["ends_in_ab", "a_then_b"])  # type: ignore[misc]
+    def test_matches_brute_force(
+        self, fixture: str, request: pytest.FixtureRequest
+    ) -> None:
+        """Test scan() and finditer() against every slice of random texts."""
+        machine = StateMachine(request.getfixturevalue(fixture))
+        rng = random.Random(2)
+
+        for _ in range(30):
+            text = "".join(rng.choice("aabbc") for _ in range(rng.randrange(0, 25)))
+            expected = brute_force(machine, text)
+
+            assert machine.scan(text) == [end for _, end in expected]
+            assert list(machine.finditer(text)) == expected
+            assert list(machine.finditer(text.encode())) == expected
+            assert list(machine.finditer(list(text))) == expected
+
+    def test_scanner_object(self, ends_in_ab: dict[str, dict[str, Any]]) -> None:
+        """Test building a Scanner explicitly."""
+        scanner = StateMachine(ends_in_ab).scanner()
+
+        assert isinstance(scanner, Scanner)
+        assert scanner.scan("xxabyabab") == [4, 7, 9]
+        assert list(scanner.finditer("xxabyabab")) == [(2, 4), (5, 7), (5, 9)]
+        assert scanner.scan(iter("abab")) == [2, 4]
+        assert repr(scanner).startswith("Scanner(forward_states=")
+
+    def test_anchored(self, ends_in_ab: dict[str, dict[str, Any]]) -> None:
+        """Test that anchored scans only report accepted prefixes."""
+        scanner = StateMachine(ends_in_ab).scanner(anchored=True)
+
+        assert scanner.scan("abab") == [2, 4]
+        assert scanner.scan("xab") == []
+        assert list(scanner.finditer("abab")) == [(0, 2), (0, 4)]
+
+    def test_empty_matches(self) -> None:
+        """Test that a machine accepting the empty string matches everywhere."""
+        machine = StateMachine.create_divisibility_checker(2, 3)
+
+        assert machine.scan("") == [0]
+        assert list(machine.finditer("11")) == [(0, 0), (1, 1), (0, 2)]
+
+    def test_mmap_over_chunks(self, tmp_path: Any) -> None:
+        """Test scanning a memory-mapped file longer than one chunk."""
+        rng = random.Random(4)
+        text = "".join(rng.choice("abxy ") for _ in range(150_000))
+        path = tmp_path / "log.txt"
+        path.write_text(text)
+        machine = StateMachine(
+            {
+                "S0": {"x": "S1", "start": True, "accept": False},
+                "S1": {"y": "S2", "start": False, "accept": False},
+                "S2": {"start": False, "accept": True},
+            }
+        )
+
+        with open(path, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as m:
+            matches = list(machine.finditer(m))
+            assert machine.scan(m) == [end for _, end in matches]
+
+        expected = [i + 2 for i in range(len(text)) if text.startswith("xy", i)]
+        assert [end for _, end in matches] == expected
+        assert all(end - start == 2 for start, end in matches)
+
+    def test_dense_matches(self) -> None:
+        """Test finditer() where a match ends at every offset of a long input."""
+        machine = StateMachine.from_regex("a+b?")
+        text = "a" * 20_000 + "b"
+
+        matches = list(machine.finditer(text))
+
+        assert matches == [(0, end) for end in range(1, len(text) + 1)]
+        assert list(machine.finditer(text[:30])) == brute_force(machine, text[:30])
+
+    def test_looping_start(self) -> None:
+        """Test that matches keep their start across symbols the start loops on."""
+        machine = StateMachine(
+            {
+                "S0": {"x": "S0", "y": "S1", "start": True, "accept": False},
+                "S1": {"start": False, "accept": True},
+            }
+        )
+        text = "zxxyxyzy"
+
+        assert list(machine.finditer(text)) == brute_force(machine, text)
+        assert list(machine.finditer(text.encode())) == [(1, 4), (4, 6), (7, 8)]
+
+    def test_max_states(self) -> None:
+        """Test that the search DFA size limit is enforced."""
+        fsa: dict[str, dict[str, Any]] = {
+            "Q0": {"a": ["Q0", "Q1"], "b": "Q0", "start": True, "accept": False}
+        }
+        for i in range(1, 8):
+            fsa[f"Q{i}"] = {"a": f"Q{i + 1}", "b": f"Q{i + 1}"}
+            fsa[f"Q{i}"].update({"start": False, "accept": False})
+        fsa["Q8"] = {"start": False, "accept": True}
+
+        with pytest.raises(FSAError, match="exceeded 50 states"):
+            StateMachine(fsa).scanner(max_states=50)
+
+        # Starts are tracked by a DFA that is only built while searching
+        scanner = StateMachine.from_regex("(ab|ba|aab)*b").scanner(max_states=8)
+        assert scanner.scan("aabbaabab" * 5)
+        with pytest.raises(FSAError, match="exceeded 8 states"):
+            list(scanner.finditer("aabbaabab" * 5))
@@ -0,0 +1,168 @@
+"""
+Test suite for the streaming feed API.
+
+These tests check that feeding input in chunks through a StreamCursor
+gives the same result as processing it all at once, and that checkpoints
+restore the exact position in the stream.
+"""
+
+from typing import Any, Iterator
+
+import pytest
+
+from python_fsa import CompiledAutomaton, StateMachine, StreamCursor
+from python_fsa.exceptions import FSAError, InvalidTransitionError
+
+
+def digits(count: int) -> Iterator[int]:
+    """Generate the binary digits 1, 0, 1, 0, ... of a long stream."""
+    for i in range(count):
+        yield 1 - i % 2
+
+
+class TestStreamCursor:
+    """Test cases for StreamCursor."""
+
+    def test_chunks_match_single_run(self) -> None:
+        """Test that feeding chunks is the same as one call with all input."""
+        machine = StateMachine.create_divisibility_checker(10, 7)
+        cursor = machine.stream()
+
+        assert isinstance(cursor, StreamCursor)
+        assert cursor.state == "S0"
+        assert cursor.accepting
+
+        cursor.feed("123").feed([4, 5]).feed(iter("6"))
+
+        assert cursor.state == machine.final_state("123456")
+        assert cursor.accepting == machine.accepts("123456")
+        assert cursor.position == 6
+
+    def test_generator_chunks(self) -> None:
+        """Test that generators are consumed and counted."""
+        machine = StateMachine.create_divisibility_checker(2, 3)
+        cursor = machine.stream()
+
+        for _ in range(10):
+            cursor.feed(digits(1001))
+
+        assert cursor.position == 10010
+        assert cursor.state == machine.final_state(list(digits(1001)) * 10)
+
+    def test_nondeterministic(self, simple_nfa: dict[str, dict[str, Any]]) -> None:
+        """Test streaming through an NFA tracks the active set."""
+        cursor = StateMachine(simple_nfa).stream()
+
+        cursor.feed("00")
+        assert cursor.state == "S0"
+        assert not cursor.accepting
+
+        cursor.feed(x for x in "10")
+        assert cursor.state == "{S0,S1}"
+        assert cursor.accepting
+
+    def test_checkpoint_restore(self) -> None:
+        """Test resuming a fresh cursor from a checkpoint."""
+        machine = StateMachine.create_divisibility_checker(10, 7)
+        cursor = machine.stream().feed("1234")
+        snapshot = cursor.checkpoint()
+
+        resumed = machine.stream()
+        resumed.restore(snapshot)
+        resumed.feed("56")
+
+        assert resumed.position == 6
+        assert resumed.state == machine.final_state("123456")
+
+    def test_checkpoint_restore_nondeterministic(
+        self, simple_nfa: dict[str, dict[str, Any]]
+    ) -> None:
+        """Test that NFA checkpoints save the whole active set."""
+        machine = StateMachine(simple_nfa)
+        snapshot = machine.stream().feed("01").checkpoint()
+
+        resumed = machine.stream()
+        resumed.restore(snapshot)
+
+        assert resumed.state == "{S0,S1}"
+        assert resumed.position == 2
+
+    def test_checkpoint_is_compact(self) -> None:
+        """Test that checkpoint size doesn't grow with the stream."""
+        cursor = StateMachine.create_divisibility_checker(2, 3).stream()
+        small = cursor.checkpoint()
+        cursor.feed(digits(100000))
+
+        assert len(cursor.checkpoint()) == len(small) < 32
+
+    def test_restore_rejects_other_machines(
+        self, simple_nfa: dict[str, dict[str, Any]]
+    ) -> None:
+        """Test that checkpoints can't be loaded into a different FSA."""
+        snapshot = StateMachine.create_divisibility_checker(2, 3).stream().checkpoint()
+
+        with pytest.raises(FSAError, match="different FSA"):
+            StateMachine.create_divisibility_checker(2, 5).stream().restore(snapshot)
+        with pytest.raises(FSAError, match="different FSA"):
+            StateMachine(simple_nfa).stream().restore(snapshot)
+
+    def test_compiled_machine_stays_compiled(self, tmp_path: Any) -> None:
+        """Test that streaming a compiled-only machine uses its tables as is."""
+        machine = StateMachine.create_divisibility_checker(10, 7)
+        cursor = machine.stream().feed("1234")
+
+        assert machine._fsa is None
+        assert cursor._compiled is machine.compile()
+
+        # Checkpoints depend on the tables, not on how the machine was built
+        path = tmp_path / "div7.fsat"
+        machine.save(path)
+        loaded = StateMachine.from_compiled(CompiledAutomaton.load(path))
+        for other in (loaded, StateMachine(machine.fsa)):
+            resumed = other.stream()
+            resumed.restore(cursor.checkpoint())
+            assert resumed.feed("56").state == machine.final_state("123456")
+
+    def test_cursor_is_snapshot(self, simple_nfa: dict[str, dict[str, Any]]) -> None:
+        """Test that a cursor keeps running the automaton it was created on."""
+        machine = StateMachine(simple_nfa)
+        cursor = machine.stream()
+
+        machine.fsa["S0"]["1"].remove("S1")
+
+        assert cursor.feed("1").accepting
+        assert not machine.stream().feed("1").accepting
+        with pytest.raises(FSAError, match="different FSA"):
+            machine.stream().restore(cursor.checkpoint())
+
+    def test_restore_rejects_malformed_data(self) -> None:
+        """Test that truncated or foreign bytes are rejected."""
+        cursor = StateMachine.create_divisibility_checker(2, 3).stream()
+        snapshot = cursor.checkpoint()
+
+        with pytest.raises(FSAError, match="truncated"):
+            cursor.restore(snapshot[:-1])
+        with pytest.raises(FSAError, match="truncated"):
+            cursor.restore(b"FSAC")
+        with pytest.raises(FSAError, match="Not a stream checkpoint"):
+            cursor.restore(b"X" * len(snapshot))
+
+    def test_failed_chunk_leaves_cursor(self) -> None:
+        """Test that a chunk with an invalid symbol doesn't move the cursor."""
+        cursor = StateMachine.create_divisibility_checker(2, 3).stream().feed("1")
+
+        with pytest.raises(InvalidTransitionError):
+            cursor.feed("12")
+
+        assert cursor.state == "S1"
+        assert cursor.position == 1
+
+    def test_reset(self) -> None:
+        """Test that reset() returns to the start of the stream."""
+        cursor = StateMachine.create_divisibility_checker(2, 3).stream().feed("1")
+
+        cursor.reset()
+
+        assert cursor.state == "S0"
+        assert cursor.position == 0
+        assert repr(cursor) == "StreamCursor(state='S0', position=0)"
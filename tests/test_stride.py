@@ -0,0 +1,106 @@
+"""
+Test suite for multi-symbol stride tables.
+
+These tests check that StrideTable reaches the same states as the 1-stride
+CompiledAutomaton on text and binary input of every length around the
+block and chunk boundaries, and that it reports the same errors.
+"""
+
+import random
+from typing import Union
+
+import pytest
+
+from python_fsa import StateMachine, StrideTable
+from python_fsa.exceptions import FSAError, InvalidTransitionError
+from python_fsa.stride import MAX_BLOCKS, choose_stride
+
+
+class TestStrideTable:
+    """Test cases for StrideTable."""
+
+    @pytest.mark.parametrize(  # type: ignore[misc]
+        "base,divisor", [(2, 5), (2, 96), (3, 4), (10, 7), (10, 4), (16, 9)]
+    )
+    def test_matches_compiled(self, base: int, divisor: int) -> None:
+        """Test stride runs against 1-stride runs on random input."""
+        machine = StateMachine.create_divisibility_checker(base, divisor)
+        compiled = machine.compile()
+        stride = machine.stride()
+        digits = "0123456789"[: min(base, 10)]
+        rng = random.Random(base * divisor)
+
+        assert stride.k > 1
+        for length in [*range(20), 1 << 16, (1 << 16) + 5, 3 * (1 << 16) - 1]:
+            text = "".join(rng.choice(digits) for _ in range(length))
+            data = text.encode()
+
+            assert stride.run(text) == compiled.run(text), length
+            assert stride.run(data) == compiled.run(data), length
+            assert stride.run(memoryview(bytearray(data))) == compiled.run(data)
+            start = length % compiled.num_states
+            assert stride.run(text, start) == compiled.run(text, start)
+
+    def test_explicit_k(self) -> None:
+        """Test every valid k for a binary machine, and the invalid ones."""
+        compiled = StateMachine.create_divisibility_checker(2, 7).compile()
+        text = format(123456789, "b")
+
+        for k in range(1, 9):
+            stride = StrideTable(compiled, k)
+            assert stride.k == k
+            assert stride.num_entries == (compiled.dead + 1) * 2**k
+            assert stride.accepts(text) == (123456789 % 7 == 0)
+        with pytest.raises(FSAError, match="at least 1"):
+            StrideTable(compiled, 0)
+        with pytest.raises(FSAError, match=str(MAX_BLOCKS)):
+            StrideTable(compiled, 9)
+
+    def test_memory_budget(self) -> None:
+        """Test that k shrinks as the budget does and stays within it."""
+        assert choose_stride(8, 2, 1 << 30) == 8
+        assert choose_stride(8, 2, 8 * 8 * 16) == 4
+        assert choose_stride(8, 2, 0) == 1
+        assert choose_stride(8, 7, 1 << 30) == 2
+        assert choose_stride(8, 17, 1 << 30) == 1
+        assert choose_stride(1, 1, 1 << 30) == 1
+
+        machine = StateMachine.create_divisibility_checker(2, 1000)
+        assert machine.stride(memory_budget=1 << 16).k < machine.stride().k
+
+    @pytest.mark.parametrize(  # type: ignore[misc]
+        "data", ["1" * 70000 + "2" + "1" * 9, "10110x", b"1" * 5 + b"\xff", "101€"]
+    )
+    def test_errors_match_compiled(self, data: Union[str, bytes]) -> None:
+        """Test that unknown symbols raise the 1-stride error."""
+        machine = StateMachine.create_divisibility_checker(2, 5)
+        with pytest.raises(InvalidTransitionError) as expected:
+            machine.compile().run(data)
+        with pytest.raises(InvalidTransitionError) as actual:
+            machine.stride().run(data)
+
+        assert actual.value.from_state == expected.value.from_state
+        assert actual.value.input_symbol == expected.value.input_symbol
+
+    def test_missing_transition(self) -> None:
+        """Test a known symbol with no transition from the current state."""
+        machine = StateMachine(
+            {
+                "S0": {"a": "S1", "start": True, "accept": False},
+                "S1": {"b": "S0", "start": False, "accept": True},
+            }
+        )
+        stride = machine.stride()
+
+        assert stride.k > 1
+        assert stride.accepts("ab" * 1000 + "a")
+        with pytest.raises(InvalidTransitionError) as info:
+            stride.run("ab" * 1000 + "aa" + "ab")
+        assert info.value.from_state == "S1"
+
+    def test_other_iterables(self) -> None:
+        """Test that symbol sequences fall back to the 1-stride automaton."""
+        machine = StateMachine.create_divisibility_checker(2, 3)
+
+        assert machine.stride().accepts(["1", "1", "0"])
+        assert not machine.stride().accepts(iter(["1", "0"]))
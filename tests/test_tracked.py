@@ -0,0 +1,331 @@
+"""
+Test suite for versioned FSA definitions and the caches built on them.
+
+These tests check that every change to a definition moves its version on,
+including changes made directly through ``machine.fsa``, and that data a
+StateMachine derives from the definition is reused while the version stays
+the same and rebuilt once it changes.
+"""
+
+import copy
+import pickle
+from typing import Any, Callable
+
+import pytest
+
+from python_fsa import StateMachine
+from python_fsa.tracked import (
+    TrackedDefinition,
+    TrackedState,
+    TrackedTargets,
+    Version,
+)
+
+
+class TestTrackedDefinition:
+    """Test cases for TrackedDefinition and TrackedState."""
+
+    @pytest.mark.parametrize(  # type: ignore[misc]
+        "edit",
+        [
+            lambda fsa: fsa["S0"].__setitem__("a", "S0"),
+            lambda fsa: fsa["S0"].__delitem__("a"),
+            lambda fsa: fsa["S0"].pop("a"),
+            lambda fsa: fsa["S0"].popitem(),
+            lambda fsa: fsa["S0"].setdefault("c", "S0"),
+            lambda fsa: fsa["S0"].update(c="S0"),
+            lambda fsa: fsa["S0"].__ior__({"c": "S0"}),
+            lambda fsa: fsa["S0"].clear(),
+            lambda fsa: fsa.__setitem__("S3", {"start": False, "accept": False}),
+            lambda fsa: fsa.__delitem__("S2"),
+            lambda fsa: fsa.pop("S2"),
+            lambda fsa: fsa.popitem(),
+            lambda fsa: fsa.setdefault("S3", {"start": False, "accept": False}),
+            lambda fsa: fsa.update(S3={"start": False, "accept": False}),
+            lambda fsa: fsa.__ior__({"S3": {"start": False, "accept": False}}),
+            lambda fsa: fsa.clear(),
+        ],
+    )
+    def test_every_change_moves_version(
+        self, ends_in_ab: dict[str, dict[str, Any]], edit: Callable[[Any], Any]
+    ) -> None:
+        """Test that each way of changing a definition bumps its version."""
+        version = Version()
+        fsa = TrackedDefinition(version, ends_in_ab)
+
+        edit(fsa)
+
+        assert version.value > 0
+
+    def test_reads_keep_version(self, ends_in_ab: dict[str, dict[str, Any]]) -> None:
+        """Test that reading a definition leaves its version alone."""
+        version = Version()
+        fsa = TrackedDefinition(version, ends_in_ab)
+
+        assert fsa == ends_in_ab
+        assert fsa["S0"].get("a") == "S1"
+        assert fsa["S0"].setdefault("a", "S2") == "S1"
+        assert list(fsa.items())[0][0] == "S0"
+        assert version.value == 0
+
+    def test_states_are_copied(self, ends_in_ab: dict[str, dict[str, Any]]) -> None:
+        """Test that states are tracked copies, not the dictionaries given."""
+        version = Version()
+        fsa = TrackedDefinition(version, ends_in_ab)
+        fsa["S3"] = state = {"start": False, "accept": True}
+
+        ends_in_ab["S0"]["a"] = "S0"
+        state["accept"] = False
+
+        assert fsa["S0"]["a"] == "S1"
+        assert fsa["S3"]["accept"] is True
+        assert all(type(state_def) is TrackedState for state_def in fsa.values())
+
+    @pytest.mark.parametrize(  # type: ignore[misc]
+        "edit",
+        [
+            lambda targets: targets.append("S2"),
+            lambda targets: targets.extend(["S2"]),
+            lambda targets: targets.__iadd__(["S2"]),
+            lambda targets: targets.__imul__(2),
+            lambda targets: targets.insert(0, "S2"),
+            lambda targets: targets.__setitem__(0, "S2"),
+            lambda targets: targets.__setitem__(slice(0, 1), ["S2"]),
+            lambda targets: targets.__delitem__(0),
+            lambda targets: targets.pop(),
+            lambda targets: targets.remove("S0"),
+            lambda targets: targets.clear(),
+            lambda targets: targets.reverse(),
+            lambda targets: targets.sort(),
+        ],
+    )
+    def test_every_target_change_moves_version(
+        self, edit: Callable[[Any], Any]
+    ) -> None:
+        """Test that each way of changing a list of targets bumps the version."""
+        version = Version()
+        targets = ["S0", "S1"]
+        fsa = TrackedDefinition(
+            version, {"S0": {"a": targets, "start": True, "accept": False}}
+        )
+
+        edit(fsa["S0"]["a"])
+
+        assert version.value > 0
+        assert targets == ["S0", "S1"]
+
+    def test_targets_are_copied(self) -> None:
+        """Test that lists of targets are tracked copies, however they're set."""
+        version = Version()
+        targets = ["S0", "S1"]
+        fsa = TrackedDefinition(
+            version, {"S0": {"a": targets, "start": True, "accept": False}}
+        )
+        fsa["S0"]["b"] = targets
+        fsa["S0"].update(c=targets)
+        fsa["S1"] = {"a": targets, "start": False, "accept": True}
+
+        for state_def, symbol in (("S0", "a"), ("S0", "b"), ("S0", "c"), ("S1", "a")):
+            assert type(fsa[state_def][symbol]) is TrackedTargets
+            assert fsa[state_def][symbol] is not targets
+            assert fsa[state_def][symbol]._version is version
+
+    def test_copies_count_separately(
+        self, ends_in_ab: dict[str, dict[str, Any]]
+    ) -> None:
+        """Test that deep and pickled copies get a version of their own."""
+        version = Version()
+        fsa = TrackedDefinition(version, ends_in_ab)
+
+        for duplicate in (copy.deepcopy(fsa), pickle.loads(pickle.dumps(fsa))):
+            duplicate["S0"]["a"] = "S0"
+
+            assert duplicate == {**ends_in_ab, "S0": {**ends_in_ab["S0"], "a": "S0"}}
+            assert type(duplicate["S0"]) is TrackedState
+            assert duplicate["S0"]._version is duplicate._version
+        assert version.value == 0
+        assert fsa == ends_in_ab
+
+    def test_copied_targets_count_separately(self) -> None:
+        """Test that deep and pickled copies of targets get the copy's version."""
+        version = Version()
+        fsa = TrackedDefinition(
+            version, {"S0": {"a": ["S0", "S1"], "start": True, "accept": False}}
+        )
+
+        for duplicate in (copy.deepcopy(fsa), pickle.loads(pickle.dumps(fsa))):
+            duplicate["S0"]["a"].append("S2")
+
+            assert type(duplicate["S0"]["a"]) is TrackedTargets
+            assert duplicate["S0"]["a"]._version is duplicate._version
+        assert version.value == 0
+        assert fsa["S0"]["a"] == ["S0", "S1"]
+
+
+class TestVersionedCaches:
+    """Test cases for StateMachine data cached per definition version."""
+
+    def test_queries_keep_version(self, ends_in_ab: dict[str, dict[str, Any]]) -> None:
+        """Test that running and drawing a machine doesn't change its version."""
+        machine = StateMachine(ends_in_ab)
+        version = machine.version
+
+        machine("a", "b")
+        machine.accepts("ab")
+        machine.create_graph()
+        machine.minimize_arrows()
+        machine.remove_unreachable_states()
+        machine.trim()
+        machine._normalize()
+
+        assert machine.version == version
+
+    def test_direct_edit_clears_is_min(
+        self, ends_in_ab: dict[str, dict[str, Any]]
+    ) -> None:
+        """Test that editing a minimized definition in place clears is_min."""
+        machine = StateMachine(ends_in_ab).minimize()
+        assert machine.is_min
+
+        machine.fsa["S2"]["accept"] = False
+
+        assert not machine.is_min
+        assert len(machine.minimize().fsa) == 1
+
+    def test_direct_edit_rebuilds_compiled(
+        self, ends_in_ab: dict[str, dict[str, Any]]
+    ) -> None:
+        """Test that runs see an in-place edit once they use compiled tables."""
+        machine = StateMachine(ends_in_ab)
+        machine.accepts("ab")
+        compiled = machine.compile()
+        assert machine.accepts("ab")
+
+        machine.fsa["S1"]["b"] = "S0"
+
+        assert not machine.accepts("ab")
+        assert machine.compile() is not compiled
+
+    def test_direct_edit_moves_start(
+        self, ends_in_ab: dict[str, dict[str, Any]]
+    ) -> None:
+        """Test that the cached start state follows an in-place edit."""
+        machine = StateMachine(ends_in_ab)
+        assert machine.final_state([]) == "S0"
+
+        machine.fsa["S0"]["start"] = False
+        machine.fsa["S2"]["start"] = True
+
+        assert machine.final_state([]) == "S2"
+        assert machine.reset().accept
+
+    def test_graph_is_cached(self, ends_in_ab: dict[str, dict[str, Any]]) -> None:
+        """Test that create_graph() reuses its graph until the FSA changes."""
+        machine = StateMachine(ends_in_ab)
+        graph = machine.create_graph()
+        graph.node("extra")
+
+        assert "extra" not in machine.create_graph().source
+        assert machine.create_graph().source == machine.create_graph().source
+
+        machine.add_transition("S2", "c", "S2")
+
+        assert "label=c" in machine.create_graph().source
+
+    def test_minimize_arrows_returns_copies(
+        self, ends_in_ab: dict[str, dict[str, Any]]
+    ) -> None:
+        """Test that changing a result of minimize_arrows() leaves the cache."""
+        machine = StateMachine(ends_in_ab)
+        arrows = machine.minimize_arrows()
+        arrows["S0"]["c"] = "S0"
+        del arrows["S1"]
+
+        assert machine.minimize_arrows() == ends_in_ab
+
+    def test_direct_edit_resets_nfa_run(self) -> None:
+        """Test that a run on a non-deterministic FSA restarts after an edit."""
+        machine = StateMachine(
+            {
+                "S0": {"a": ["S0", "S1"], "start": True, "accept": False},
+                "S1": {"a": "S1", "start": False, "accept": True},
+            }
+        )
+        machine("a")
+        assert machine.active_states == ["S0", "S1"]
+
+        machine.fsa["S1"]["b"] = "S0"
+
+        assert machine.active_states == ["S0"]
+
+    def test_direct_edit_of_targets(self) -> None:
+        """Test that adding a target in place is seen by later runs."""
+        targets = ["S1"]
+        machine = StateMachine(
+            {
+                "S0": {"a": targets, "start": True, "accept": False},
+                "S1": {"a": "S1", "start": False, "accept": False},
+                "S2": {"start": False, "accept": True},
+            }
+        )
+        assert machine.is_deterministic
+        assert not machine.accepts("a")
+        version = machine.version
+
+        machine.fsa["S0"]["a"].append("S2")
+
+        assert machine.version > version
+        assert not machine.is_deterministic
+        assert machine.accepts("a")
+        assert targets == ["S1"]
+
+    def test_replacing_definition(self, ends_in_ab: dict[str, dict[str, Any]]) -> None:
+        """Test that assigning a new definition is tracked like an edit."""
+        machine = StateMachine(ends_in_ab).minimize()
+        version = machine.version
+
+        machine.fsa = {**machine.fsa, "S2": {**machine.fsa["S2"], "accept": False}}
+        machine.fsa["S0"]["b"] = "S1"
+
+        assert machine.version > version
+        assert not machine.is_min
+        assert not machine.accepts("ab")
+
+    def test_machines_do_not_share_states(
+        self, ends_in_ab: dict[str, dict[str, Any]]
+    ) -> None:
+        """Test that a machine built from another's definition is independent."""
+        machine = StateMachine(ends_in_ab).minimize()
+        other = StateMachine(machine.fsa)
+
+        other.fsa["S0"]["a"] = "S0"
+
+        assert machine.is_min
+        assert machine.fsa["S0"]["a"] == "S1"
+
+    def test_from_compiled_materializes_without_change(
+        self, ends_in_ab: dict[str, dict[str, Any]]
+    ) -> None:
+        """Test that reading fsa of a compiled machine keeps its tables."""
+        compiled = StateMachine(ends_in_ab).compile()
+        machine = StateMachine.from_compiled(compiled)
+
+        assert machine.fsa == ends_in_ab
+        assert machine.version == 0
+        assert machine.compile() is compiled
+
+        machine.fsa["S2"]["accept"] = False
+
+        assert machine.compile() is not compiled
+        assert not machine.accepts("ab")
+
+    def test_pickled_machine_stays_tracked(
+        self, ends_in_ab: dict[str, dict[str, Any]]
+    ) -> None:
+        """Test that a loaded machine still notices edits to its definition."""
+        machine = pickle.loads(pickle.dumps(StateMachine(ends_in_ab).minimize()))
+        assert machine.is_min
+
+        machine.fsa["S2"]["accept"] = False
+
+        assert not machine.is_min